@@ -0,0 +1,163 @@
+# bench_screenshot_encoders.py
+#
+# Compare the screenshot encoder presets on a corpus of client screenshots.
+#
+# Usage:
+#   python bench_screenshot_encoders.py [corpus_dir] [--limit N] [--presets a,b]
+#
+# corpus_dir defaults to the launcher's screenshots folder; if it holds no
+# images, synthetic 1920x1080 frames are used instead. Each preset runs in
+# its own process; "peak MB" is the most memory a single encode added on
+# top of the process (corpus included) at the start of that encode.
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import psutil
+from PIL import Image
+
+from screenshot_encoder import (
+    Frame, PRESETS, available_presets, encode_frame, resolve_preset, synthetic_frame
+)
+from screenshot_gallery import is_screenshot
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "screenshots")
+SYNTHETIC_FRAMES = 8
+
+
+class EncodePeak:
+    """
+    Peak memory an encode adds on top of what the process held before it.
+
+    On Linux the kernel's high-water mark (VmHWM) is reset through
+    /proc/self/clear_refs before each encode, so even short spikes count;
+    elsewhere (or if the reset is refused) RSS is sampled on a helper thread.
+    """
+
+    SAMPLE_INTERVAL_S = 0.001
+
+    def __init__(self):
+        self._process = psutil.Process()
+        self._clear_refs = sys.platform.startswith("linux") and self._reset_hwm()
+        self.peak_bytes = 0
+
+    def __enter__(self):
+        if self._clear_refs:
+            self._clear_refs = self._reset_hwm()
+        self._before = self._process.memory_info().rss
+        self._highest = self._before
+        self._done = threading.Event()
+        if not self._clear_refs:
+            self._sampler = threading.Thread(target=self._sample, daemon=True)
+            self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._done.set()
+        if self._clear_refs:
+            self._highest = max(self._highest, self._read_hwm())
+        else:
+            self._sampler.join()
+        self.peak_bytes = max(self.peak_bytes, self._highest - self._before)
+        return False
+
+    def _sample(self):
+        while not self._done.wait(self.SAMPLE_INTERVAL_S):
+            self._highest = max(self._highest, self._process.memory_info().rss)
+
+    @staticmethod
+    def _reset_hwm():
+        try:
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def _read_hwm():
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+
+def load_corpus(corpus_dir, limit):
+    """Decoded RGB frames of the corpus (or synthetic ones)"""
+    frames = []
+    if corpus_dir and os.path.isdir(corpus_dir):
+        for name in sorted(os.listdir(corpus_dir)):
+            if not is_screenshot(name):
+                continue
+            with Image.open(os.path.join(corpus_dir, name)) as image:
+                frames.append(Frame.from_image(image.convert("RGB")))
+            if len(frames) >= limit:
+                break
+    if not frames:
+        frames = [synthetic_frame(1920, 1080, seed=i) for i in range(min(limit, SYNTHETIC_FRAMES))]
+        # Decode up front so the preset only measures encoding
+        for frame in frames:
+            frame.to_image().load()
+    return frames
+
+
+def run_preset(name, corpus_dir, limit, results):
+    frames = load_corpus(corpus_dir, limit)
+    _, fmt, extension, params = resolve_preset(name)
+    peak = EncodePeak()
+    times = []
+    sizes = []
+    with tempfile.TemporaryDirectory() as out_dir:
+        for index, frame in enumerate(frames):
+            path = os.path.join(out_dir, f"{index}.{extension}")
+            with peak:
+                started = time.perf_counter()
+                encode_frame(frame, path, fmt, **params)
+                times.append((time.perf_counter() - started) * 1000)
+            sizes.append(os.path.getsize(path))
+    raw = sum(frame.width * frame.height * 3 for frame in frames)
+    results.put({
+        "preset": name,
+        "images": len(frames),
+        "median_ms": statistics.median(times),
+        "max_ms": max(times),
+        "total_kb": sum(sizes) / 1024,
+        "ratio": sum(sizes) / raw,
+        "peak_mb": peak.peak_bytes / (1024 * 1024),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark screenshot encoder presets")
+    parser.add_argument("corpus", nargs="?", default=DEFAULT_CORPUS)
+    parser.add_argument("--limit", type=int, default=20, help="Max images taken from the corpus")
+    parser.add_argument("--presets", default=",".join(available_presets()))
+    args = parser.parse_args()
+
+    presets = [name for name in args.presets.split(",") if name in PRESETS]
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    rows = []
+    for name in presets:
+        proc = ctx.Process(target=run_preset, args=(name, args.corpus, args.limit, results))
+        proc.start()
+        rows.append(results.get())
+        proc.join()
+
+    print(f"{'preset':<15}{'images':>7}{'median ms':>11}{'max ms':>9}{'total KB':>11}{'ratio':>8}{'peak MB':>9}")
+    for row in rows:
+        print(
+            f"{row['preset']:<15}{row['images']:>7}{row['median_ms']:>11.1f}{row['max_ms']:>9.1f}"
+            f"{row['total_kb']:>11.0f}{row['ratio']:>8.3f}{row['peak_mb']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+# bridge_diagnostics.py
+#
+# Call counts, latency histograms and payload sizes of LauncherBridge slots
+# and signals, to find slow calls on real player machines.
+#
+# Per-call log lines of the bridge go through trace() and are only printed
+# while diagnostics are enabled, so normal runs stay quiet.
+#
+# @instrument_slots wraps every public slot of the bridge class once; while
+# diagnostics are disabled the wrapper costs a single attribute check per
+# call. Signals are only observed while enabled (a recorder is connected on
+# enable and disconnected on disable). Payload sizes are the characters of
+# the JSON strings (and 8 per number) crossing the WebChannel.
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+# Upper bucket bounds in ms; the last bucket is unbounded
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+TOP_IN_LOG = 10
+
+
+def payload_size(value):
+    """Approximate serialized size of a slot argument, result or signal argument"""
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (bool, int, float)):
+        return 8
+    if isinstance(value, (tuple, list)):
+        return sum(payload_size(item) for item in value)
+    return len(str(value))
+
+
+class LatencyHistogram:
+    """Fixed log-scale buckets: constant memory, O(log buckets) per sample"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        self.counts[bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (max for the last bucket)"""
+        if not self.count:
+            return None
+        rank = p / 100.0 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self):
+        labels = [f"<={bound}" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+        return {label: count for label, count in zip(labels, self.counts) if count}
+
+
+class SlotStats:
+    def __init__(self):
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.latency = LatencyHistogram()
+
+    def to_dict(self):
+        latency = self.latency
+        return {
+            "count": latency.count,
+            "errors": self.errors,
+            "total_ms": round(latency.total_ms, 2),
+            "p50_ms": latency.percentile(50),
+            "p95_ms": latency.percentile(95),
+            "max_ms": round(latency.max_ms, 2),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "histogram": latency.to_dict(),
+        }
+
+
+class BridgeDiagnostics(QObject):
+    """
+    Collects per-slot and per-signal statistics of one bridge object.
+
+    Args:
+        enabled: Start recording right away
+        log_interval_s: Print a summary this often (0 = never)
+    """
+
+    # Signals
+    summaryLogged = pyqtSignal(str)  # The text printed by log_summary()
+
+    def __init__(self, enabled=False, log_interval_s=0):
+        super().__init__()
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._signals = {}  # name -> [count, bytes]
+        self._observed = []  # (name, bound signal)
+        self._connections = []
+        self._since = time.monotonic()
+        self._log_timer = QTimer(self)
+        self._log_timer.timeout.connect(self.log_summary)
+        self.set_log_interval(log_interval_s)
+        if enabled:
+            self.set_enabled(True)
+
+    # ------------------------------------------------------------------
+    # Control
+    # ------------------------------------------------------------------
+
+    def observe_signals(self, obj):
+        """Count emissions of every signal `obj` declares (while enabled)"""
+        for name in dir(type(obj)):
+            if isinstance(getattr(type(obj), name, None), pyqtSignal):
+                self._observed.append((name, getattr(obj, name)))
+        if self.enabled:
+            self._connect_signals()
+
+    def set_enabled(self, enabled):
+        enabled = bool(enabled)
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        if enabled:
+            self.reset()
+            self._connect_signals()
+        else:
+            for signal, connection in self._connections:
+                signal.disconnect(connection)
+            self._connections = []
+        print(f"[Diagnostics] Bridge instrumentation {'enabled' if enabled else 'disabled'}")
+
+    def set_log_interval(self, seconds):
+        if seconds and seconds > 0:
+            self._log_timer.start(int(seconds * 1000))
+        else:
+            self._log_timer.stop()
+
+    def reset(self):
+        with self._lock:
+            self._slots = {}
+            self._signals = {}
+            self._since = time.monotonic()
+
+    def _connect_signals(self):
+        for name, signal in self._observed:
+            connection = signal.connect(functools.partial(self._on_signal, name))
+            self._connections.append((signal, connection))
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def trace(self, message):
+        """Print a per-call log line; quiet unless diagnostics are enabled"""
+        if self.enabled:
+            print(message)
+
+    def record_call(self, name, seconds, args, result, error=False):
+        with self._lock:
+            stats = self._slots.get(name)
+            if stats is None:
+                stats = self._slots[name] = SlotStats()
+            stats.latency.add(seconds * 1000)
+            stats.bytes_in += payload_size(args)
+            stats.bytes_out += payload_size(result)
+            if error:
+                stats.errors += 1
+
+    def _on_signal(self, name, *args):
+        size = payload_size(args)
+        with self._lock:
+            entry = self._signals.setdefault(name, [0, 0])
+            entry[0] += 1
+            entry[1] += size
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: {enabled, seconds, slots: {name: stats}, signals: {name: {count, bytes}}}
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "seconds": round(time.monotonic() - self._since, 1),
+                "slots": {name: stats.to_dict() for name, stats in self._slots.items()},
+                "signals": {name: {"count": c, "bytes": b} for name, (c, b) in self._signals.items()},
+            }
+
+    def log_summary(self):
+        """Print the slowest slots (by total time) and the busiest signals"""
+        if not self.enabled:
+            return
+        data = self.snapshot()
+        lines = [f"[Diagnostics] Bridge over {data['seconds']}s:"]
+        slots = sorted(data["slots"].items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        for name, s in slots[:TOP_IN_LOG]:
+            lines.append(
+                f"  {name:<24} n={s['count']:<6} total={s['total_ms']:.1f}ms p95<={s['p95_ms']}ms "
+                f"max={s['max_ms']}ms in={s['bytes_in']}B out={s['bytes_out']}B err={s['errors']}"
+            )
+        signals = sorted(data["signals"].items(), key=lambda item: item[1]["bytes"], reverse=True)
+        for name, s in signals[:TOP_IN_LOG]:
+            lines.append(f"  signal {name:<17} n={s['count']:<6} bytes={s['bytes']}")
+        text = "\n".join(lines)
+        print(text)
+        self.summaryLogged.emit(text)
+
+
+def _instrument(name, fn):
+    @functools.wraps(fn)  # Keeps the pyqtSlot signature
+    def slot(self, *args):
+        diagnostics = self.diagnostics
+        if not diagnostics.enabled:
+            return fn(self, *args)
+        started = time.perf_counter()
+        try:
+            result = fn(self, *args)
+        except Exception:
+            diagnostics.record_call(name, time.perf_counter() - started, args, None, error=True)
+            raise
+        diagnostics.record_call(name, time.perf_counter() - started, args, result)
+        return result
+    return slot
+
+
+def instrument_slots(cls):
+    """
+    Class decorator: record every public pyqtSlot of `cls` in the
+    instance's `diagnostics` (a BridgeDiagnostics set in __init__).
+    """
+    for name, fn in list(vars(cls).items()):
+        if name.startswith("_") or not callable(fn) or not hasattr(fn, "__pyqtSignature__"):
+            continue
+        setattr(cls, name, _instrument(name, fn))
+    return cls
@@ -0,0 +1,229 @@
+# cache_prewarmer.py
+#
+# Read-ahead of the MU client's hot data files into the OS page cache,
+# so the first launch after boot doesn't spend most of its time on
+# random HDD reads.
+#
+# The file list comes from, in order of preference:
+#   1. prewarm_manifest.json in the game directory (list of relative paths)
+#   2. files the client had open during previous launches (learned)
+#   3. the largest files under the game's Data folder
+#
+# Reads are large and sequential, run on a background thread, stay
+# within a byte budget and rate limit, and pause while a download is active.
+# Prewarming only happens before a launch (launcher open, hovering Play):
+# once a client is spawned it stops, and it stays off while clients start up,
+# so it never competes with the client's own startup reads.
+
+import json
+import os
+import threading
+import time
+import psutil
+
+MANIFEST_NAME = "prewarm_manifest.json"
+LEARNED_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prewarm_files.json")
+
+CHUNK_SIZE = 4 * 1024 * 1024      # Sequential read size
+DEFAULT_BUDGET_MB = 512           # Max bytes read per prewarm run
+DEFAULT_RATE_MB_S = 64            # Read rate cap (0 = unlimited)
+REWARM_AFTER = 15 * 60            # Seconds before a finished prewarm is considered stale
+LEARN_DELAY = 30                  # Seconds after spawn to sample the client's open files
+STARTUP_HOLD = 60                 # Seconds after a spawn during which prewarming won't start
+FALLBACK_DIR = "Data"
+FALLBACK_MAX_FILES = 200
+
+
+class CachePrewarmer:
+    """
+    Background page-cache prewarmer for the game client.
+
+    Args:
+        settings_manager: Reads `prewarm_game_files`, `prewarm_budget_mb`, `prewarm_rate_mb_s`
+        is_busy: Optional callable; prewarming pauses while it returns True
+            (e.g. an update download is in progress)
+    """
+
+    def __init__(self, settings_manager, is_busy=None):
+        self.settings = settings_manager
+        self.is_busy = is_busy
+        self.thread = None
+        self.last_finished = 0.0
+        self.last_stats = {}
+        self._hold_until = 0.0
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    def enabled(self):
+        return bool(self.settings.get("prewarm_game_files", True))
+
+    def start(self, force=False):
+        """
+        Start prewarming in the background if it isn't running or recently done.
+
+        Returns:
+            bool: True if a new prewarm run was started
+        """
+        if not self.enabled():
+            return False
+        with self._lock:
+            if time.monotonic() < self._hold_until:
+                return False  # A client is starting up
+            if self.thread and self.thread.is_alive():
+                return False
+            if not force and self.last_finished and time.monotonic() - self.last_finished < REWARM_AFTER:
+                return False
+            self._cancel.clear()
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+            return True
+
+    def cancel(self):
+        self._cancel.set()
+
+    def client_spawned(self, hold=STARTUP_HOLD):
+        """Stop prewarming and don't start again for `hold` seconds (the client's startup I/O)"""
+        with self._lock:
+            self._hold_until = time.monotonic() + hold
+        self._cancel.set()
+
+    def game_dir(self):
+        game_path = self.settings.get("game_executable", "main.exe")
+        return os.path.dirname(os.path.abspath(game_path))
+
+    def hot_files(self):
+        """Absolute paths of the files to prewarm, hottest first"""
+        game_dir = self.game_dir()
+
+        manifest_path = os.path.join(game_dir, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, 'r') as f:
+                    entries = json.load(f)
+                return [os.path.join(game_dir, entry) for entry in entries]
+            except Exception as e:
+                print(f"[Prewarm] Invalid manifest {manifest_path}: {e}")
+
+        learned = self._load_learned().get(game_dir)
+        if learned:
+            return [os.path.join(game_dir, entry) for entry in learned]
+
+        return self._largest_data_files(game_dir)
+
+    def _largest_data_files(self, game_dir):
+        data_dir = os.path.join(game_dir, FALLBACK_DIR)
+        files = []
+        for root, _, names in os.walk(data_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    files.append((os.path.getsize(path), path))
+                except OSError:
+                    pass
+        files.sort(reverse=True)
+        return [path for _, path in files[:FALLBACK_MAX_FILES]]
+
+    def _run(self):
+        budget = int(self.settings.get("prewarm_budget_mb", DEFAULT_BUDGET_MB)) * 1024 * 1024
+        rate = float(self.settings.get("prewarm_rate_mb_s", DEFAULT_RATE_MB_S)) * 1024 * 1024
+        buffer = bytearray(CHUNK_SIZE)
+        view = memoryview(buffer)
+        total = 0
+        files_done = 0
+        started = time.monotonic()
+
+        try:
+            for path in self.hot_files():
+                if self._cancel.is_set() or total >= budget:
+                    break
+                try:
+                    with open(path, 'rb', buffering=0) as f:
+                        if hasattr(os, "posix_fadvise"):
+                            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                        while total < budget and not self._cancel.is_set():
+                            self._wait_while_busy()
+                            n = f.readinto(view[:min(CHUNK_SIZE, budget - total)])
+                            if not n:
+                                break
+                            total += n
+                            # Stay under the rate cap
+                            if rate > 0:
+                                ahead = total / rate - (time.monotonic() - started)
+                                if ahead > 0:
+                                    self._cancel.wait(ahead)  # Wakes up at once on cancel
+                    files_done += 1
+                except OSError:
+                    pass  # Missing or locked file; skip it
+        except Exception as e:
+            print(f"[Prewarm] Error: {e}")
+
+        elapsed = time.monotonic() - started
+        self.last_stats = {
+            "files": files_done,
+            "bytes": total,
+            "seconds": round(elapsed, 2),
+            "cancelled": self._cancel.is_set(),
+        }
+        if not self._cancel.is_set():
+            self.last_finished = time.monotonic()
+        print(f"[Prewarm] Read {total / (1024 * 1024):.1f} MB from {files_done} files in {elapsed:.1f}s")
+
+    def _wait_while_busy(self):
+        while self.is_busy and self.is_busy() and not self._cancel.is_set():
+            time.sleep(0.5)
+
+    # ------------------------------------------------------------------
+    # Learning from previous launches
+    # ------------------------------------------------------------------
+
+    def schedule_learning(self, pid, delay=LEARN_DELAY):
+        """Record which game files the client has open `delay` seconds after spawn"""
+        if not self.enabled():
+            return
+        timer = threading.Timer(delay, self.learn_from_pid, args=(pid,))
+        timer.daemon = True
+        timer.start()
+
+    def learn_from_pid(self, pid):
+        game_dir = self.game_dir()
+        prefix = os.path.normcase(game_dir + os.sep)
+        try:
+            open_files = psutil.Process(pid).open_files()
+        except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+            print(f"[Prewarm] Could not read open files of PID {pid}: {e}")
+            return
+
+        seen = set()
+        for entry in open_files:
+            if os.path.normcase(entry.path).startswith(prefix):
+                seen.add(os.path.relpath(entry.path, game_dir))
+        if not seen:
+            return
+
+        learned = self._load_learned()
+        merged = list(dict.fromkeys(learned.get(game_dir, []) + sorted(seen)))
+        # Largest first so the budget goes to the files that cost most to load
+        merged.sort(key=lambda rel: self._size(os.path.join(game_dir, rel)), reverse=True)
+        learned[game_dir] = merged
+        self._save_learned(learned)
+        print(f"[Prewarm] Learned {len(seen)} hot files from PID {pid}")
+
+    def _size(self, path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    def _load_learned(self):
+        try:
+            with open(LEARNED_FILE, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_learned(self, learned):
+        try:
+            with open(LEARNED_FILE, 'w') as f:
+                json.dump(learned, f, indent=4)
+        except OSError as e:
+            print(f"[Prewarm] Could not save learned files: {e}")
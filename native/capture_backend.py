@@ -0,0 +1,569 @@
+# capture_backend.py
+#
+# Pluggable window capture backends.
+#
+# ScreenshotService and the replay recorder find the game window and
+# grab its pixels through a CaptureBackend:
+#   - Win32CaptureBackend: GDI BitBlt into a reusable DIB section
+#   - X11CaptureBackend: MIT-SHM XShmGetImage into a reusable shared segment
+#   - SyntheticCaptureBackend: generated frames, for tests and profiling
+#
+# grab() returns a Frame that is a view of the backend's capture buffer
+# (no copy); it stays valid until the next grab on the same thread. Use
+# Frame.copy() to keep it longer. Every thread gets its own buffer, so the
+# recorder thread and a manual screenshot never overwrite each other.
+
+import ctypes
+import ctypes.util
+import os
+import sys
+import threading
+
+from process_snapshot import process_snapshots
+from screenshot_encoder import Frame, synthetic_frame
+
+
+class CaptureBackend:
+    """Interface implemented by every capture backend."""
+
+    name = "none"
+
+    def find_window(self, process_name):
+        """Handle of the visible main window of `process_name`, or None"""
+        raise NotImplementedError
+
+    def is_window(self, handle):
+        raise NotImplementedError
+
+    def activate(self, handle):
+        """Bring the window to the front before a manual screenshot (optional)"""
+        pass
+
+    def grab(self, handle):
+        """
+        Capture the window into this thread's buffer.
+
+        Returns:
+            Frame: View of the buffer (valid until the next grab), or None on error
+        """
+        raise NotImplementedError
+
+    def release(self):
+        """Free the calling thread's capture buffer"""
+        pass
+
+    def close(self):
+        """Free every buffer and OS resource of the backend"""
+        pass
+
+
+class _ThreadContexts:
+    """Per-thread capture buffers plus a registry so close() can free all of them."""
+
+    def __init__(self, free):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all = []
+        self._free = free
+
+    def get(self):
+        return getattr(self._local, "context", None)
+
+    def set(self, context):
+        old = self.get()
+        if old is not None:
+            self._discard(old)
+        self._local.context = context
+        if context is not None:
+            with self._lock:
+                self._all.append(context)
+
+    def release(self):
+        context = self.get()
+        self._local.context = None
+        if context is not None:
+            self._discard(context)
+
+    def _discard(self, context):
+        with self._lock:
+            if context in self._all:
+                self._all.remove(context)
+        self._free(context)
+
+    def close(self):
+        with self._lock:
+            contexts, self._all = self._all, []
+        for context in contexts:
+            self._free(context)
+        self._local = threading.local()
+
+
+# ---------------------------------------------------------------------
+# Synthetic
+# ---------------------------------------------------------------------
+
+class SyntheticCaptureBackend(CaptureBackend):
+    """
+    Generated frames of a fixed size, cycling through a few precomputed
+    game-like images. Lets the capture path run (and be profiled) anywhere.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, width=1366, height=768, variants=4, window=True):
+        self.width = width
+        self.height = height
+        self.window = window
+        self.grabs = 0
+        self._sources = [synthetic_frame(width, height, seed=i).data for i in range(variants)]
+        self._contexts = _ThreadContexts(lambda context: None)
+
+    def find_window(self, process_name):
+        return 1 if self.window else None
+
+    def is_window(self, handle):
+        return self.window and handle == 1
+
+    def grab(self, handle):
+        if not self.is_window(handle):
+            return None
+        buffer = self._contexts.get()
+        if buffer is None:
+            buffer = bytearray(self.width * self.height * 4)
+            self._contexts.set(buffer)
+        source = self._sources[self.grabs % len(self._sources)]
+        self.grabs += 1
+        view = memoryview(buffer)
+        view[:] = source
+        return Frame(self.width, self.height, view, raw_mode='BGRX')
+
+    def release(self):
+        self._contexts.release()
+
+    def close(self):
+        self._contexts.close()
+
+
+# ---------------------------------------------------------------------
+# Win32 (GDI)
+# ---------------------------------------------------------------------
+
+class _DibContext:
+    def __init__(self, mem_dc, bitmap, old, bits, width, height):
+        self.mem_dc = mem_dc
+        self.bitmap = bitmap
+        self.old = old
+        self.bits = bits
+        self.width = width
+        self.height = height
+        self.view = memoryview((ctypes.c_ubyte * (width * height * 4)).from_address(bits)).cast('B')
+
+
+class Win32CaptureBackend(CaptureBackend):
+    """BitBlt of the window DC into a top-down 32-bit DIB section that is reused."""
+
+    name = "win32"
+
+    SRCCOPY = 0x00CC0020
+    DIB_RGB_COLORS = 0
+    BI_RGB = 0
+
+    def __init__(self):
+        from ctypes import wintypes
+
+        # Imported lazily: window_embed binds user32 at import time
+        import window_embed
+        self._embed = window_embed
+
+        class BITMAPINFOHEADER(ctypes.Structure):
+            _fields_ = [
+                ("biSize", wintypes.DWORD), ("biWidth", wintypes.LONG), ("biHeight", wintypes.LONG),
+                ("biPlanes", wintypes.WORD), ("biBitCount", wintypes.WORD),
+                ("biCompression", wintypes.DWORD), ("biSizeImage", wintypes.DWORD),
+                ("biXPelsPerMeter", wintypes.LONG), ("biYPelsPerMeter", wintypes.LONG),
+                ("biClrUsed", wintypes.DWORD), ("biClrImportant", wintypes.DWORD),
+            ]
+
+        class BITMAPINFO(ctypes.Structure):
+            _fields_ = [("bmiHeader", BITMAPINFOHEADER), ("bmiColors", wintypes.DWORD * 3)]
+
+        self._BITMAPINFO = BITMAPINFO
+        self._wintypes = wintypes
+        self.user32 = ctypes.windll.user32
+        self.gdi32 = ctypes.windll.gdi32
+
+        HDC = wintypes.HDC
+        self.user32.GetWindowDC.argtypes = [wintypes.HWND]
+        self.user32.GetWindowDC.restype = HDC
+        self.user32.ReleaseDC.argtypes = [wintypes.HWND, HDC]
+        self.user32.GetWindowRect.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.RECT)]
+        self.user32.SetForegroundWindow.argtypes = [wintypes.HWND]
+        self.gdi32.CreateCompatibleDC.argtypes = [HDC]
+        self.gdi32.CreateCompatibleDC.restype = HDC
+        self.gdi32.CreateDIBSection.argtypes = [
+            HDC, ctypes.POINTER(BITMAPINFO), wintypes.UINT,
+            ctypes.POINTER(ctypes.c_void_p), wintypes.HANDLE, wintypes.DWORD,
+        ]
+        self.gdi32.CreateDIBSection.restype = wintypes.HBITMAP
+        self.gdi32.SelectObject.argtypes = [HDC, wintypes.HGDIOBJ]
+        self.gdi32.SelectObject.restype = wintypes.HGDIOBJ
+        self.gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+        self.gdi32.DeleteDC.argtypes = [HDC]
+        self.gdi32.BitBlt.argtypes = [
+            HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+            HDC, ctypes.c_int, ctypes.c_int, wintypes.DWORD,
+        ]
+
+        self._contexts = _ThreadContexts(self._free_context)
+
+    def find_window(self, process_name):
+        for pid in process_snapshots.snapshot().pids_for(process_name):
+            hwnd = self._embed.find_window_for_pid(pid)
+            if hwnd:
+                return hwnd
+        return None
+
+    def is_window(self, handle):
+        return bool(handle) and bool(self._embed.IsWindow(handle))
+
+    def activate(self, handle):
+        self.user32.SetForegroundWindow(handle)
+
+    def _create_context(self, window_dc, width, height):
+        info = self._BITMAPINFO()
+        info.bmiHeader.biSize = ctypes.sizeof(info.bmiHeader)
+        info.bmiHeader.biWidth = width
+        info.bmiHeader.biHeight = -height  # Top-down rows
+        info.bmiHeader.biPlanes = 1
+        info.bmiHeader.biBitCount = 32
+        info.bmiHeader.biCompression = self.BI_RGB
+
+        bits = ctypes.c_void_p()
+        mem_dc = self.gdi32.CreateCompatibleDC(window_dc)
+        bitmap = self.gdi32.CreateDIBSection(
+            window_dc, ctypes.byref(info), self.DIB_RGB_COLORS, ctypes.byref(bits), None, 0
+        )
+        if not mem_dc or not bitmap or not bits.value:
+            if bitmap:
+                self.gdi32.DeleteObject(bitmap)
+            if mem_dc:
+                self.gdi32.DeleteDC(mem_dc)
+            return None
+        old = self.gdi32.SelectObject(mem_dc, bitmap)
+        return _DibContext(mem_dc, bitmap, old, bits.value, width, height)
+
+    def _free_context(self, context):
+        self.gdi32.SelectObject(context.mem_dc, context.old)
+        self.gdi32.DeleteObject(context.bitmap)
+        self.gdi32.DeleteDC(context.mem_dc)
+
+    def grab(self, handle):
+        rect = self._wintypes.RECT()
+        if not self.user32.GetWindowRect(handle, ctypes.byref(rect)):
+            return None
+        width = rect.right - rect.left
+        height = rect.bottom - rect.top
+        if width <= 0 or height <= 0:
+            return None
+
+        window_dc = self.user32.GetWindowDC(handle)
+        if not window_dc:
+            return None
+        try:
+            context = self._contexts.get()
+            if context is None or (context.width, context.height) != (width, height):
+                context = self._create_context(window_dc, width, height)
+                if context is None:
+                    return None
+                self._contexts.set(context)
+            if not self.gdi32.BitBlt(context.mem_dc, 0, 0, width, height, window_dc, 0, 0, self.SRCCOPY):
+                return None
+            self.gdi32.GdiFlush()
+        finally:
+            self.user32.ReleaseDC(handle, window_dc)
+        return Frame(width, height, context.view, raw_mode='BGRX')
+
+    def release(self):
+        self._contexts.release()
+
+    def close(self):
+        self._contexts.close()
+
+
+# ---------------------------------------------------------------------
+# X11 (MIT-SHM)
+# ---------------------------------------------------------------------
+
+class _XImage(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_int), ("height", ctypes.c_int), ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int), ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int), ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int), ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int), ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong), ("green_mask", ctypes.c_ulong), ("blue_mask", ctypes.c_ulong),
+        ("obdata", ctypes.c_void_p),
+        ("funcs", ctypes.c_void_p * 6),
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong), ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p), ("readOnly", ctypes.c_int),
+    ]
+
+
+class _XWindowAttributes(ctypes.Structure):
+    _fields_ = [
+        ("x", ctypes.c_int), ("y", ctypes.c_int),
+        ("width", ctypes.c_int), ("height", ctypes.c_int),
+        ("border_width", ctypes.c_int), ("depth", ctypes.c_int),
+        ("visual", ctypes.c_void_p), ("root", ctypes.c_ulong),
+        ("class_", ctypes.c_int), ("bit_gravity", ctypes.c_int), ("win_gravity", ctypes.c_int),
+        ("backing_store", ctypes.c_int), ("backing_planes", ctypes.c_ulong),
+        ("backing_pixel", ctypes.c_ulong), ("save_under", ctypes.c_int),
+        ("colormap", ctypes.c_ulong), ("map_installed", ctypes.c_int), ("map_state", ctypes.c_int),
+        ("all_event_masks", ctypes.c_long), ("your_event_mask", ctypes.c_long),
+        ("do_not_propagate_mask", ctypes.c_long), ("override_redirect", ctypes.c_int),
+        ("screen", ctypes.c_void_p),
+    ]
+
+
+class _ShmContext:
+    def __init__(self, image, info, width, height, depth, visual):
+        self.image = image
+        self.info = info
+        self.width = width
+        self.height = height
+        self.depth = depth
+        self.visual = visual
+        ximage = image.contents
+        size = ximage.bytes_per_line * height
+        self.stride = ximage.bytes_per_line
+        self.view = memoryview((ctypes.c_ubyte * size).from_address(info.shmaddr)).cast('B')
+
+
+class X11CaptureBackend(CaptureBackend):
+    """
+    XShmGetImage of the game's X window (e.g. the client under Wine) into a
+    SysV shared-memory segment that is reused between grabs. Windows are
+    matched to processes through _NET_CLIENT_LIST and _NET_WM_PID.
+    """
+
+    name = "x11"
+
+    ZPixmap = 2
+    IsViewable = 2
+    XA_CARDINAL = 6
+    XA_WINDOW = 33
+    IPC_PRIVATE = 0
+    IPC_CREAT = 0o1000
+    IPC_RMID = 0
+
+    def __init__(self, display_name=None):
+        x11_path = ctypes.util.find_library("X11")
+        xext_path = ctypes.util.find_library("Xext")
+        if not x11_path or not xext_path:
+            raise OSError("libX11/libXext not found")
+        self.x11 = ctypes.CDLL(x11_path)
+        self.xext = ctypes.CDLL(xext_path)
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._bind()
+
+        name = display_name.encode() if display_name else None
+        self.display = self.x11.XOpenDisplay(name)
+        if not self.display:
+            raise OSError("Cannot open X display")
+        if not self.xext.XShmQueryExtension(self.display):
+            self.x11.XCloseDisplay(self.display)
+            raise OSError("X server has no MIT-SHM extension")
+
+        # X errors (e.g. the window was unmapped mid-grab) must not abort the process
+        self._error = None
+        self._error_handler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)(self._on_x_error)
+        self.x11.XSetErrorHandler(self._error_handler)
+
+        self.root = self.x11.XDefaultRootWindow(self.display)
+        self._atom_client_list = self.x11.XInternAtom(self.display, b"_NET_CLIENT_LIST", False)
+        self._atom_pid = self.x11.XInternAtom(self.display, b"_NET_WM_PID", False)
+        self._lock = threading.Lock()  # One Display connection shared by all threads
+        self._contexts = _ThreadContexts(self._free_context)
+
+    def _bind(self):
+        x11, xext, libc = self.x11, self.xext, self.libc
+        Display = ctypes.c_void_p
+        Window = ctypes.c_ulong
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XOpenDisplay.restype = Display
+        x11.XCloseDisplay.argtypes = [Display]
+        x11.XDefaultRootWindow.argtypes = [Display]
+        x11.XDefaultRootWindow.restype = Window
+        x11.XInternAtom.argtypes = [Display, ctypes.c_char_p, ctypes.c_int]
+        x11.XInternAtom.restype = ctypes.c_ulong
+        x11.XSetErrorHandler.argtypes = [ctypes.c_void_p]
+        x11.XSetErrorHandler.restype = ctypes.c_void_p
+        x11.XGetWindowProperty.argtypes = [
+            Display, Window, ctypes.c_ulong, ctypes.c_long, ctypes.c_long, ctypes.c_int, ctypes.c_ulong,
+            ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.c_void_p),
+        ]
+        x11.XGetWindowAttributes.argtypes = [Display, Window, ctypes.POINTER(_XWindowAttributes)]
+        x11.XRaiseWindow.argtypes = [Display, Window]
+        x11.XSync.argtypes = [Display, ctypes.c_int]
+        x11.XFlush.argtypes = [Display]
+        x11.XFree.argtypes = [ctypes.c_void_p]
+        xext.XShmQueryExtension.argtypes = [Display]
+        xext.XShmCreateImage.argtypes = [
+            Display, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_void_p,
+            ctypes.POINTER(_XShmSegmentInfo), ctypes.c_uint, ctypes.c_uint,
+        ]
+        xext.XShmCreateImage.restype = ctypes.POINTER(_XImage)
+        xext.XShmAttach.argtypes = [Display, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmDetach.argtypes = [Display, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmGetImage.argtypes = [Display, Window, ctypes.POINTER(_XImage), ctypes.c_int, ctypes.c_int, ctypes.c_ulong]
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmat.restype = ctypes.c_void_p
+        libc.shmdt.argtypes = [ctypes.c_void_p]
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+
+    def _on_x_error(self, display, event):
+        self._error = True
+        return 0
+
+    def _property(self, window, atom, prop_type):
+        """Values of a 32-bit window property, or []"""
+        actual_type = ctypes.c_ulong()
+        actual_format = ctypes.c_int()
+        count = ctypes.c_ulong()
+        after = ctypes.c_ulong()
+        data = ctypes.c_void_p()
+        status = self.x11.XGetWindowProperty(
+            self.display, window, atom, 0, 4096, False, prop_type,
+            ctypes.byref(actual_type), ctypes.byref(actual_format),
+            ctypes.byref(count), ctypes.byref(after), ctypes.byref(data)
+        )
+        if status != 0 or not data.value:
+            return []
+        try:
+            if actual_format.value != 32:
+                return []
+            # Format 32 properties are returned as C longs
+            return list((ctypes.c_ulong * count.value).from_address(data.value))
+        finally:
+            self.x11.XFree(data)
+
+    def find_window(self, process_name):
+        pids = set(process_snapshots.snapshot().pids_for(process_name))
+        if not pids:
+            return None
+        with self._lock:
+            for window in self._property(self.root, self._atom_client_list, self.XA_WINDOW):
+                owner = self._property(window, self._atom_pid, self.XA_CARDINAL)
+                if owner and owner[0] in pids and self._attributes(window):
+                    return window
+        return None
+
+    def _attributes(self, window):
+        """Attributes of a mapped window, or None"""
+        attributes = _XWindowAttributes()
+        self._error = None
+        ok = self.x11.XGetWindowAttributes(self.display, window, ctypes.byref(attributes))
+        if not ok or self._error or attributes.map_state != self.IsViewable:
+            return None
+        return attributes
+
+    def is_window(self, handle):
+        with self._lock:
+            return bool(handle) and self._attributes(handle) is not None
+
+    def activate(self, handle):
+        with self._lock:
+            self.x11.XRaiseWindow(self.display, handle)
+            self.x11.XFlush(self.display)
+
+    def _create_context(self, attributes):
+        width, height = attributes.width, attributes.height
+        info = _XShmSegmentInfo()
+        image = self.xext.XShmCreateImage(
+            self.display, attributes.visual, attributes.depth, self.ZPixmap,
+            None, ctypes.byref(info), width, height
+        )
+        if not image:
+            return None
+        size = image.contents.bytes_per_line * height
+        info.shmid = self.libc.shmget(self.IPC_PRIVATE, size, self.IPC_CREAT | 0o600)
+        if info.shmid < 0:
+            self.x11.XFree(image)
+            return None
+        address = self.libc.shmat(info.shmid, None, 0)
+        if address in (None, ctypes.c_void_p(-1).value):
+            self.libc.shmctl(info.shmid, self.IPC_RMID, None)
+            self.x11.XFree(image)
+            return None
+        info.shmaddr = address
+        info.readOnly = False
+        image.contents.data = address
+        self.xext.XShmAttach(self.display, ctypes.byref(info))
+        self.x11.XSync(self.display, False)
+        # Removed once both sides detach, so a crash can't leak the segment
+        self.libc.shmctl(info.shmid, self.IPC_RMID, None)
+        return _ShmContext(image, info, width, height, attributes.depth, attributes.visual)
+
+    def _free_context(self, context):
+        with self._lock:
+            self.xext.XShmDetach(self.display, ctypes.byref(context.info))
+            self.x11.XSync(self.display, False)
+            self.libc.shmdt(context.info.shmaddr)
+            self.x11.XFree(context.image)
+
+    def grab(self, handle):
+        with self._lock:
+            attributes = self._attributes(handle)
+            if attributes is None or attributes.depth not in (24, 32):
+                return None
+            context = self._contexts.get()
+            if context is None or (context.width, context.height, context.visual) != \
+                    (attributes.width, attributes.height, attributes.visual):
+                stale = context
+                context = self._create_context(attributes)
+                if context is None:
+                    return None
+            else:
+                stale = None
+            self._error = None
+            ok = self.xext.XShmGetImage(self.display, handle, context.image, 0, 0, 0xFFFFFFFF)
+            self.x11.XSync(self.display, False)
+            failed = not ok or self._error
+        # (Re)registering may free the old context, which takes the lock itself
+        if stale is not None or self._contexts.get() is not context:
+            self._contexts.set(context)
+        if failed:
+            return None
+        # 24/32-bit TrueColor ZPixmap on little-endian: B, G, R, X per pixel
+        return Frame(context.width, context.height, context.view, raw_mode='BGRX', stride=context.stride)
+
+    def release(self):
+        self._contexts.release()
+
+    def close(self):
+        self._contexts.close()
+        with self._lock:
+            if self.display:
+                self.x11.XCloseDisplay(self.display)
+                self.display = None
+
+
+def default_capture_backend():
+    """The capture backend for this platform, or None if capturing isn't possible"""
+    try:
+        if sys.platform == "win32":
+            return Win32CaptureBackend()
+        if os.environ.get("DISPLAY"):
+            return X11CaptureBackend()
+    except Exception as e:
+        print(f"Warning: No screen capture backend available: {e}")
+    return None
@@ -0,0 +1,184 @@
+# client_layout.py
+#
+# Layout and focus/throttle policy for several embedded clients.
+#
+# Each embedded client lives in its own host window. The layout decides
+# where every host goes inside the client area and which clients are
+# visible:
+#   - "tabs": only the focused client is shown, at full size
+#   - "grid": every client is shown in an equally sized tile
+# Clients that are not shown are parked: their game window is moved
+# offscreen (keeping its size, so the client doesn't reset its renderer)
+# and their host is hidden, which stops the compositor from drawing them.
+#
+# The layout only talks to a WindowBackend and a place_host callback, so
+# it runs on Linux against FakeWindowBackend.
+
+import math
+
+MODE_TABS = "tabs"
+MODE_GRID = "grid"
+MODES = (MODE_TABS, MODE_GRID)
+
+OFFSCREEN = -32000
+
+
+class Tile:
+    """Where one client's host goes, in client-area coordinates."""
+
+    def __init__(self, pid, hwnd, host, x, y, width, height, visible):
+        self.pid = pid
+        self.hwnd = hwnd
+        self.host = host
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.visible = visible
+
+    def key(self):
+        return (self.host, self.x, self.y, self.width, self.height, self.visible)
+
+    def to_dict(self):
+        return {
+            "pid": self.pid,
+            "hwnd": self.hwnd,
+            "x": self.x,
+            "y": self.y,
+            "width": self.width,
+            "height": self.height,
+            "visible": self.visible,
+        }
+
+
+class ClientLayout:
+    """
+    Tiles embedded clients and parks the ones that aren't shown.
+
+    Args:
+        backend: WindowBackend used to move the game windows
+        mode: MODE_TABS or MODE_GRID
+        place_host: Optional callback(tile) that positions and shows/hides
+            the host widget of a client
+    """
+
+    def __init__(self, backend, mode=MODE_TABS, place_host=None):
+        self.backend = backend
+        self.mode = mode if mode in MODES else MODE_TABS
+        self.place_host = place_host
+        self.width = 0
+        self.height = 0
+        self.focused_pid = None
+        self._clients = {}   # pid -> (hwnd, host), in embedding order
+        self._applied = {}   # pid -> Tile.key() last applied
+
+    def add(self, pid, hwnd, host, focus=True):
+        self._clients[pid] = (hwnd, host)
+        if focus or self.focused_pid is None:
+            self.focused_pid = pid
+        self.apply()
+
+    def remove(self, pid):
+        """
+        Drop a client (exited or lost its window); focus moves to the next one.
+
+        Returns:
+            bool: True if the client was in the layout
+        """
+        if self._clients.pop(pid, None) is None:
+            return False
+        self._applied.pop(pid, None)
+        if self.focused_pid == pid:
+            self.focused_pid = next(iter(self._clients), None)
+        self.apply()
+        return True
+
+    def pid_of(self, hwnd):
+        for pid, (client_hwnd, _) in self._clients.items():
+            if client_hwnd == hwnd:
+                return pid
+        return None
+
+    def clients(self):
+        return list(self._clients)
+
+    def focus(self, pid):
+        """
+        Returns:
+            bool: True if the focus changed
+        """
+        if pid not in self._clients or pid == self.focused_pid:
+            return False
+        self.focused_pid = pid
+        self.apply()
+        return True
+
+    def set_mode(self, mode):
+        if mode not in MODES or mode == self.mode:
+            return False
+        self.mode = mode
+        self.apply()
+        return True
+
+    def resize(self, width, height):
+        if (width, height) == (self.width, self.height):
+            return
+        self.width = width
+        self.height = height
+        self.apply()
+
+    def invalidate(self, pid):
+        """Forget what was applied to `pid` (e.g. after the watchdog moved it)"""
+        self._applied.pop(pid, None)
+
+    def plan(self):
+        """
+        Returns:
+            list[Tile]: One tile per client, in embedding order
+        """
+        pids = list(self._clients)
+        tiles = []
+        if self.mode == MODE_GRID and pids:
+            cols = math.ceil(math.sqrt(len(pids)))
+            rows = math.ceil(len(pids) / cols)
+            tile_w = self.width // cols
+            tile_h = self.height // rows
+            for index, pid in enumerate(pids):
+                row, col = divmod(index, cols)
+                hwnd, host = self._clients[pid]
+                tiles.append(Tile(pid, hwnd, host, col * tile_w, row * tile_h, tile_w, tile_h, True))
+        else:
+            for pid in pids:
+                hwnd, host = self._clients[pid]
+                tiles.append(Tile(pid, hwnd, host, 0, 0, self.width, self.height, pid == self.focused_pid))
+        return tiles
+
+    def apply(self):
+        """
+        Move hosts and game windows to the current plan. Only clients whose
+        tile changed since the last apply are touched.
+
+        Returns:
+            list[Tile]: The tiles that were applied
+        """
+        changed = []
+        for tile in self.plan():
+            key = tile.key()
+            if self._applied.get(tile.pid) == key:
+                continue
+            if tile.visible:
+                self.backend.move_window(tile.hwnd, 0, 0, tile.width, tile.height)
+            else:
+                self.backend.move_window(tile.hwnd, OFFSCREEN, OFFSCREEN, tile.width, tile.height)
+            if self.place_host:
+                self.place_host(tile)
+            self._applied[tile.pid] = key
+            changed.append(tile)
+        return changed
+
+    def to_dict(self):
+        return {
+            "mode": self.mode,
+            "focused": self.focused_pid,
+            "clients": [tile.to_dict() for tile in self.plan()],
+        }
@@ -0,0 +1,152 @@
+# embed_watchdog.py
+#
+# Keeps embedded game windows embedded.
+#
+# The MU client sometimes reasserts its top-level styles or re-parents
+# itself to the desktop. Instead of re-reading the window every second,
+# the watchdog caches the style each window had right after embedding
+# (its known-good style) and only re-checks when the backend reports a
+# change, plus a backoff poll as a safety net for changes that raise no
+# notification. Work is only done on transitions out of the known-good state.
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from window_backend import EMBED_STYLE_MASK
+
+INITIAL_POLL_MS = 250
+MAX_POLL_MS = 8000
+
+
+class _Embed:
+    def __init__(self, hwnd, host, width, height, style):
+        self.hwnd = hwnd
+        self.host = host
+        self.width = width
+        self.height = height
+        self.good_style = style
+        self.delay = INITIAL_POLL_MS
+        self.token = None
+        self.timer = None
+        self.check_queued = False
+        self.checks = 0
+        self.restores = 0
+
+
+class EmbedWatchdog(QObject):
+    """
+    Watches embedded windows and restores them when they escape.
+
+    Usage:
+        watchdog = EmbedWatchdog(backend)
+        watchdog.watch(hwnd, host, width, height)   # right after a successful embed
+        watchdog.resize(hwnd, width, height)
+        watchdog.unwatch(hwnd)
+    """
+
+    # Signals
+    embedRestored = pyqtSignal(int)  # hwnd
+    embedLost = pyqtSignal(int)      # hwnd (game or host window destroyed)
+
+    def __init__(self, backend, initial_poll_ms=INITIAL_POLL_MS, max_poll_ms=MAX_POLL_MS):
+        super().__init__()
+        self.backend = backend
+        self.initial_poll_ms = initial_poll_ms
+        self.max_poll_ms = max_poll_ms
+        self._embeds = {}  # hwnd -> _Embed
+
+    def watch(self, hwnd, host, width, height):
+        """Start guarding `hwnd`, taking its current style as known-good"""
+        self.unwatch(hwnd)
+        embed = _Embed(hwnd, host, width, height, self.backend.get_style(hwnd))
+        embed.delay = self.initial_poll_ms
+        self._embeds[hwnd] = embed
+
+        embed.token = self.backend.watch_embed(hwnd, self._on_window_changed)
+        embed.timer = QTimer(self)
+        embed.timer.setSingleShot(True)
+        embed.timer.timeout.connect(lambda: self._poll(hwnd))
+        embed.timer.start(embed.delay)
+        print(f"[EmbedWatchdog] Watching {hwnd} in {host} (style=0x{embed.good_style:08X})")
+
+    def unwatch(self, hwnd):
+        embed = self._embeds.pop(hwnd, None)
+        if embed is None:
+            return
+        if embed.token is not None:
+            self.backend.unwatch_embed(embed.token)
+        if embed.timer is not None:
+            embed.timer.stop()
+            embed.timer.deleteLater()
+
+    def unwatch_all(self):
+        for hwnd in list(self._embeds):
+            self.unwatch(hwnd)
+
+    def resize(self, hwnd, width, height):
+        """Update the size used when restoring `hwnd`"""
+        embed = self._embeds.get(hwnd)
+        if embed:
+            embed.width = width
+            embed.height = height
+
+    def watched(self):
+        return list(self._embeds)
+
+    def stats(self, hwnd):
+        embed = self._embeds.get(hwnd)
+        if embed is None:
+            return None
+        return {"checks": embed.checks, "restores": embed.restores, "poll_ms": embed.delay}
+
+    def _on_window_changed(self, hwnd):
+        # Notifications arrive in bursts (every move fires one);
+        # coalesce them into a single check on the next event loop pass
+        embed = self._embeds.get(hwnd)
+        if embed is None or embed.check_queued:
+            return
+        embed.check_queued = True
+        QTimer.singleShot(0, lambda: self._queued_check(embed))
+
+    def _queued_check(self, embed):
+        embed.check_queued = False
+        if self._embeds.get(embed.hwnd) is embed and not self._check(embed):
+            # A transition happened: poll closely again until it settles
+            embed.delay = self.initial_poll_ms
+            embed.timer.start(embed.delay)
+
+    def _poll(self, hwnd):
+        embed = self._embeds.get(hwnd)
+        if embed is None:
+            return
+        if self._check(embed):
+            # Stable: back off
+            embed.delay = min(embed.delay * 2, self.max_poll_ms)
+        else:
+            embed.delay = self.initial_poll_ms
+        if hwnd in self._embeds:
+            embed.timer.start(embed.delay)
+
+    def _check(self, embed):
+        """
+        Returns:
+            bool: True if the window was still in its known-good state
+        """
+        embed.checks += 1
+        style = self.backend.get_style(embed.hwnd)
+        if (style & EMBED_STYLE_MASK) == (embed.good_style & EMBED_STYLE_MASK) \
+                and self.backend.get_parent(embed.hwnd) == embed.host:
+            return True
+
+        if not self.backend.is_window(embed.hwnd) or not self.backend.is_window(embed.host):
+            print(f"[EmbedWatchdog] Window {embed.hwnd} or its host is gone")
+            self.unwatch(embed.hwnd)
+            self.embedLost.emit(embed.hwnd)
+            return False
+
+        # Keep the bits the game owns, restore the ones that make it a child
+        restored = (style & ~EMBED_STYLE_MASK) | (embed.good_style & EMBED_STYLE_MASK)
+        print(f"[EmbedWatchdog] {embed.hwnd} escaped (style=0x{style:08X}), restoring")
+        if self.backend.restore_embed(embed.hwnd, embed.host, embed.width, embed.height, restored):
+            embed.restores += 1
+            self.embedRestored.emit(embed.hwnd)
+        return False
@@ -1,10 +1,75 @@
 import threading
 import time
+import heapq
+import bisect
+import itertools
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from PyQt6.QtCore import QObject, pyqtSignal
 
+DEFAULT_API_URL = "http://localhost/CustomLauncher/api/"
+LOOKAHEAD_DAYS = 7  # How far ahead occurrence streams are generated
+
+
+class EventSource:
+    """
+    One schedule source (a single MU server instance).
+
+    The schedule is sorted by time of day once, when it is fetched, so the
+    per-tick work is only a bisect into today's list plus a lazy walk.
+    """
+
+    def __init__(self, server, api_url):
+        self.server = server
+        self.api_url = api_url
+        self.schedule = []  # Sorted list of (minutes_of_day, event_time_str, event)
+        self.loaded = False
+
+    def events_url(self):
+        """URL of the events endpoint for this source"""
+        return self.api_url + "../events.php"
+
+    def set_events(self, events):
+        """Replace the schedule with a freshly fetched event list"""
+        schedule = []
+        for event in events:
+            event_time_str = event.get('time', '00:00')
+            try:
+                hour, minute = map(int, event_time_str.split(':'))
+            except Exception as e:
+                print(f"Error parsing event time for {event.get('name')}: {e}")
+                continue
+            schedule.append((hour * 60 + minute, event_time_str, event))
+        schedule.sort(key=lambda entry: entry[0])
+        # Single assignment so the timer thread never sees a half-built list
+        self.schedule = schedule
+        self.loaded = True
+
+    def occurrences(self, now, days=LOOKAHEAD_DAYS):
+        """
+        Yield (event_datetime, server, event_time_str, event) in chronological
+        order, starting at `now` and covering the next `days` days.
+        """
+        schedule = self.schedule
+        if not schedule:
+            return
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        # Events in the current minute are still upcoming if their second hasn't passed
+        start = bisect.bisect_left(schedule, now.hour * 60 + now.minute, key=lambda entry: entry[0])
+        for offset in range(days):
+            day = today + timedelta(days=offset)
+            day_name = day.strftime('%a')
+            for minutes, event_time_str, event in schedule[start if offset == 0 else 0:]:
+                if day_name not in event.get('days', []):
+                    continue
+                event_time = day + timedelta(minutes=minutes)
+                if event_time < now:
+                    continue
+                yield (event_time, self.server, event_time_str, event)
+
+
 class EventTimerService(QObject):
     # Signals
     eventUpdated = pyqtSignal(str)  # Emits JSON string with event updates
@@ -13,10 +78,65 @@ class EventTimerService(QObject):
     def __init__(self, settings_manager=None):
         super().__init__()
         self.settings = settings_manager
-        self.events = []
+        self.sources = []  # One EventSource per subscribed server
         self.running = False
         self.thread = None
         self.notified_events = set()  # Track which events we've notified about
+        self._sources_lock = threading.Lock()
+        self._configure_sources()
+        
+    @property
+    def events(self):
+        """Flat list of all events across sources (for backward compatibility)"""
+        return [entry[2] for source in self.sources for entry in source.schedule]
+    
+    def _configure_sources(self):
+        """
+        Build the source list from settings.
+        
+        `event_sources` is a list of {"server": name, "api_url": url}; when it
+        is missing the single `api_url` setting is used as the only source.
+        """
+        configured = []
+        if self.settings:
+            configured = self.settings.get("event_sources") or []
+        
+        sources = []
+        for entry in configured:
+            api_url = entry.get("api_url")
+            if not api_url:
+                continue
+            server = entry.get("server") or entry.get("name") or api_url
+            sources.append(EventSource(server, api_url))
+        
+        if not sources:
+            api_url = DEFAULT_API_URL
+            server = "MU Online Custom Server"
+            if self.settings:
+                api_url = self.settings.get("api_url", DEFAULT_API_URL)
+                server = self.settings.get("server_name", server)
+            sources.append(EventSource(server, api_url))
+        
+        with self._sources_lock:
+            self.sources = sources
+    
+    def add_source(self, server, api_url, fetch=True):
+        """
+        Subscribe to an additional schedule source.
+        
+        Only the new source is fetched and sorted; existing streams are untouched.
+        """
+        source = EventSource(server, api_url)
+        if fetch:
+            self._fetch_source(source)
+        with self._sources_lock:
+            self.sources = [s for s in self.sources if s.server != server] + [source]
+        return source
+    
+    def remove_source(self, server):
+        """Unsubscribe from a schedule source by server name"""
+        with self._sources_lock:
+            self.sources = [s for s in self.sources if s.server != server]
         
     def start(self):
         """Start the background event timer thread"""
@@ -34,27 +154,31 @@ class EventTimerService(QObject):
         print("Event timer service stopped")
     
     def fetch_events(self):
-        """Fetch events from the API"""
+        """Fetch events from every source concurrently"""
+        sources = self.sources
+        with ThreadPoolExecutor(max_workers=len(sources) or 1) as pool:
+            results = list(pool.map(self._fetch_source, sources))
+        return any(results)
+    
+    def _fetch_source(self, source):
+        """Fetch and sort the schedule of a single source"""
         try:
-            api_url = "http://localhost/CustomLauncher/api/events.php"
-            if self.settings:
-                api_url = self.settings.get("api_url", "http://localhost/CustomLauncher/api/") + "../events.php"
-            
-            response = requests.get(api_url, timeout=5)
+            response = requests.get(source.events_url(), timeout=5)
             if response.status_code == 200:
                 data = response.json()
-                self.events = data.get('events', [])
-                print(f"Loaded {len(self.events)} events from API")
+                source.set_events(data.get('events', []))
+                print(f"Loaded {len(source.schedule)} events from {source.server}")
                 return True
         except Exception as e:
-            print(f"Error fetching events: {e}")
-            # Use fallback events if API fails
-            self._load_fallback_events()
+            print(f"Error fetching events from {source.server}: {e}")
+            # Use fallback events if API fails and nothing was loaded before
+            if not source.loaded:
+                source.set_events(self._load_fallback_events())
         return False
     
     def _load_fallback_events(self):
-        """Load fallback events if API is unavailable"""
-        self.events = [
+        """Fallback events used if API is unavailable"""
+        return [
             {
                 'name': 'Blood Castle',
                 'time': '00:00',
@@ -98,48 +222,47 @@ class EventTimerService(QObject):
                 print(f"Error in event timer loop: {e}")
                 time.sleep(1)
     
+    def _merged_occurrences(self, now):
+        """Lazily k-way merge the pre-sorted occurrence streams of all sources"""
+        streams = [source.occurrences(now) for source in self.sources]
+        return heapq.merge(*streams, key=lambda occurrence: occurrence[0])
+    
+    def _to_upcoming(self, occurrence, now):
+        """Convert a merged occurrence into the dict shape sent to the UI"""
+        event_time, server, event_time_str, event = occurrence
+        seconds_until = int((event_time - now).total_seconds())
+        return {
+            'name': event['name'],
+            'server': server,
+            'category': event.get('category', 'Event'),
+            'time': event_time_str,
+            'start': event_time.isoformat(),
+            'seconds_until': seconds_until,
+            'time_until_str': self._format_time_until(seconds_until),
+            'status': 'upcoming'
+        }
+    
     def get_upcoming_events(self):
-        """Calculate and return upcoming events with countdown"""
+        """Calculate and return today's upcoming events across all servers (closest first)"""
         now = datetime.now()
-        current_day = now.strftime('%a')  # Mon, Tue, etc.
-        
-        upcoming = []
-        
-        for event in self.events:
-            # Check if event runs today
-            if current_day not in event.get('days', []):
-                continue
-            
-            # Parse event time
-            event_time_str = event.get('time', '00:00')
-            try:
-                hour, minute = map(int, event_time_str.split(':'))
-                event_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                
-                # If event time has passed today, skip it
-                if event_time < now:
-                    continue
-                
-                # Calculate time until event
-                time_until = event_time - now
-                seconds_until = int(time_until.total_seconds())
-                
-                upcoming.append({
-                    'name': event['name'],
-                    'category': event.get('category', 'Event'),
-                    'time': event_time_str,
-                    'seconds_until': seconds_until,
-                    'time_until_str': self._format_time_until(seconds_until),
-                    'status': 'upcoming'
-                })
-                
-            except Exception as e:
-                print(f"Error parsing event time for {event.get('name')}: {e}")
-        
-        # Sort by time until (closest first)
-        upcoming.sort(key=lambda x: x['seconds_until'])
+        tomorrow = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
         
-        return upcoming
+        today_only = itertools.takewhile(
+            lambda occurrence: occurrence[0] < tomorrow,
+            self._merged_occurrences(now)
+        )
+        return [self._to_upcoming(occurrence, now) for occurrence in today_only]
+    
+    def get_next_events(self, limit=10):
+        """
+        Return the next `limit` events across all servers, looking ahead up
+        to a week. Only `limit` items are pulled from the merge.
+        """
+        now = datetime.now()
+        return [
+            self._to_upcoming(occurrence, now)
+            for occurrence in itertools.islice(self._merged_occurrences(now), limit)
+        ]
     
     def _format_time_until(self, seconds):
         """Format seconds into human-readable string"""
@@ -159,24 +282,27 @@ class EventTimerService(QObject):
         for event in upcoming_events:
             seconds_until = event['seconds_until']
             event_name = event['name']
+            server = event.get('server', '')
             
             # Check if event is 5 minutes away (300 seconds ± 2 seconds tolerance)
             if 298 <= seconds_until <= 302:
                 # Create unique key for this event occurrence
-                event_key = f"{event_name}_{event['time']}"
+                event_key = f"{server}_{event_name}_{event['time']}"
                 
                 # Only notify once per event occurrence
                 if event_key not in self.notified_events:
                     self.notified_events.add(event_key)
-                    self.eventNotification.emit(event_name, 5)
-                    print(f"5-minute notification: {event_name}")
+                    # Tag with the server when several schedules are subscribed
+                    label = f"{event_name} ({server})" if len(self.sources) > 1 else event_name
+                    self.eventNotification.emit(label, 5)
+                    print(f"5-minute notification: {label}")
                     
                     # Play sound notification (optional)
                     self._play_notification_sound()
             
             # Clean up old notifications (events that have passed)
             elif seconds_until > 310:
-                event_key = f"{event_name}_{event['time']}"
+                event_key = f"{server}_{event_name}_{event['time']}"
                 self.notified_events.discard(event_key)
     
     def _play_notification_sound(self):
@@ -190,7 +316,7 @@ class EventTimerService(QObject):
     
     def get_next_event(self):
         """Get the next upcoming event"""
-        upcoming = self.get_upcoming_events()
+        upcoming = self.get_next_events(1)
         return upcoming[0] if upcoming else None
     
     def refresh_events(self):
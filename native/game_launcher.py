@@ -2,7 +2,9 @@ import subprocess
 import psutil
 import os
 import time
-from PyQt6.QtCore import QProcess, QTimer, QObject, pyqtSignal
+import json
+import threading
+from PyQt6.QtCore import QProcess, QObject, pyqtSignal
 from PyQt6.QtWidgets import QWidget, QVBoxLayout
 
 try:
@@ -14,14 +16,32 @@ except ImportError:
     WIN32_AVAILABLE = False
     print("Warning: pywin32 not available. Window embedding will not work.")
 
-# Import the new PID-based window embedding module
-from window_embed import find_mu_hwnd, embed_window, verify_and_fix_embed
+# Windowing goes through a pluggable backend (Win32 on Windows, fake in tests)
+from window_backend import default_backend
+from window_discovery import WindowDiscovery
+from process_snapshot import process_snapshots
+from process_watcher import ProcessWatcher
+from placement_policy import PlacementPolicy
+from termination_manager import TerminationManager
+from cache_prewarmer import CachePrewarmer
+from launch_timeline import (
+    LaunchTimeline, PHASE_LIMIT_CHECKED, PHASE_WINDOW_FOUND, PHASE_EMBED_START, PHASE_EMBEDDED
+)
+
+DEFAULT_LAUNCH_STAGGER_MS = 1500  # Gap between clients in a batch launch (avoids disk thrashing)
+
 
 class GameLauncher(QObject):
     # Signal emitted when game client window is found (for embedding)
     clientWindowFound = pyqtSignal(int)  # HWND
+    # Emitted when the player switches to another client
+    clientFocused = pyqtSignal(int)  # PID
+    # Emitted when a batch launch finishes: JSON {batch_id, results: [...]}
+    clientsLaunched = pyqtSignal(str)
+    # Internal: a worker thread spawned a client (queued to the GUI thread for embedding)
+    _clientSpawned = pyqtSignal(int)
     
-    def __init__(self, settings_manager, parent_widget=None):
+    def __init__(self, settings_manager, parent_widget=None, window_backend=None):
         super().__init__()
         self.settings = settings_manager
         self.parent_widget = parent_widget
@@ -31,9 +51,45 @@ class GameLauncher(QObject):
         self.process_list = []  # Track all launched processes
         self.managed_pids = set()  # PIDs launched by this launcher (for anti-direct-launch detection)
         
+        # Exit notifications keep managed_pids/process_list current without polling
+        self.process_watcher = ProcessWatcher()
+        self.process_watcher.processExited.connect(self._on_process_exited)
+        
+        # Parallel, non-blocking shutdown of clients
+        self.termination = TerminationManager()
+        
+        # PID-targeted window discovery for embedding
+        self.window_backend = window_backend if window_backend is not None else default_backend()
+        self.window_discovery = None
+        if self.window_backend is not None:
+            self.window_discovery = WindowDiscovery(
+                self.window_backend,
+                timeout_ms=self.settings.get("window_discovery_timeout_ms", 15000)
+            )
+            self.window_discovery.windowFound.connect(self._on_window_found)
+            self.window_discovery.windowTimeout.connect(self._on_window_timeout)
+        
+        # Click-to-window latency tracking
+        self.timeline = LaunchTimeline()
+        self._hwnd_pids = {}  # Found window -> client PID (for timeline phases)
+        self._window_pids = {}  # Found window -> client PID, until the client exits
+        self._external_pids = set()  # Clients watched for the timeline only (window not embedded)
+        
+        # Page-cache prewarming of the client's data files
+        self.prewarmer = CachePrewarmer(settings_manager)
+        
+        # CPU affinity / priority placement of clients
+        self.placement = PlacementPolicy(settings_manager)
+        
+        # Guards managed_pids/process_list and the in-flight spawn reservations
+        self._lock = threading.RLock()
+        self._pending_spawns = 0
+        self._batch_counter = 0
+        self._clientSpawned.connect(self._on_client_spawned)
+        
     def launch(self, config=None):
         """
-        Launch the game with optional configuration
+        Launch the game with optional configuration (safe to call from a worker thread)
         
         Args:
             config (dict): Optional configuration override
@@ -41,86 +97,266 @@ class GameLauncher(QObject):
         Returns:
             tuple: (success: bool, message: str)
         """
+        record = self.timeline.begin()
         game_path = self.settings.get("game_executable", "main.exe")
-        # Support both config key names
-        max_clients = self.settings.get("processLimit") or self.settings.get("max_clients", 3)
-        # Fix #1: Support both config key names for embedding
-        embed_window = self.settings.get("embed_game_window") or self.settings.get("embedGameWindow", False)
-        
-        # Check process limit
-        if self.count_running_instances(os.path.basename(game_path)) >= max_clients:
-            return False, f"Max clients reached ({max_clients})"
+        max_clients = self._max_clients()
         
         # Check if executable exists
         if not os.path.exists(game_path):
             return False, f"Game executable not found: {game_path}"
         
+        # Check process limit (reserves the slot so a concurrent batch can't overshoot)
+        if not self._reserve_slots(os.path.basename(game_path), max_clients, 1):
+            return False, f"Max clients reached ({max_clients})"
+        self.timeline.mark(record, PHASE_LIMIT_CHECKED)
+        
         try:
-            if embed_window and WIN32_AVAILABLE and self.parent_widget:
-                return self._launch_embedded(game_path)
+            if self._can_embed():
+                return self._launch_embedded(game_path, record)
             else:
-                return self._launch_normal(game_path)
+                return self._launch_normal(game_path, record)
         except Exception as e:
             return False, f"Launch error: {str(e)}"
+        finally:
+            self._release_slot()
     
-    def _launch_normal(self, game_path):
-        """Launch game normally without embedding"""
-        try:
-            # Use the directory of the game executable as the working directory
-            game_dir = os.path.dirname(os.path.abspath(game_path))
-            process = subprocess.Popen([game_path], cwd=game_dir)
+    def launch_clients(self, count, profiles=None, stagger_ms=None):
+        """
+        Launch several clients from a worker thread, one every `stagger_ms`.
+        
+        Args:
+            count (int): Number of clients requested
+            profiles (list): Optional per-client overrides, matched by index.
+                Each may contain `working_dir`, `args` (list) and `env` (dict).
+            stagger_ms (int): Delay between spawns (defaults to `launch_stagger_ms` setting)
+            
+        Returns:
+            dict: {batch_id, accepted, message}. Per-client results (PID and
+            spawn latency) are emitted later through clientsLaunched.
+        """
+        game_path = self.settings.get("game_executable", "main.exe")
+        max_clients = self._max_clients()
+        
+        if not os.path.exists(game_path):
+            return {"batch_id": None, "accepted": 0, "message": f"Game executable not found: {game_path}"}
+        
+        granted = self._reserve_slots(os.path.basename(game_path), max_clients, max(0, int(count)))
+        if granted == 0:
+            return {"batch_id": None, "accepted": 0, "message": f"Max clients reached ({max_clients})"}
+        
+        if stagger_ms is None:
+            stagger_ms = self.settings.get("launch_stagger_ms", DEFAULT_LAUNCH_STAGGER_MS)
+        
+        with self._lock:
+            self._batch_counter += 1
+            batch_id = self._batch_counter
+        
+        worker = threading.Thread(
+            target=self._run_batch,
+            args=(batch_id, game_path, granted, list(profiles or []), stagger_ms / 1000.0),
+            daemon=True
+        )
+        worker.start()
+        
+        return {
+            "batch_id": batch_id,
+            "accepted": granted,
+            "message": f"Launching {granted} of {count} clients"
+        }
+    
+    def _run_batch(self, batch_id, game_path, count, profiles, stagger):
+        """Worker: spawn `count` reserved clients with a stagger between them"""
+        results = []
+        for index in range(count):
+            if index > 0 and stagger > 0:
+                time.sleep(stagger)
+            
+            profile = profiles[index] if index < len(profiles) else {}
+            # The slot was reserved up front, so the limit phase is instantaneous
+            record = self.timeline.begin()
+            self.timeline.mark(record, PHASE_LIMIT_CHECKED)
+            started = time.perf_counter()
+            try:
+                process = self._spawn(game_path, profile, record)
+                results.append({
+                    "index": index,
+                    "success": True,
+                    "pid": process.pid,
+                    "spawn_ms": round((time.perf_counter() - started) * 1000, 2)
+                })
+                if self._can_embed():
+                    self._clientSpawned.emit(process.pid)
+                else:
+                    self._time_external_window(process.pid, record)
+            except Exception as e:
+                results.append({
+                    "index": index,
+                    "success": False,
+                    "pid": None,
+                    "message": str(e),
+                    "spawn_ms": round((time.perf_counter() - started) * 1000, 2)
+                })
+            finally:
+                self._release_slot()
+        
+        launched = sum(1 for r in results if r["success"])
+        print(f"[GameLauncher] Batch {batch_id}: launched {launched}/{count} clients")
+        self.clientsLaunched.emit(json.dumps({"batch_id": batch_id, "results": results}))
+    
+    def _on_client_spawned(self, pid):
+        """Runs on the GUI thread: start window discovery for a spawned client"""
+        if self.window_discovery is not None:
+            self.window_discovery.watch(pid)
+    
+    def _time_external_window(self, pid, record):
+        """External window mode: keep the launch record open until the client shows its window"""
+        if self.window_discovery is None:
+            # No window backend on this platform: the launch ends at spawn
+            self.timeline.finish(record)
+            return
+        with self._lock:
+            self._external_pids.add(pid)
+        self._clientSpawned.emit(pid)
+    
+    def _max_clients(self):
+        # processLimit/max_clients are resolved by the settings model
+        return self.settings.snapshot.max_clients
+    
+    def _embed_enabled(self):
+        # embedGameWindow/embed_game_window are resolved by the settings model
+        return self.settings.snapshot.embed_game_window
+    
+    def _can_embed(self):
+        return bool(self._embed_enabled() and self.window_discovery is not None and self.parent_widget)
+    
+    def _reserve_slots(self, game_name, max_clients, wanted):
+        """
+        Atomically reserve up to `wanted` client slots under the process limit.
+        
+        Running clients are our own managed PIDs (always current) plus any
+        other game processes in the shared snapshot; spawns still in flight
+        are counted through the pending reservations.
+        
+        Returns:
+            int: Number of slots granted (release each with _release_slot)
+        """
+        with self._lock:
+            snapshot = process_snapshots.snapshot()
+            others = [pid for pid in snapshot.pids_for(game_name) if pid not in self.managed_pids]
+            running = len(self.managed_pids) + len(others) + self._pending_spawns
+            granted = max(0, min(wanted, max_clients - running))
+            self._pending_spawns += granted
+            return granted
+    
+    def _release_slot(self):
+        with self._lock:
+            self._pending_spawns = max(0, self._pending_spawns - 1)
+    
+    def _spawn(self, game_path, profile=None, record=None):
+        """
+        Start one client process and register it as managed.
+        
+        Args:
+            game_path (str): Game executable
+            profile (dict): Optional `working_dir`, `args` and `env` overrides
+            record (LaunchRecord): Optional timeline record to attach the PID to
+        """
+        profile = profile or {}
+        # Use the directory of the game executable as the working directory
+        game_dir = profile.get("working_dir") or os.path.dirname(os.path.abspath(game_path))
+        command = [game_path] + [str(arg) for arg in profile.get("args", [])]
+        env = None
+        if profile.get("env"):
+            env = dict(os.environ)
+            env.update({str(k): str(v) for k, v in profile["env"].items()})
+        
+        # Spawn and register under the lock scan_unmanaged_processes() takes,
+        # so a scan can never see the new PID before it is known as managed
+        with self._lock:
+            process = subprocess.Popen(command, cwd=game_dir, env=env)
             self.process_list.append(process)
             # Track this PID as managed
             self.managed_pids.add(process.pid)
-            print(f"[GameLauncher] Started process with PID {process.pid}")
+            self.process_watcher.watch_child(process, os.path.basename(game_path))
+        if record is not None:
+            self.timeline.attach(record, process.pid)
+        process_snapshots.invalidate()
+        self.placement.place(process.pid)
+        # Prewarming runs before launch only; it would compete with the client's startup reads
+        self.prewarmer.client_spawned()
+        self.prewarmer.schedule_learning(process.pid)
+        print(f"[GameLauncher] Started process with PID {process.pid}")
+        return process
+    
+    def _launch_normal(self, game_path, record=None):
+        """Launch game normally without embedding"""
+        try:
+            process = self._spawn(game_path, record=record)
+            self._time_external_window(process.pid, record)
             return True, "Game launched successfully"
         except Exception as e:
             return False, str(e)
     
-    def _launch_embedded(self, game_path):
+    def _launch_embedded(self, game_path, record=None):
         """Launch game and embed its window into the launcher"""
-        if not WIN32_AVAILABLE:
-            return False, "Win32 APIs not available for window embedding"
+        if self.window_discovery is None:
+            return False, "No window backend available for window embedding"
         
         if not self.parent_widget:
             return False, "No parent widget provided for embedding"
         
-        # Use the directory of the game executable as the working directory
-        game_dir = os.path.dirname(os.path.abspath(game_path))
-        
         # Launch process normally
         try:
-            process = subprocess.Popen([game_path], cwd=game_dir)
-            self.process_list.append(process)
-            self.managed_pids.add(process.pid)
+            process = self._spawn(game_path, record=record)
             
-            # Start polling for window
-            self._poll_for_window(process.pid, attempts=0, max_attempts=10)
+            # Wait for the window of exactly this PID (discovery lives on the
+            # GUI thread; launch() may run on a bridge job thread)
+            self._clientSpawned.emit(process.pid)
             
             return True, "Game launched (embedding window...)"
         except Exception as e:
             return False, f"Failed to launch: {str(e)}"
     
-    def _poll_for_window(self, pid, attempts, max_attempts):
-        """Poll for the game window to appear and emit signal when found."""
-        if attempts >= max_attempts:
-            print(f"[GameLauncher] Failed to find window after {max_attempts} attempts")
+    def _on_window_found(self, pid, hwnd):
+        """Window discovery found the window of a spawned client"""
+        print(f"[GameLauncher] Found game window HWND {hwnd} for PID {pid}")
+        self.timeline.mark_pid(pid, PHASE_WINDOW_FOUND)
+        with self._lock:
+            external = pid in self._external_pids
+            self._external_pids.discard(pid)
+        if external:
+            # The window stays where the client opened it; only the launch is complete
+            self.timeline.finish_pid(pid)
             return
-        
-        # Use new PID-based window finder (ignores debugger windows automatically)
-        hwnd = find_mu_hwnd()
-        
-        if hwnd:
-            print(f"[GameLauncher] Found game window HWND {hwnd}")
-            self.game_hwnd = hwnd
-            self.clientWindowFound.emit(hwnd)
-        else:
-            # Retry after 300ms
-            QTimer.singleShot(300, lambda: self._poll_for_window(pid, attempts + 1, max_attempts))
+        self._hwnd_pids[hwnd] = pid
+        self._window_pids[hwnd] = pid
+        self.game_hwnd = hwnd
+        self.clientWindowFound.emit(hwnd)
+    
+    def _on_window_timeout(self, pid):
+        print(f"[GameLauncher] Failed to find window for PID {pid}")
+        with self._lock:
+            self._external_pids.discard(pid)
+        self.timeline.finish_pid(pid)
+    
+    def note_embed_started(self, hwnd):
+        """Timeline: the launcher started embedding a found window"""
+        pid = self._hwnd_pids.get(hwnd)
+        if pid is not None:
+            self.timeline.mark_pid(pid, PHASE_EMBED_START)
+    
+    def note_embed_finished(self, hwnd, success):
+        """Timeline: embedding finished; completes the launch record"""
+        pid = self._hwnd_pids.pop(hwnd, None)
+        if pid is None:
+            return
+        if success:
+            self.timeline.mark_pid(pid, PHASE_EMBEDDED)
+        self.timeline.finish_pid(pid)
     
     def reparent_game_window_to_container(self, hwnd: int, container_hwnd: int, width: int, height: int) -> bool:
         """
-        Re-parent the game window into the Qt container using the new window_embed module.
+        Re-parent the game window into the Qt container through the window backend.
         
         Args:
             hwnd: Game window handle
@@ -132,8 +368,9 @@ class GameLauncher(QObject):
             bool: True if successful, False otherwise
         """
         try:
-            # Use the new PID-based embedding system
-            success = embed_window(hwnd, container_hwnd, width, height)
+            if self.window_backend is None:
+                return False
+            success = self.window_backend.embed(hwnd, container_hwnd, width, height)
             
             if success:
                 # Track embedded state for verification
@@ -178,39 +415,35 @@ class GameLauncher(QObject):
         return False
     
     def close_game(self):
-        """Close the game process"""
-        success = False
+        """
+        Close all launched game processes without blocking.
+        
+        Returns:
+            int: Termination job id (results arrive via termination signals),
+            or None if nothing was running
+        """
+        targets = []
         
         # Close embedded process if exists
         if self.process and self.process.state() == QProcess.ProcessState.Running:
-            pid = self.process.processId()
-            self.process.terminate()
-            if not self.process.waitForFinished(3000):
-                self.process.kill()
-            self.managed_pids.discard(pid)
-            success = True
+            targets.append(self.process.processId())
         
         # Close any tracked processes
-        for proc in self.process_list:
-            try:
+        with self._lock:
+            for proc in self.process_list:
                 if proc.poll() is None:  # Process is still running
-                    pid = proc.pid
-                    proc.terminate()
-                    time.sleep(0.5)
-                    if proc.poll() is None:
-                        proc.kill()
-                    self.managed_pids.discard(pid)
-                    success = True
-            except Exception as e:
-                print(f"Error closing process: {e}")
+                    targets.append(proc)
+            self.process_list = []
         
         # Clean up embedded state
         if self.game_hwnd:
             print(f"[GameLauncher] Clearing embedded HWND {self.game_hwnd}")
         self.game_hwnd = None
-        self.process_list = []
         
-        return success
+        if not targets:
+            return None
+        # managed_pids is cleaned up by the ProcessWatcher exit notifications
+        return self.termination.terminate(targets)
     
     def get_unmanaged_processes(self):
         """
@@ -220,35 +453,74 @@ class GameLauncher(QObject):
         game_name = os.path.basename(self.settings.get("game_executable", "main.exe"))
         unmanaged = []
         
-        # Clean up terminated PIDs from managed set
-        self._cleanup_terminated_pids()
-        
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                if proc.info['name'] == game_name:
-                    pid = proc.info['pid']
-                    if pid not in self.managed_pids:
-                        unmanaged.append({
-                            'pid': pid,
-                            'name': proc.info['name']
-                        })
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
+        snapshot = process_snapshots.snapshot()
+        for pid in snapshot.pids_for(game_name):
+            if pid not in self.managed_pids:
+                unmanaged.append({
+                    'pid': pid,
+                    'name': snapshot.name_of(pid)
+                })
         
         return unmanaged
     
-    def _cleanup_terminated_pids(self):
-        """Remove PIDs from managed_pids that are no longer running"""
-        to_remove = set()
-        for pid in self.managed_pids:
-            if not psutil.pid_exists(pid):
-                to_remove.add(pid)
-        self.managed_pids -= to_remove
+    def _on_process_exited(self, pid, exit_code, runtime):
+        """Drop an exited client from the managed set (driven by ProcessWatcher)"""
+        with self._lock:
+            if pid in self.managed_pids:
+                print(f"[GameLauncher] Managed PID {pid} exited with code {exit_code} after {runtime:.1f}s")
+            self.managed_pids.discard(pid)
+            self.process_list = [proc for proc in self.process_list if proc.pid != pid]
+            self._external_pids.discard(pid)
+        self._window_pids = {hwnd: owner for hwnd, owner in self._window_pids.items() if owner != pid}
+        # A client that died while loading will never show a window
+        if self.window_discovery is not None:
+            self.window_discovery.cancel(pid)
+        self.timeline.finish_pid(pid)
+        # Hand the freed cores to the remaining clients
+        self.placement.release(pid)
+    
+    def focus_client(self, pid):
+        """Tell the placement policy and embedding layout which client the player is using"""
+        self.placement.set_focused(pid)
+        for hwnd, owner in self._window_pids.items():
+            if owner == pid:
+                self.game_hwnd = hwnd
+                break
+        self.clientFocused.emit(pid)
+    
+    def pid_of_window(self, hwnd):
+        """PID of the client that owns a window found by discovery, or None"""
+        return self._window_pids.get(hwnd)
+    
+    def get_managed_pids(self):
+        """Thread-safe copy of the managed PID set"""
+        with self._lock:
+            return list(self.managed_pids)
+    
+    def scan_unmanaged_processes(self):
+        """
+        Incrementally detect game processes not launched by this launcher.
+        Only processes not seen by a previous scan are returned.
+        """
+        game_name = os.path.basename(self.settings.get("game_executable", "main.exe"))
+        with self._lock:
+            new_pids = self.process_watcher.scan(game_name)
+            return [
+                {'pid': pid, 'name': game_name}
+                for pid in new_pids
+                if pid not in self.managed_pids
+            ]
+    
+    def unmanaged_pids(self):
+        """Unmanaged game processes detected by earlier scans that are still running"""
+        return self.process_watcher.watched_pids(managed=False)
     
-    def kill_unmanaged_process(self, pid: int) -> bool:
+    def kill_unmanaged_process(self, pid: int):
         """
-        Kill an unmanaged game process by PID.
-        Returns True if successful.
+        Kill an unmanaged game process by PID without blocking.
+        
+        Returns:
+            int: Termination job id, or None if the PID is not an unmanaged game process
         """
         try:
             proc = psutil.Process(pid)
@@ -256,37 +528,30 @@ class GameLauncher(QObject):
             
             # Safety check: only kill if it's actually the game executable
             if proc.name() == game_name and pid not in self.managed_pids:
-                proc.terminate()
-                proc.wait(timeout=3)
-                print(f"[GameLauncher] Killed unmanaged process PID {pid}")
-                return True
+                print(f"[GameLauncher] Killing unmanaged process PID {pid}")
+                return self.termination.terminate([pid])
         except psutil.NoSuchProcess:
-            return True  # Already gone
-        except psutil.TimeoutExpired:
-            try:
-                proc.kill()
-                return True
-            except Exception:
-                pass
+            pass  # Already gone
         except Exception as e:
             print(f"[GameLauncher] Failed to kill PID {pid}: {e}")
         
-        return False
+        return None
     
     def _find_window_by_process_name(self, process_name):
         """Find a window handle by process name"""
         if not WIN32_AVAILABLE:
             return None
         
+        # One snapshot lookup instead of psutil.Process(pid).name() per window
+        game_pids = set(process_snapshots.snapshot().pids_for(process_name))
+        if not game_pids:
+            return None
+        
         def enum_windows_callback(hwnd, result):
             if win32gui.IsWindowVisible(hwnd):
                 _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                try:
-                    proc = psutil.Process(pid)
-                    if proc.name() == process_name:
-                        result.append(hwnd)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
+                if pid in game_pids:
+                    result.append(hwnd)
             return True
         
         windows = []
@@ -295,28 +560,22 @@ class GameLauncher(QObject):
     
     def count_running_instances(self, process_name):
         """Count how many instances of the game are running"""
-        count = 0
-        for proc in psutil.process_iter(['name']):
-            try:
-                if proc.info['name'] == process_name:
-                    count += 1
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-        return count
+        return process_snapshots.snapshot().count(process_name)
     
     def get_running_processes(self):
         """Get list of running game processes"""
         game_name = os.path.basename(self.settings.get("game_executable", "main.exe"))
+        snapshot = process_snapshots.snapshot()
         processes = []
         
-        for proc in psutil.process_iter(['pid', 'name', 'create_time']):
+        # create_time is only read for the handful of matching PIDs
+        for pid in snapshot.pids_for(game_name):
             try:
-                if proc.info['name'] == game_name:
-                    processes.append({
-                        'pid': proc.info['pid'],
-                        'name': proc.info['name'],
-                        'create_time': proc.info['create_time']
-                    })
+                processes.append({
+                    'pid': pid,
+                    'name': snapshot.name_of(pid),
+                    'create_time': psutil.Process(pid).create_time()
+                })
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 pass
         
@@ -0,0 +1,160 @@
+# job_executor.py
+#
+# Background jobs for bridge calls that would otherwise block the GUI thread.
+#
+# A job is a function run on a small, bounded thread pool. Submitting it
+# returns a job id at once; the outcome arrives later as
+# jobFinished(job_id, result_json) with result_json one of
+#   {"ok": true, "result": ...}
+#   {"ok": false, "error": "..."}
+#   {"ok": false, "cancelled": true}
+# The function receives a JobContext to report progress and to notice
+# cancellation (queued jobs are dropped outright, running jobs are asked to
+# stop and do so at their next check()).
+
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 32  # Queued + running jobs before submit() refuses more
+
+
+class JobCancelled(Exception):
+    """Raised by JobContext.check() once the job was cancelled"""
+
+
+class JobContext:
+    """Handed to a job function; thread-safe"""
+
+    def __init__(self, executor, job_id, name):
+        self._executor = executor
+        self.job_id = job_id
+        self.name = name
+        self.state = "queued"  # queued, running, finished
+        self.progress_value = 0
+        self.message = ""
+        self.submitted = time.monotonic()
+        self._cancel = threading.Event()
+
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        """Raise JobCancelled if the job was cancelled"""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def progress(self, percent, message=""):
+        self.progress_value = max(0, min(100, int(percent)))
+        self.message = message
+        self._executor.jobProgress.emit(self.job_id, self.progress_value, message)
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "name": self.name,
+            "state": self.state,
+            "progress": self.progress_value,
+            "message": self.message,
+            "cancelled": self.cancelled(),
+        }
+
+
+class JobExecutor(QObject):
+    """
+    Bounded pool running jobs off the GUI thread.
+
+    Args:
+        workers: Threads in the pool
+        max_pending: Jobs (queued + running) accepted at once
+    """
+
+    # Signals (emitted from worker threads)
+    jobProgress = pyqtSignal(int, int, str)  # job_id, percent, message
+    jobFinished = pyqtSignal(int, str)       # job_id, result JSON
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING):
+        super().__init__()
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bridge-job")
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._jobs = {}  # job_id -> (JobContext, Future)
+
+    def submit(self, name, fn, *args, **kwargs):
+        """
+        Run fn(job, *args, **kwargs) in the background.
+
+        Returns:
+            int: Job id, or None if max_pending jobs are already in flight
+        """
+        with self._lock:
+            if len(self._jobs) >= self.max_pending:
+                print(f"[Jobs] Rejected {name}: {len(self._jobs)} jobs pending")
+                return None
+            job = JobContext(self, next(self._job_ids), name)
+            future = self._executor.submit(self._run, job, fn, args, kwargs)
+            self._jobs[job.job_id] = (job, future)
+        return job.job_id
+
+    def cancel(self, job_id):
+        """
+        Cancel a job: a queued job never runs, a running one is asked to stop.
+
+        Returns:
+            bool: False if the job is unknown or already finished
+        """
+        with self._lock:
+            entry = self._jobs.get(job_id)
+        if entry is None:
+            return False
+        job, future = entry
+        job._cancel.set()
+        if future.cancel():
+            # Never started, so _run won't report it
+            self._finish(job, {"ok": False, "cancelled": True})
+        return True
+
+    def jobs(self):
+        """
+        Returns:
+            list[dict]: Queued and running jobs
+        """
+        with self._lock:
+            return [job.to_dict() for job, _ in self._jobs.values()]
+
+    def shutdown(self, wait=False):
+        with self._lock:
+            entries = list(self._jobs.values())
+        for job, _ in entries:
+            job._cancel.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancelled():
+            self._finish(job, {"ok": False, "cancelled": True})
+            return
+        job.state = "running"
+        try:
+            result = {"ok": True, "result": fn(job, *args, **kwargs)}
+        except JobCancelled:
+            result = {"ok": False, "cancelled": True}
+        except Exception as e:
+            print(f"[Jobs] {job.name} ({job.job_id}) failed: {e}")
+            result = {"ok": False, "error": str(e)}
+        self._finish(job, result)
+
+    def _finish(self, job, result):
+        with self._lock:
+            if self._jobs.pop(job.job_id, None) is None:
+                return
+        job.state = "finished"
+        try:
+            payload = json.dumps(result)
+        except (TypeError, ValueError) as e:
+            payload = json.dumps({"ok": False, "error": f"Unserializable result: {e}"})
+        self.jobFinished.emit(job.job_id, payload)
@@ -0,0 +1,147 @@
+# launch_timeline.py
+#
+# Click-to-playable-window latency instrumentation.
+#
+# Every launch gets a record of monotonic timestamps, one per phase.
+# When a launch completes, the phase durations are pushed into rolling
+# sample windows from which p50/p95 are computed on demand.
+
+import threading
+import time
+from collections import deque
+
+# Phases in the order they normally happen
+PHASE_CLICK = "click"
+PHASE_LIMIT_CHECKED = "limit_checked"
+PHASE_SPAWNED = "spawned"
+PHASE_WINDOW_FOUND = "window_found"
+PHASE_EMBED_START = "embed_start"
+PHASE_EMBEDDED = "embedded"
+
+# Derived metrics: name -> (from phase, to phase)
+METRICS = {
+    "limit_check_ms": (PHASE_CLICK, PHASE_LIMIT_CHECKED),
+    "spawn_ms": (PHASE_LIMIT_CHECKED, PHASE_SPAWNED),
+    "window_wait_ms": (PHASE_SPAWNED, PHASE_WINDOW_FOUND),
+    "embed_ms": (PHASE_EMBED_START, PHASE_EMBEDDED),
+    "time_to_window_ms": (PHASE_CLICK, PHASE_WINDOW_FOUND),
+    "time_to_embed_ms": (PHASE_CLICK, PHASE_EMBEDDED),
+}
+
+DEFAULT_WINDOW = 200  # Launches kept per metric
+
+
+class RollingPercentiles:
+    """Fixed-size window of samples with on-demand percentiles."""
+
+    def __init__(self, size=DEFAULT_WINDOW):
+        self.samples = deque(maxlen=size)
+
+    def add(self, value):
+        self.samples.append(value)
+
+    def percentile(self, p):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self):
+        if not self.samples:
+            return {"count": 0, "p50": None, "p95": None, "max": None}
+        return {
+            "count": len(self.samples),
+            "p50": round(self.percentile(50), 2),
+            "p95": round(self.percentile(95), 2),
+            "max": round(max(self.samples), 2),
+        }
+
+
+class LaunchRecord:
+    """Timestamps of one client launch."""
+
+    def __init__(self, launch_id):
+        self.launch_id = launch_id
+        self.pid = None
+        self.phases = {PHASE_CLICK: time.monotonic()}
+
+    def durations(self):
+        result = {}
+        for metric, (start, end) in METRICS.items():
+            if start in self.phases and end in self.phases:
+                result[metric] = (self.phases[end] - self.phases[start]) * 1000
+        return result
+
+
+class LaunchTimeline:
+    """
+    Tracks in-flight launches and aggregates completed ones.
+
+    Usage:
+        record = timeline.begin()
+        timeline.mark(record, PHASE_LIMIT_CHECKED)
+        timeline.attach(record, pid)            # after Popen
+        timeline.mark_pid(pid, PHASE_WINDOW_FOUND)
+        timeline.finish_pid(pid)
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._by_pid = {}
+        self._stats = {metric: RollingPercentiles(window) for metric in METRICS}
+
+    def begin(self):
+        with self._lock:
+            self._next_id += 1
+            return LaunchRecord(self._next_id)
+
+    def mark(self, record, phase):
+        if record is not None:
+            record.phases[phase] = time.monotonic()
+
+    def attach(self, record, pid):
+        """Mark the record as spawned and make it addressable by PID"""
+        self.mark(record, PHASE_SPAWNED)
+        record.pid = pid
+        with self._lock:
+            self._by_pid[pid] = record
+
+    def mark_pid(self, pid, phase):
+        with self._lock:
+            record = self._by_pid.get(pid)
+        self.mark(record, phase)
+
+    def finish(self, record):
+        """Fold a launch into the rolling stats and log it"""
+        if record is None:
+            return
+        with self._lock:
+            if record.pid is not None:
+                self._by_pid.pop(record.pid, None)
+            durations = record.durations()
+            for metric, value in durations.items():
+                self._stats[metric].add(value)
+            time_to_window = self._stats["time_to_window_ms"].summary()
+
+        parts = ", ".join(f"{metric} {value:.1f}" for metric, value in durations.items())
+        print(f"[LaunchTimeline] Launch {record.launch_id} (PID {record.pid}): {parts}")
+        if time_to_window["count"]:
+            print(
+                f"[LaunchTimeline] time_to_window p50 {time_to_window['p50']}ms "
+                f"p95 {time_to_window['p95']}ms over {time_to_window['count']} launches"
+            )
+
+    def finish_pid(self, pid):
+        with self._lock:
+            record = self._by_pid.get(pid)
+        self.finish(record)
+
+    def stats(self):
+        """
+        Returns:
+            dict: metric -> {count, p50, p95, max} in milliseconds
+        """
+        with self._lock:
+            return {metric: stats.summary() for metric, stats in self._stats.items()}
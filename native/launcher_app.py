@@ -1,4 +1,4 @@
-from PyQt6.QtWidgets import QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QApplication, QToolButton, QButtonGroup, QGraphicsColorizeEffect, QStackedLayout
+from PyQt6.QtWidgets import QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QApplication, QToolButton, QButtonGroup, QGraphicsColorizeEffect, QStackedLayout, QTabBar
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebChannel import QWebChannel
 from PyQt6.QtCore import QUrl, Qt, QEvent, QSize
@@ -11,8 +11,12 @@ from settings_manager import SettingsManager
 from game_launcher import GameLauncher
 from screenshot_service import ScreenshotService
 from event_timer_service import EventTimerService
+from session_service import SessionService
+from online_count import OnlineCountService
 from update_manager import UpdateManager
-from window_embed import verify_and_fix_embed
+from resource_sampler import ResourceSampler
+from embed_watchdog import EmbedWatchdog
+from client_layout import ClientLayout, MODE_TABS, MODES
 
 # Check Win32 availability
 try:
@@ -53,8 +57,12 @@ class LauncherApp(QMainWindow):
         self.game_hwnd = None
         self.hwnd_host = None
         
-        # Timer for verifying and fixing embed (prevents game from escaping)
-        self.embed_verify_timer = None
+        # Watchdog that keeps the embedded games from escaping
+        self.embed_watchdog = None
+        
+        # Multi-client embedding: layout of the embedded clients and their host widgets
+        self.client_layout = None
+        self.client_hosts = {}  # PID -> host QWidget
 
         # Setup central widget
         self.rootFrame = QWidget(self)
@@ -151,10 +159,30 @@ class LauncherApp(QMainWindow):
 
         # Initialize managers (pass rootFrame for embedding support)
         self.settings_manager = SettingsManager()
+        # Write pending settings before the event loop ends (atexit is the fallback)
+        QApplication.instance().aboutToQuit.connect(self.settings_manager.flush)
         self.game_launcher = GameLauncher(self.settings_manager, self.rootFrame)
         self.screenshot_service = ScreenshotService(self.settings_manager)
         self.event_timer_service = EventTimerService(self.settings_manager)
         self.update_manager = UpdateManager(self.settings_manager)
+        self.session_service = SessionService(self.settings_manager)
+        QApplication.instance().aboutToQuit.connect(self.session_service.shutdown)
+        self.online_count = OnlineCountService(self.settings_manager)
+        QApplication.instance().aboutToQuit.connect(self.online_count.shutdown)
+        self.resource_sampler = ResourceSampler(self.game_launcher, self.settings_manager)
+        
+        if self.game_launcher.window_backend is not None:
+            self.embed_watchdog = EmbedWatchdog(self.game_launcher.window_backend)
+            self.embed_watchdog.embedLost.connect(self._on_embed_lost)
+            self.embed_watchdog.embedRestored.connect(self._on_embed_restored)
+            self.client_layout = ClientLayout(
+                self.game_launcher.window_backend,
+                mode=self.settings_manager.get("embed_layout", MODE_TABS),
+                place_host=self._place_client_host
+            )
+        
+        # Prewarming never competes with an update download
+        self.game_launcher.prewarmer.is_busy = self.update_manager.is_downloading
 
         # WebEngineView goes inside web_container (content width only)
         self.webview = QWebEngineView(self.web_container)
@@ -169,6 +197,18 @@ class LauncherApp(QMainWindow):
         game_container_layout = QVBoxLayout(self.game_container)
         game_container_layout.setContentsMargins(0, 0, 0, 0)
         game_container_layout.setSpacing(0)
+        
+        # One tab per embedded client (shown once there is more than one)
+        self.client_tabs = QTabBar(self.game_container)
+        self.client_tabs.setObjectName("ClientTabs")
+        self.client_tabs.setVisible(False)
+        self.client_tabs.currentChanged.connect(self._on_client_tab_changed)
+        game_container_layout.addWidget(self.client_tabs)
+        
+        # Area the client host widgets are tiled in
+        self.client_area = QWidget(self.game_container)
+        self.client_area.installEventFilter(self)
+        game_container_layout.addWidget(self.client_area, 1)
 
         # Add to stacked layout - index 0 = webview, index 1 = game_container
         self.web_stacked_layout.addWidget(self.webview)
@@ -187,17 +227,30 @@ class LauncherApp(QMainWindow):
             game_launcher=self.game_launcher,
             screenshot_service=self.screenshot_service,
             event_timer_service=self.event_timer_service,
-            update_manager=self.update_manager
+            update_manager=self.update_manager,
+            resource_sampler=self.resource_sampler,
+            session_service=self.session_service,
+            online_count=self.online_count
         )
         self.channel.registerObject("launcherBridge", self.bridge)
         self.webview.page().setWebChannel(self.channel)
+        # Ask running bridge jobs to stop and drop queued ones on exit
+        QApplication.instance().aboutToQuit.connect(self.bridge.jobs.shutdown)
         
         # Connect game launcher signals for embedding
         self.game_launcher.clientWindowFound.connect(self.embed_client_window)
+        self.game_launcher.clientFocused.connect(self._on_client_focused)
+        self.game_launcher.process_watcher.processExited.connect(self._on_client_exited)
 
         # Start event timer service
         self.event_timer_service.start()
         
+        # Start per-client resource sampling
+        self.resource_sampler.start()
+        
+        # Warm the client's data files while the player looks at the home page
+        self.game_launcher.prewarmer.start()
+        
         # Check for updates on startup
         self._check_updates_on_startup()
 
@@ -458,7 +511,9 @@ class LauncherApp(QMainWindow):
         super().mouseReleaseEvent(event)
 
     def eventFilter(self, obj, event):
-        # Keep eventFilter for other purposes if needed
+        # Re-tile embedded clients whenever their area changes size
+        if obj is self.client_area and event.type() == QEvent.Type.Resize:
+            self._resize_game_container_to_content()
         return super().eventFilter(obj, event)
     
     def start_drag_from_bridge(self, global_x: int, global_y: int):
@@ -474,118 +529,182 @@ class LauncherApp(QMainWindow):
             print(f"[DRAG] Rejected - not in sidebar region")
     
     def embed_client_window(self, hwnd: int):
-        """Embed the game client window into the launcher using Win32 re-parenting."""
+        """Embed a game client window into its own host inside the game container."""
         try:
-            if not WIN32_AVAILABLE:
+            if not WIN32_AVAILABLE or self.client_layout is None:
                 print("[Embed] Win32 APIs not available")
+                self.game_launcher.note_embed_finished(hwnd, False)
                 self._restore_webview()
                 return
             
-            print(f"[Embed] Preparing to embed game window HWND: {hwnd}")
+            pid = self.game_launcher.pid_of_window(hwnd)
+            if pid is None:
+                print(f"[Embed] HWND {hwnd} does not belong to a managed client")
+                self.game_launcher.note_embed_finished(hwnd, False)
+                self._restore_webview()
+                return
             
-            # CRITICAL: Ensure game_container has a native window created
-            # Qt won't create the native window until the widget is shown or winId() is called
-            print("[Embed] Ensuring game_container is realized...")
-            self.game_container.setAttribute(Qt.WidgetAttribute.WA_NativeWindow, True)
-            self.game_container.show()  # Make sure native window is created
+            print(f"[Embed] Preparing to embed game window HWND: {hwnd} (PID {pid})")
+            self.game_launcher.note_embed_started(hwnd)
             
-            # Get container info
-            container_hwnd = self.get_game_container_hwnd()
-            width = self.game_container.width()
-            height = self.game_container.height()
+            # CRITICAL: Ensure the host has a native window created
+            # Qt won't create the native window until the widget is shown or winId() is called
+            self.web_stacked_layout.setCurrentIndex(1)
+            host = QWidget(self.client_area)
+            host.setAttribute(Qt.WidgetAttribute.WA_NativeWindow, True)
+            host.setGeometry(0, 0, self.client_area.width(), self.client_area.height())
+            host.show()
             
-            print(f"[Embed] Container HWND: {container_hwnd}")
-            print(f"[Embed] Container size: {width}x{height}")
-            print(f"[Embed] Container visible: {self.game_container.isVisible()}")
+            host_hwnd = int(host.winId())
+            width = host.width()
+            height = host.height()
+            print(f"[Embed] Host HWND: {host_hwnd}, size: {width}x{height}")
             
-            # Validate container HWND
-            if container_hwnd == 0:
-                print("[Embed] ERROR: Container HWND is 0 (invalid)")
+            # Validate host HWND
+            if host_hwnd == 0:
+                print("[Embed] ERROR: Host HWND is 0 (invalid)")
+                host.deleteLater()
+                self.game_launcher.note_embed_finished(hwnd, False)
                 self._restore_webview()
                 return
             
-            # Use GameLauncher's Win32 re-parenting method
+            # Use GameLauncher's re-parenting method
             success = self.game_launcher.reparent_game_window_to_container(
-                hwnd, container_hwnd, width, height
+                hwnd, host_hwnd, width, height
             )
             
+            self.game_launcher.note_embed_finished(hwnd, success)
+            
             if success:
-                # Switch stacked layout to game container
-                self.web_stacked_layout.setCurrentIndex(1)
+                self.client_hosts[pid] = host
+                self.client_tabs.blockSignals(True)
+                index = self.client_tabs.addTab(f"Client {pid}")
+                self.client_tabs.setTabData(index, pid)
+                self.client_tabs.blockSignals(False)
+                self.client_tabs.setVisible(self.client_tabs.count() > 1)
                 
-                # Store the hwnd for later use (LauncherApp also tracks it)
-                self.game_hwnd = hwnd
-                self.hwnd_host = container_hwnd
+                # Keep the game embedded
+                self.embed_watchdog.watch(hwnd, host_hwnd, width, height)
                 
-                # Start timer to verify and maintain embedding
-                self._start_embed_verification_timer()
+                # The newest client gets the focus; the layout parks the others
+                self.client_layout.add(pid, hwnd, host_hwnd)
+                self.game_launcher.focus_client(pid)
                 
-                print(f"[Embed] Successfully embedded game window (HWND: {hwnd})")
-                print(f"[Embed] Stacked layout now showing index: {self.web_stacked_layout.currentIndex()}")
+                print(f"[Embed] Successfully embedded game window (HWND: {hwnd}), "
+                      f"{len(self.client_hosts)} client(s) embedded")
             else:
                 # Fall back to external window mode
                 print("[Embed] Failed to embed client, falling back to external window mode")
+                host.deleteLater()
                 self._restore_webview()
             
         except Exception as e:
             print(f"[Embed] Error embedding window: {e}")
             import traceback
             traceback.print_exc()
+            self.game_launcher.note_embed_finished(hwnd, False)
             self._restore_webview()
 
     def _restore_webview(self):
-        """Fix #8: Restore webview visibility on embed failure."""
+        """Fix #8: Restore webview visibility when no client is embedded."""
+        if self.client_hosts:
+            return  # Other clients are still embedded
         self.web_stacked_layout.setCurrentIndex(0)
-        self._stop_embed_verification_timer()
-        print("[Embed] Restored webview after embed failure")
+        self.game_hwnd = None
+        self.hwnd_host = None
+        print("[Embed] Restored webview")
     
     def _resize_game_container_to_content(self):
-        """Resize embedded game window to match content area size."""
-        if not self.game_hwnd or not WIN32_AVAILABLE:
+        """Re-tile the embedded clients to the size of the client area."""
+        if self.client_layout is None:
             return
-        
-        try:
-            import win32gui
-            
-            width = self.game_container.width()
-            height = self.game_container.height()
-            
-            # Resize the embedded window using stored hwnd
-            win32gui.MoveWindow(self.game_hwnd, 0, 0, width, height, True)
-            print(f"[Embed] Resized embedded window to {width}x{height}")
-        except Exception as e:
-            print(f"[Embed] Error resizing embedded window: {e}")
+        self.client_layout.resize(self.client_area.width(), self.client_area.height())
     
-    def _start_embed_verification_timer(self):
-        """Start periodic verification of window embedding to prevent game from escaping."""
-        from PyQt6.QtCore import QTimer
-        
-        if self.embed_verify_timer:
-            self.embed_verify_timer.stop()
-        
-        self.embed_verify_timer = QTimer(self)
-        self.embed_verify_timer.setInterval(1000)  # Check every 1 second
-        self.embed_verify_timer.timeout.connect(self._verify_embed)
-        self.embed_verify_timer.start()
-        print("[Embed] Started verification timer (checking every 1s)")
+    def _place_client_host(self, tile):
+        """ClientLayout callback: position and show/hide one client's host widget."""
+        host = self.client_hosts.get(tile.pid)
+        if host is None:
+            return
+        host.setGeometry(tile.x, tile.y, tile.width, tile.height)
+        host.setVisible(tile.visible)
+        if self.embed_watchdog:
+            self.embed_watchdog.resize(tile.hwnd, tile.width, tile.height)
     
-    def _stop_embed_verification_timer(self):
-        """Stop the embed verification timer."""
-        if self.embed_verify_timer:
-            self.embed_verify_timer.stop()
-            self.embed_verify_timer = None
-            print("[Embed] Stopped verification timer")
+    def set_embed_layout(self, mode: str) -> bool:
+        """Switch the embedded clients between 'tabs' and 'grid' and remember it."""
+        if self.client_layout is None or mode not in MODES:
+            return False
+        self.client_layout.set_mode(mode)
+        self.settings_manager.set("embed_layout", mode)
+        return True
     
-    def _verify_embed(self):
-        """Verify and re-apply embedding if needed (called by timer)."""
-        if not self.game_hwnd or not self.hwnd_host:
+    def _on_client_focused(self, pid: int):
+        """A client was focused (tab click, new embed or bridge call)."""
+        if self.client_layout is None or pid not in self.client_hosts:
             return
+        self.client_layout.focus(pid)
+        hwnd, host_hwnd = self._client_handles(pid)
+        self.game_hwnd = hwnd
+        self.hwnd_host = host_hwnd
+        for index in range(self.client_tabs.count()):
+            if self.client_tabs.tabData(index) == pid:
+                self.client_tabs.blockSignals(True)
+                self.client_tabs.setCurrentIndex(index)
+                self.client_tabs.blockSignals(False)
+                break
+    
+    def _on_client_tab_changed(self, index: int):
+        pid = self.client_tabs.tabData(index)
+        if pid is not None:
+            self.game_launcher.focus_client(pid)
+    
+    def _client_handles(self, pid):
+        for tile in self.client_layout.plan():
+            if tile.pid == pid:
+                return tile.hwnd, tile.host
+        return None, None
+    
+    def _on_embed_restored(self, hwnd: int):
+        """The watchdog moved a client back to (0, 0); re-apply its tile."""
+        pid = self.client_layout.pid_of(hwnd)
+        if pid is not None:
+            self.client_layout.invalidate(pid)
+            self.client_layout.apply()
+    
+    def _on_embed_lost(self, hwnd: int):
+        """An embedded game window (or its host) was destroyed."""
+        pid = self.client_layout.pid_of(hwnd)
+        if pid is not None:
+            print(f"[Embed] Embedded window {hwnd} is gone")
+            self._remove_client(pid)
+    
+    def _on_client_exited(self, pid: int, exit_code: int, runtime: float):
+        if pid in self.client_hosts:
+            self._remove_client(pid)
+    
+    def _remove_client(self, pid: int):
+        """Drop an embedded client: its watchdog entry, tab, host and tile."""
+        hwnd, _ = self._client_handles(pid)
+        if hwnd is not None and self.embed_watchdog:
+            self.embed_watchdog.unwatch(hwnd)
+        self.client_layout.remove(pid)
         
-        width = self.game_container.width()
-        height = self.game_container.height()
+        host = self.client_hosts.pop(pid, None)
+        if host is not None:
+            host.hide()
+            host.deleteLater()
+        for index in range(self.client_tabs.count()):
+            if self.client_tabs.tabData(index) == pid:
+                self.client_tabs.blockSignals(True)
+                self.client_tabs.removeTab(index)
+                self.client_tabs.blockSignals(False)
+                break
+        self.client_tabs.setVisible(self.client_tabs.count() > 1)
         
-        # Use window_embed module's verify function
-        verify_and_fix_embed(self.game_hwnd, self.hwnd_host, width, height)
+        if self.client_layout.focused_pid is not None:
+            self.game_launcher.focus_client(self.client_layout.focused_pid)
+        else:
+            self._restore_webview()
     
     def _check_updates_on_startup(self):
         """Check for updates when launcher starts"""
@@ -3,7 +3,33 @@ from PyQt6.QtGui import QCursor
 import json
 import os
 
+from screenshot_gallery import thumbnail_data_url
+from state_store import StateStore
+from job_executor import JobExecutor
+from bridge_diagnostics import BridgeDiagnostics, instrument_slots
+from screenshot_encoder import available_presets, DEFAULT_PRESET
+from session_service import logged_out
 
+# Read-only slots that batch() may run, mapped to whether the slot returns a
+# JSON string (decoded so the batch payload nests it instead of re-encoding it)
+BATCHABLE = {
+    "getSettings": True,
+    "getSession": True,
+    "getOnlineCount": False,
+    "getLaunchStats": True,
+    "getResourceHistory": True,
+    "getScreenshotPresets": True,
+    "getScreenshotPage": True,
+    "getReplayStats": True,
+    "getEvents": True,
+    "getStateSince": True,
+}
+
+# Fields of an eventUpdated entry that stay the same from tick to tick
+SCHEDULE_KEYS = ("name", "server", "category", "time", "start")
+
+
+@instrument_slots
 class LauncherBridge(QObject):
     # Signals for React to subscribe to
     updateAvailable = pyqtSignal(str)       # new_version string
@@ -14,22 +40,56 @@ class LauncherBridge(QObject):
     eventUpdated = pyqtSignal(str)           # Forward from EventTimerService (JSON string)
     eventNotification = pyqtSignal(str, int) # Forward from EventTimerService
     unmanagedProcessDetected = pyqtSignal(str)  # JSON with unmanaged process info
+    processStarted = pyqtSignal(str)         # JSON {pid, name, managed}
+    processExited = pyqtSignal(str)          # JSON {pid, exit_code, runtime}
+    processTerminated = pyqtSignal(str)      # JSON {termination_id, pid, outcome}
+    terminationFinished = pyqtSignal(str)    # JSON {termination_id, results: [{pid, outcome}]}
+    clientsLaunched = pyqtSignal(str)        # JSON {batch_id, results: [{index, success, pid, spawn_ms}]}
+    screenshotSaved = pyqtSignal(str)        # JSON {screenshot_id, path}
+    screenshotFailed = pyqtSignal(str)       # JSON {screenshot_id, error}
+    replaySaved = pyqtSignal(str)            # JSON {replay_id, path}
+    replayFailed = pyqtSignal(str)           # JSON {replay_id, error}
+    thumbnailReady = pyqtSignal(str)         # JSON {filename, thumbnail (data URL)}
+    stateChanged = pyqtSignal(str)           # JSON {from, version, ops} (see state_store.py)
+    jobProgress = pyqtSignal(str)            # JSON {job_id, progress, message}
+    jobFinished = pyqtSignal(int, str)       # job_id, JSON {ok, result | error | cancelled}
+    sessionChanged = pyqtSignal(str)         # JSON {logged, username, is_admin}
+    onlineCountChanged = pyqtSignal(int)     # Only sent when the count changes
 
     def __init__(self, window=None, settings_manager=None, game_launcher=None, 
-                 screenshot_service=None, event_timer_service=None, update_manager=None):
+                 screenshot_service=None, event_timer_service=None, update_manager=None,
+                 resource_sampler=None, session_service=None, online_count=None):
         super().__init__()
+        # Slot/signal statistics (see bridge_diagnostics.py); off unless enabled
+        settings = settings_manager.snapshot if settings_manager else None
+        self.diagnostics = BridgeDiagnostics(
+            enabled=bool(settings and settings.get("bridge_diagnostics", False)),
+            log_interval_s=float(settings.get("bridge_diagnostics_log_s", 0)) if settings else 0
+        )
+        
         self.window = window
         self.settings_manager = settings_manager
         self.game_launcher = game_launcher
         self.screenshot_service = screenshot_service
         self.event_timer_service = event_timer_service
         self.update_manager = update_manager
+        self.resource_sampler = resource_sampler
+        self.session_service = session_service
+        self.online_count = online_count
         
         # Connect event timer signals if available
         if self.event_timer_service:
             self.event_timer_service.eventUpdated.connect(self.eventUpdated.emit)
             self.event_timer_service.eventNotification.connect(self.eventNotification.emit)
         
+        # Session changes (login, refresh, logout, session.json edited)
+        if self.session_service:
+            self.session_service.sessionChanged.connect(self.sessionChanged.emit)
+        
+        # Online count pushes (the first get() starts fetching it)
+        if self.online_count:
+            self.online_count.onlineCountChanged.connect(self.onlineCountChanged.emit)
+
         # Connect update manager signals if available
         if self.update_manager:
             self.update_manager.updateAvailable.connect(self.updateAvailable.emit)
@@ -37,29 +97,99 @@ class LauncherBridge(QObject):
             self.update_manager.updateError.connect(self.updateError.emit)
             self.update_manager.updateFinished.connect(self.updateFinished.emit)
         
-        # Setup background process scanner for unmanaged clients
+        # Forward process lifecycle notifications
+        if self.game_launcher:
+            watcher = self.game_launcher.process_watcher
+            watcher.processStarted.connect(self._on_process_started)
+            watcher.processExited.connect(self._on_process_exited)
+            self.game_launcher.clientsLaunched.connect(self.clientsLaunched.emit)
+            termination = self.game_launcher.termination
+            termination.processTerminated.connect(self._on_process_terminated)
+            termination.jobFinished.connect(self._on_termination_finished)
+        
+        # Forward background screenshot encoding results
+        if self.screenshot_service:
+            self.screenshot_service.screenshotSaved.connect(self._on_screenshot_saved)
+            self.screenshot_service.screenshotFailed.connect(self._on_screenshot_failed)
+            self.screenshot_service.replaySaved.connect(self._on_replay_saved)
+            self.screenshot_service.replayFailed.connect(self._on_replay_failed)
+            self.screenshot_service.thumbnailReady.connect(self._on_thumbnail_ready)
+        
+        # Setup background discovery of unmanaged clients. Exits are event-driven
+        # (ProcessWatcher); this only picks up new PIDs from the shared snapshot.
+        self._pending_kills = {}  # pid -> termination_id of a kill in progress
         self._scan_timer = QTimer(self)
         self._scan_timer.timeout.connect(self._check_unmanaged_processes)
         # Start scanning every 10 seconds
         self._scan_timer.start(10000)
         
+        # Slow slots run as background jobs (see job_executor.py)
+        self.jobs = JobExecutor()
+        self.jobs.jobProgress.connect(self._on_job_progress)
+        self.jobs.jobFinished.connect(self._on_job_finished)
+        self._job_callbacks = {}  # job_id -> callable(result dict), run on the GUI thread
+        
+        # Versioned state pushed to the UI as deltas
+        self.state = StateStore()
+        self.state.stateChanged.connect(self.stateChanged.emit)
+        self._init_state()
+        
+        self.diagnostics.observe_signals(self)
+        
         print("LauncherBridge initialized")
 
+    # ==================== Batching ====================
+
+    @pyqtSlot(str, result=str)
+    def batch(self, requests_json):
+        """
+        Run several read-only bridge calls in one WebChannel round-trip.
+        
+        Args:
+            requests_json: JSON [{id, method, args}], method from BATCHABLE
+            
+        Returns:
+            str: JSON [{id, ok: true, result} or {id, ok: false, error}], in request order
+        """
+        try:
+            requests = json.loads(requests_json)
+            if not isinstance(requests, list):
+                raise ValueError("expected a list of requests")
+        except ValueError as e:
+            print(f"[Bridge] Invalid batch: {e}")
+            return json.dumps([])
+        
+        results = []
+        for request in requests:
+            request_id = request.get("id") if isinstance(request, dict) else None
+            try:
+                method = request["method"]
+                if method not in BATCHABLE:
+                    raise ValueError(f"{method} cannot be batched")
+                result = getattr(self, method)(*request.get("args", []))
+                if BATCHABLE[method] and isinstance(result, str):
+                    result = json.loads(result)
+                results.append({"id": request_id, "ok": True, "result": result})
+            except Exception as e:
+                print(f"[Bridge] Batch item {request_id} failed: {e}")
+                results.append({"id": request_id, "ok": False, "error": str(e)})
+        return json.dumps(results)
+
     # ==================== Settings ====================
     
     @pyqtSlot(result=str)
     def getSettings(self):
         """Get all settings as JSON string"""
-        print("[Bridge] getSettings called")
+        self.diagnostics.trace("[Bridge] getSettings called")
         if self.settings_manager:
-            settings = self.settings_manager.load_settings()
-            return json.dumps(settings)
+            # Served from memory; the manager re-reads config.json when it changes
+            return json.dumps(self.settings_manager.snapshot.to_dict())
         return "{}"
 
     @pyqtSlot(str, result=bool)
     def saveSettings(self, settings_json):
         """Save settings from JSON string"""
-        print(f"[Bridge] saveSettings called: {settings_json}")
+        self.diagnostics.trace(f"[Bridge] saveSettings called ({len(settings_json)} bytes)")
         if self.settings_manager:
             try:
                 settings = json.loads(settings_json)
@@ -75,34 +205,81 @@ class LauncherBridge(QObject):
         Set launcher resolution and window mode.
         This resizes the Qt window and saves to config.
         """
-        print(f"[Bridge] setResolution called: {width}x{height}, windowed={windowed}")
+        self.diagnostics.trace(f"[Bridge] setResolution called: {width}x{height}, windowed={windowed}")
         
         # Resize window
         if self.window and hasattr(self.window, 'set_resolution'):
             self.window.set_resolution(width, height)
         
-        # Save to config
+        # Save to config (one write for both keys)
         if self.settings_manager:
-            self.settings_manager.set('resolution', f"{width}x{height}")
-            self.settings_manager.set('window_mode', windowed)
-            self.settings_manager.save(self.settings_manager.settings)
+            with self.settings_manager.transaction():
+                self.settings_manager.set('resolution', f"{width}x{height}")
+                self.settings_manager.set('window_mode', windowed)
 
     # ==================== Game Launch ====================
 
     @pyqtSlot(result=str)
     def launchGame(self):
-        """Launch the game using GameLauncher"""
-        print("[Bridge] launchGame called")
+        """
+        Launch the game on a job thread (spawning and the process checks block).
+        Returns JSON {job_id}; jobFinished delivers {success, message}.
+        """
+        self.diagnostics.trace("[Bridge] launchGame called")
+        if not self.game_launcher:
+            return json.dumps({"job_id": None, "message": "Game launcher not initialized"})
+        job_id = self._submit_job("launchGame", self._launch_job, on_done=self._on_launch_done)
+        return json.dumps({"job_id": job_id})
+
+    def _launch_job(self, job):
+        job.progress(10, "Launching")
+        success, message = self.game_launcher.launch()
+        return {"success": success, "message": message}
+
+    def _on_launch_done(self, result):
+        outcome = result.get("result") or {}
+        self.gameLaunched.emit(bool(outcome.get("success")))
+
+    @pyqtSlot(int, str, result=str)
+    def launchClients(self, count, profiles_json):
+        """
+        Launch several clients in the background with a stagger between them.
+        Returns immediately; per-client results arrive via clientsLaunched.
+        """
+        self.diagnostics.trace(f"[Bridge] launchClients called: {count}")
+        if not self.game_launcher:
+            return json.dumps({"batch_id": None, "accepted": 0, "message": "Game launcher not initialized"})
+        
+        profiles = []
+        if profiles_json:
+            try:
+                profiles = json.loads(profiles_json)
+            except json.JSONDecodeError as e:
+                print(f"[Bridge] Invalid profiles JSON: {e}")
+                return json.dumps({"batch_id": None, "accepted": 0, "message": "Invalid profiles JSON"})
+        
+        result = self.game_launcher.launch_clients(count, profiles)
+        self.gameLaunched.emit(result["accepted"] > 0)
+        return json.dumps(result)
+
+    @pyqtSlot(result=bool)
+    def prewarmGame(self):
+        """Start reading the client's hot files into the OS cache (e.g. on Start Game hover)"""
+        if self.game_launcher:
+            return self.game_launcher.prewarmer.start()
+        return False
+
+    @pyqtSlot(result=str)
+    def getLaunchStats(self):
+        """Get rolling p50/p95 launch phase latencies (ms) as JSON"""
         if self.game_launcher:
-            success, message = self.game_launcher.launch()
-            self.gameLaunched.emit(success)
-            return json.dumps({"success": success, "message": message})
-        return json.dumps({"success": False, "message": "Game launcher not initialized"})
+            return json.dumps(self.game_launcher.timeline.stats())
+        return "{}"
 
     @pyqtSlot(str, result=str)
     def startGame(self, config_json):
         """Start game with optional config override (legacy method)"""
-        print(f"[Bridge] startGame called with config: {config_json}")
+        self.diagnostics.trace(f"[Bridge] startGame called with config: {config_json}")
         # Just delegate to launchGame for now
         return self.launchGame()
 
@@ -110,42 +287,145 @@ class LauncherBridge(QObject):
 
     @pyqtSlot(result=str)
     def getSession(self):
-        """Get current session from session.json"""
-        try:
-            session_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "session.json")
-            if os.path.exists(session_path):
-                with open(session_path, 'r') as f:
-                    session_data = json.load(f)
-                    return json.dumps(session_data)
-        except Exception as e:
-            print(f"[Bridge] Error loading session: {e}")
-        
-        # Default session if file doesn't exist or error
-        return json.dumps({
-            "logged": False,
-            "username": "",
-            "is_admin": False
-        })
+        """Get the current session (cached by SessionService, no disk read)"""
+        return json.dumps(self._session())
+
+    def _session(self):
+        """Session dict without tokens, or a logged-out default"""
+        if self.session_service:
+            return self.session_service.session()
+        return logged_out()
+
+    @pyqtSlot(str, str, result=str)
+    def login(self, username, password):
+        """
+        Log in against the API on a job thread.
+        Returns JSON {job_id}; jobFinished delivers {success, session} or {success: false, message}.
+        """
+        if not self.session_service:
+            return json.dumps({"job_id": None, "message": "Session service not initialized"})
+        job_id = self._submit_job("login", lambda job: self.session_service.login(username, password))
+        return json.dumps({"job_id": job_id})
+
+    @pyqtSlot()
+    def logout(self):
+        if self.session_service:
+            self.session_service.logout()
 
     # ==================== Online Count ====================
 
     @pyqtSlot(result=int)
     def getOnlineCount(self):
-        """Get online player count (stub - will be implemented with server API)"""
-        # TODO: Implement actual server query when API is ready
-        return 1
+        """
+        Get the online player count without blocking (cached, see online_count.py).
+        A stale count is returned while a fresh one is fetched; onlineCountChanged
+        delivers it if it differs. 0 until the first fetch completed.
+        """
+        if not self.online_count:
+            return 0
+        count = self.online_count.get()
+        return count if count is not None else 0
 
     # ==================== Screenshot ====================
 
     @pyqtSlot(result=str)
     def requestScreenshot(self):
-        """Capture screenshot of the game window"""
+        """
+        Capture the game window; the PNG is written in the background.
+        Returns JSON {screenshot_id}; null if the capture failed.
+        The file path arrives with screenshotSaved.
+        """
+        screenshot_id = None
+        if self.screenshot_service:
+            screenshot_id = self.screenshot_service.capture_active_window()
+        return json.dumps({"screenshot_id": screenshot_id})
+
+    def _on_screenshot_saved(self, screenshot_id, path):
+        self.screenshotSaved.emit(json.dumps({"screenshot_id": screenshot_id, "path": path}))
+
+    def _on_screenshot_failed(self, screenshot_id, error):
+        self.screenshotFailed.emit(json.dumps({"screenshot_id": screenshot_id, "error": error}))
+
+    @pyqtSlot(result=str)
+    def getScreenshotPresets(self):
+        """Encoder presets usable for `screenshot_preset`, as JSON {presets, default}"""
+        return json.dumps({"presets": available_presets(), "default": DEFAULT_PRESET})
+
+    @pyqtSlot(int, int, result=str)
+    def getScreenshotPage(self, offset, limit):
+        """
+        One page of the screenshot gallery, newest first, as JSON
+        {total, offset, items: [{filename, timestamp, size, thumbnail}]}.
+        thumbnail is a data URL, or null until thumbnailReady delivers it;
+        full-size images are never sent to the web UI.
+        """
+        if not self.screenshot_service:
+            return json.dumps({"total": 0, "offset": offset, "items": []})
+        page = self.screenshot_service.get_screenshot_page(offset, limit)
+        for item in page["items"]:
+            del item["path"]
+            if item["thumbnail"]:
+                try:
+                    item["thumbnail"] = thumbnail_data_url(item["thumbnail"])
+                except OSError:
+                    item["thumbnail"] = None
+        return json.dumps(page)
+
+    @pyqtSlot(str, result=bool)
+    def deleteScreenshot(self, filename):
+        """Delete a screenshot from the gallery by file name"""
+        self.diagnostics.trace(f"[Bridge] deleteScreenshot called: {filename}")
+        if not self.screenshot_service:
+            return False
+        path = os.path.join(self.screenshot_service.screenshots_dir, os.path.basename(filename))
+        return self.screenshot_service.delete_screenshot(path)
+
+    def _on_thumbnail_ready(self, filename, path):
+        try:
+            thumbnail = thumbnail_data_url(path)
+        except OSError:
+            return
+        self.thumbnailReady.emit(json.dumps({"filename": filename, "thumbnail": thumbnail}))
+
+    @pyqtSlot(result=bool)
+    def startReplayRecording(self):
+        """Start continuous low-rate capture of the game window"""
+        self.diagnostics.trace("[Bridge] startReplayRecording called")
+        if self.screenshot_service:
+            return self.screenshot_service.start_recording()
+        return False
+
+    @pyqtSlot()
+    def stopReplayRecording(self):
+        """Stop continuous capture and free its buffer"""
+        self.diagnostics.trace("[Bridge] stopReplayRecording called")
+        if self.screenshot_service:
+            self.screenshot_service.stop_recording()
+
+    @pyqtSlot(int, result=str)
+    def saveReplay(self, seconds):
+        """
+        Export the last `seconds` of the replay buffer (0 = all of it) in the background.
+        Returns JSON {replay_id}; null if nothing is buffered.
+        """
+        self.diagnostics.trace(f"[Bridge] saveReplay called: {seconds}s")
+        replay_id = None
         if self.screenshot_service:
-            filepath = self.screenshot_service.capture_active_window()
-            if filepath:
-                return filepath
-            return ""
-        return ""
+            replay_id = self.screenshot_service.save_replay(seconds or None)
+        return json.dumps({"replay_id": replay_id})
+
+    @pyqtSlot(result=str)
+    def getReplayStats(self):
+        """Replay recorder state, buffer fill and CPU overhead as JSON"""
+        if self.screenshot_service:
+            return json.dumps(self.screenshot_service.replay_stats())
+        return "{}"
+
+    def _on_replay_saved(self, replay_id, path):
+        self.replaySaved.emit(json.dumps({"replay_id": replay_id, "path": path}))
+
+    def _on_replay_failed(self, replay_id, error):
+        self.replayFailed.emit(json.dumps({"replay_id": replay_id, "error": error}))
 
     # ==================== Events ====================
 
@@ -164,7 +444,7 @@ class LauncherBridge(QObject):
     @pyqtSlot()
     def checkForUpdates(self):
         """Check for launcher/client updates"""
-        print("[Bridge] checkForUpdates called")
+        self.diagnostics.trace("[Bridge] checkForUpdates called")
         if self.update_manager:
             current_version = None
             if self.settings_manager:
@@ -176,7 +456,7 @@ class LauncherBridge(QObject):
     @pyqtSlot()
     def startUpdate(self):
         """Start downloading and applying the available update"""
-        print("[Bridge] startUpdate called")
+        self.diagnostics.trace("[Bridge] startUpdate called")
         if self.update_manager:
             self.update_manager.download_and_apply_update()
         else:
@@ -185,10 +465,161 @@ class LauncherBridge(QObject):
     @pyqtSlot()
     def cancelUpdate(self):
         """Cancel an in-progress update"""
-        print("[Bridge] cancelUpdate called")
+        self.diagnostics.trace("[Bridge] cancelUpdate called")
         if self.update_manager:
             self.update_manager.cancel_update()
 
+    # ==================== Diagnostics ====================
+
+    @pyqtSlot(result=str)
+    def getDiagnostics(self):
+        """
+        Per-slot call counts, latency histograms and payload sizes, and
+        per-signal emission counts and bytes, since diagnostics were enabled.
+        
+        Returns:
+            str: JSON {enabled, seconds, slots: {...}, signals: {...}}
+        """
+        return json.dumps(self.diagnostics.snapshot())
+
+    @pyqtSlot(bool)
+    def setDiagnosticsEnabled(self, enabled):
+        """Turn bridge instrumentation on (statistics restart) or off"""
+        self.diagnostics.set_enabled(enabled)
+
+    # ==================== Jobs ====================
+
+    @pyqtSlot(int, result=bool)
+    def cancelJob(self, job_id):
+        """Cancel a background job; its jobFinished reports {cancelled: true}"""
+        return self.jobs.cancel(job_id)
+
+    @pyqtSlot(result=str)
+    def getJobs(self):
+        """JSON list of queued and running jobs"""
+        return json.dumps(self.jobs.jobs())
+
+    def _submit_job(self, name, fn, on_done=None):
+        """
+        Run fn(job) on the job pool; `on_done(result)` runs on the GUI thread
+        before jobFinished is forwarded.
+        
+        Returns:
+            int: Job id, or None if the pool is saturated
+        """
+        job_id = self.jobs.submit(name, fn)
+        if job_id is not None and on_done is not None:
+            self._job_callbacks[job_id] = on_done
+        return job_id
+
+    @pyqtSlot(int, int, str)
+    def _on_job_progress(self, job_id, progress, message):
+        self.jobProgress.emit(json.dumps({"job_id": job_id, "progress": progress, "message": message}))
+
+    @pyqtSlot(int, str)
+    def _on_job_finished(self, job_id, result_json):
+        on_done = self._job_callbacks.pop(job_id, None)
+        if on_done is not None:
+            try:
+                on_done(json.loads(result_json))
+            except Exception as e:
+                print(f"[Bridge] Job {job_id} completion handler failed: {e}")
+        self.jobFinished.emit(job_id, result_json)
+
+    # ==================== State Store ====================
+
+    @pyqtSlot(int, result=str)
+    def getStateSince(self, version):
+        """
+        Resync with the state store.
+        
+        Args:
+            version: Last version the UI applied (0 for a full snapshot)
+            
+        Returns:
+            str: JSON {version, ops} with the missed deltas, or {version, state}
+        """
+        return json.dumps(self.state.since(version))
+
+    def _init_state(self):
+        """Seed the store and keep it current from the services' signals"""
+        self.state.set("session", self._session())
+        self.state.set("clients", {})
+        self.state.set("update", {"status": "idle", "version": None, "progress": 0, "error": None})
+        self.state.set("events", [])
+        self.state.set("online", self.getOnlineCount())
+        if self.session_service:
+            self.session_service.sessionChanged.connect(self._state_session)
+        if self.online_count:
+            self.online_count.onlineCountChanged.connect(self._state_online)
+        if self.settings_manager:
+            self._sync_settings()
+            self.settings_manager.settingsChanged.connect(self._sync_settings)
+        if self.game_launcher:
+            watcher = self.game_launcher.process_watcher
+            watcher.processStarted.connect(self._state_client_started)
+            watcher.processExited.connect(self._state_client_exited)
+        if self.update_manager:
+            self.update_manager.updateAvailable.connect(self._state_update_available)
+            self.update_manager.downloadProgress.connect(self._state_update_progress)
+            self.update_manager.updateError.connect(self._state_update_error)
+            self.update_manager.updateFinished.connect(self._state_update_finished)
+        if self.event_timer_service:
+            self.event_timer_service.eventUpdated.connect(self._state_events)
+
+    @pyqtSlot()
+    def _sync_settings(self):
+        self.state.set("settings", self.settings_manager.snapshot.to_dict())
+
+    @pyqtSlot(str)
+    def _state_session(self, session_json):
+        self.state.set("session", json.loads(session_json))
+
+    @pyqtSlot(int)
+    def _state_online(self, count):
+        self.state.set("online", count)
+
+    @pyqtSlot(int, str, bool)
+    def _state_client_started(self, pid, name, managed):
+        self.state.update("clients", str(pid), {"name": name, "managed": managed})
+
+    @pyqtSlot(int, int, float)
+    def _state_client_exited(self, pid, exit_code, runtime):
+        self.state.remove("clients", str(pid))
+
+    @pyqtSlot(str)
+    def _state_update_available(self, version):
+        self.state.set("update", {"status": "available", "version": version, "progress": 0, "error": None})
+
+    @pyqtSlot(int)
+    def _state_update_progress(self, progress):
+        update = dict(self.state.get("update"))
+        update.update(status="downloading", progress=progress)
+        self.state.set("update", update)
+
+    @pyqtSlot(str)
+    def _state_update_error(self, error):
+        update = dict(self.state.get("update"))
+        update.update(status="error", error=error)
+        self.state.set("update", update)
+
+    @pyqtSlot()
+    def _state_update_finished(self):
+        update = dict(self.state.get("update"))
+        update.update(status="finished", progress=100, error=None)
+        self.state.set("update", update)
+
+    @pyqtSlot(str)
+    def _state_events(self, events_json):
+        # Only the schedule goes into the store; the countdown fields change
+        # every tick (the UI computes them from `start`, or uses eventUpdated)
+        try:
+            events = json.loads(events_json)
+        except ValueError as e:
+            print(f"[Bridge] Ignoring invalid event update: {e}")
+            return
+        self.state.set("events", [{key: event.get(key) for key in SCHEDULE_KEYS} for event in events])
+
     # ==================== Window Drag ====================
 
     @pyqtSlot(int, int)
@@ -198,7 +629,7 @@ class LauncherBridge(QObject):
         Note: Qt sidebar already handles native dragging via mouse events.
         This method is kept for compatibility but dragging is handled natively.
         """
-        print(f"[Bridge] startDrag called at ({x}, {y})")
+        self.diagnostics.trace(f"[Bridge] startDrag called at ({x}, {y})")
         # The Qt window already handles dragging via mousePressEvent on the sidebar.
         # This method exists for compatibility with React code that might call it,
         # but actual dragging is handled by the Qt event handlers.
@@ -209,21 +640,57 @@ class LauncherBridge(QObject):
 
     @pyqtSlot(result=str)
     def getUnmanagedProcesses(self):
-        """Get list of game processes not launched by this launcher"""
-        if self.game_launcher:
-            processes = self.game_launcher.get_unmanaged_processes()
-            return json.dumps(processes)
-        return "[]"
+        """
+        Find game processes not launched by this launcher on a job thread
+        (may walk the whole process table). Returns JSON {job_id};
+        jobFinished delivers [{pid, name}].
+        """
+        if not self.game_launcher:
+            return json.dumps({"job_id": None})
+        job_id = self._submit_job(
+            "getUnmanagedProcesses", lambda job: self.game_launcher.get_unmanaged_processes()
+        )
+        return json.dumps({"job_id": job_id})
 
-    @pyqtSlot(int, result=bool)
+    @pyqtSlot(int, result=str)
     def killUnmanagedProcess(self, pid):
-        """Kill an unmanaged game process"""
+        """
+        Kill an unmanaged game process in the background.
+        Returns JSON {termination_id}; null if the PID is not an unmanaged game client.
+        """
+        termination_id = None
         if self.game_launcher:
-            return self.game_launcher.kill_unmanaged_process(pid)
-        return False
+            termination_id = self.game_launcher.kill_unmanaged_process(pid)
+        return json.dumps({"termination_id": termination_id})
+
+    @pyqtSlot(int, result=str)
+    def getResourceHistory(self, max_points):
+        """
+        Get recent CPU/RSS/IO/thread history of managed clients for charting.
+        max_points <= 0 returns the whole buffered history.
+        """
+        if self.resource_sampler:
+            limit = max_points if max_points > 0 else None
+            return json.dumps(self.resource_sampler.get_history(limit), separators=(',', ':'))
+        return json.dumps({"interval": 0, "clients": {}})
+
+    def _on_process_terminated(self, termination_id, pid, outcome):
+        # A failed kill is retried by the next unmanaged scan
+        self._pending_kills.pop(pid, None)
+        self.processTerminated.emit(json.dumps({"termination_id": termination_id, "pid": pid, "outcome": outcome}))
+
+    def _on_termination_finished(self, termination_id, results_json):
+        self.terminationFinished.emit(json.dumps({"termination_id": termination_id, "results": json.loads(results_json)}))
+
+    def _on_process_started(self, pid, name, managed):
+        self.processStarted.emit(json.dumps({"pid": pid, "name": name, "managed": managed}))
+
+    def _on_process_exited(self, pid, exit_code, runtime):
+        self._pending_kills.pop(pid, None)
+        self.processExited.emit(json.dumps({"pid": pid, "exit_code": exit_code, "runtime": round(runtime, 3)}))
 
     def _check_unmanaged_processes(self):
-        """Background check for unmanaged game processes"""
+        """Background check for newly started unmanaged game processes"""
         if not self.game_launcher:
             return
         
@@ -232,7 +699,7 @@ class LauncherBridge(QObject):
         if self.settings_manager:
             kill_unmanaged = self.settings_manager.get('kill_unmanaged_clients', False)
         
-        unmanaged = self.game_launcher.get_unmanaged_processes()
+        unmanaged = self.game_launcher.scan_unmanaged_processes()
         
         for proc in unmanaged:
             pid = proc.get('pid')
@@ -240,32 +707,58 @@ class LauncherBridge(QObject):
             
             # Emit signal for React to potentially show a warning
             self.unmanagedProcessDetected.emit(json.dumps(proc))
-            
-            # Kill if configured to do so
-            if kill_unmanaged:
-                self.game_launcher.kill_unmanaged_process(pid)
+        
+        # Kill if configured to do so. Every unmanaged client that is still
+        # running is tried, not only new ones, so a kill that failed (access
+        # denied, process still starting) is retried until the process exits.
+        if kill_unmanaged:
+            for pid in self.game_launcher.unmanaged_pids():
+                if pid in self._pending_kills:
+                    continue
+                termination_id = self.game_launcher.kill_unmanaged_process(pid)
+                if termination_id is not None:
+                    self._pending_kills[pid] = termination_id
 
     # ==================== Utility Methods ====================
 
     @pyqtSlot(result=bool)
     def bringGameToFront(self):
         """Bring the game window to front (Fix #2)"""
-        print("[Bridge] bringGameToFront called")
+        self.diagnostics.trace("[Bridge] bringGameToFront called")
         if self.game_launcher:
             return self.game_launcher.bring_to_front()
         return False
 
-    @pyqtSlot(result=bool)
-    def closeGame(self):
-        """Close the game process (Fix #2)"""
-        print("[Bridge] closeGame called")
+    @pyqtSlot(int)
+    def focusClient(self, pid):
+        """Mark a client as focused (unfocused clients may get lower priority)"""
+        self.diagnostics.trace(f"[Bridge] focusClient called: {pid}")
         if self.game_launcher:
-            return self.game_launcher.close_game()
+            self.game_launcher.focus_client(pid)
+
+    @pyqtSlot(str, result=bool)
+    def setEmbedLayout(self, mode):
+        """Switch how embedded clients are shown: 'tabs' or 'grid'"""
+        self.diagnostics.trace(f"[Bridge] setEmbedLayout called: {mode}")
+        if self.window and hasattr(self.window, 'set_embed_layout'):
+            return self.window.set_embed_layout(mode)
         return False
 
+    @pyqtSlot(result=str)
+    def closeGame(self):
+        """
+        Close the game processes (Fix #2) without blocking the UI.
+        Returns JSON {termination_id}; null if nothing was running.
+        """
+        self.diagnostics.trace("[Bridge] closeGame called")
+        termination_id = None
+        if self.game_launcher:
+            termination_id = self.game_launcher.close_game()
+        return json.dumps({"termination_id": termination_id})
+
     @pyqtSlot()
     def exitLauncher(self):
         """Exit the launcher application"""
-        print("[Bridge] exitLauncher called")
+        self.diagnostics.trace("[Bridge] exitLauncher called")
         if self.window:
             self.window.close()
@@ -0,0 +1,114 @@
+# online_count.py
+#
+# Online player count from the server API (<api_url>online.php).
+#
+# Every page and widget showing the count may ask for it at once, so the
+# count is cached with a short TTL and served stale-while-revalidate: get()
+# never blocks, it returns the last known count and, when that is older
+# than the TTL, starts a refresh in the background. Concurrent callers share
+# the one request in flight, and a failed request is cached like a
+# successful one, so the server sees at most one request per TTL window no
+# matter how many callers poll. onlineCountChanged fires only when the
+# count actually changes.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from PyQt6.QtCore import QObject, pyqtSignal
+
+DEFAULT_API_URL = "http://localhost/CustomLauncher/api/"
+DEFAULT_TTL_S = 15
+REQUEST_TIMEOUT = 5
+
+
+class OnlineCountService(QObject):
+    """
+    Cached, single-flight online player count.
+
+    Args:
+        settings_manager: Reads `api_url` and `online_count_ttl_s` (on every call)
+    """
+
+    # Signals
+    onlineCountChanged = pyqtSignal(int)  # New count (emitted from the fetch thread)
+
+    def __init__(self, settings_manager=None):
+        super().__init__()
+        self.settings = settings_manager
+        self._lock = threading.Lock()  # Guards the cache and the in-flight future
+        self._count = None
+        self._fetched_at = None        # monotonic time the last request finished
+        self._inflight = None
+        self._http = requests.Session()
+        self._http.headers["User-Agent"] = "MULauncher/1.0"
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="online-count")
+        self.requests = 0
+
+    def _setting(self, key, default):
+        return self.settings.get(key, default) if self.settings else default
+
+    def get(self, wait=0):
+        """
+        Cached count; refreshes it in the background once it is older than the TTL.
+
+        Args:
+            wait: Seconds to wait for the request in flight when no count is known yet
+
+        Returns:
+            int: Online players, or None if the count was never fetched
+        """
+        with self._lock:
+            count = self._count
+            fresh = (
+                self._fetched_at is not None
+                and time.monotonic() - self._fetched_at < float(self._setting("online_count_ttl_s", DEFAULT_TTL_S))
+            )
+            future = None if fresh else self._revalidate()
+        if count is None and future is not None and wait > 0:
+            try:
+                return future.result(timeout=wait)
+            except Exception:
+                return None
+        return count
+
+    def refresh(self):
+        """
+        Fetch now, regardless of the TTL (joins a request already in flight).
+
+        Returns:
+            Future: Resolves to the count (None if it was never fetched)
+        """
+        with self._lock:
+            return self._revalidate()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._http.close()
+
+    def _revalidate(self):
+        # Caller holds _lock
+        if self._inflight is None:
+            self._inflight = self._pool.submit(self._fetch)
+        return self._inflight
+
+    def _fetch(self):
+        url = self._setting("api_url", DEFAULT_API_URL) + "online.php"
+        count = None
+        try:
+            self.requests += 1
+            response = self._http.get(url, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            count = max(0, int(response.json()["online"]))
+        except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+            print(f"[OnlineCount] Fetch failed, keeping last count: {e}")
+        with self._lock:
+            self._fetched_at = time.monotonic()
+            self._inflight = None
+            changed = count is not None and count != self._count
+            if count is not None:
+                self._count = count
+            count = self._count
+        if changed:
+            self.onlineCountChanged.emit(count)
+        return count
@@ -0,0 +1,248 @@
+# placement_policy.py
+#
+# CPU affinity and priority placement for multi-boxed game clients.
+#
+# Strategies (setting `placement_strategy`):
+#   "none"             - leave the OS scheduler alone (default)
+#   "spread"           - give each client its own physical core
+#   "isolate_launcher" - pin the launcher (and its WebEngine renderer) to
+#                        `launcher_reserved_cores` cores and spread clients
+#                        over the remaining ones
+# Independently, `lower_unfocused_priority` drops every client except the
+# focused one to below-normal priority, and puts a client back to the
+# priority it started with once it gets the focus. On POSIX an unprivileged
+# process may not raise a priority again after lowering it (RLIMIT_NICE), so
+# a client whose priority couldn't be restored is never lowered.
+
+import os
+import threading
+import psutil
+
+STRATEGY_NONE = "none"
+STRATEGY_SPREAD = "spread"
+STRATEGY_ISOLATE_LAUNCHER = "isolate_launcher"
+
+# Priority values understood by psutil.Process.nice() on each platform
+if hasattr(psutil, "BELOW_NORMAL_PRIORITY_CLASS"):
+    NORMAL_PRIORITY = psutil.NORMAL_PRIORITY_CLASS
+    LOW_PRIORITY = psutil.BELOW_NORMAL_PRIORITY_CLASS
+else:
+    NORMAL_PRIORITY = 0
+    LOW_PRIORITY = 10
+
+
+def physical_core_groups(available=None):
+    """
+    Group logical CPUs by physical core.
+
+    Args:
+        available (list): Logical CPUs we may use (defaults to our own affinity)
+
+    Returns:
+        list: Lists of logical CPU ids, one list per physical core
+    """
+    if available is None:
+        try:
+            available = psutil.Process().cpu_affinity()
+        except (AttributeError, psutil.Error):
+            available = list(range(psutil.cpu_count(logical=True) or 1))
+    available = sorted(available)
+    allowed = set(available)
+
+    # Linux exposes the real SMT sibling sets
+    groups = []
+    seen = set()
+    for cpu in available:
+        if cpu in seen:
+            continue
+        siblings = _read_thread_siblings(cpu)
+        if siblings is None:
+            groups = None
+            break
+        group = [c for c in siblings if c in allowed]
+        seen.update(group)
+        groups.append(group)
+    if groups:
+        return groups
+
+    # Fallback: assume siblings are adjacent logical CPUs
+    logical = psutil.cpu_count(logical=True) or len(available)
+    physical = psutil.cpu_count(logical=False) or logical
+    per_core = max(1, logical // physical)
+    return [available[i:i + per_core] for i in range(0, len(available), per_core)]
+
+
+def _read_thread_siblings(cpu):
+    path = f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list"
+    try:
+        with open(path, 'r') as f:
+            text = f.read().strip()
+    except OSError:
+        return None
+
+    cpus = []
+    for part in text.split(','):
+        if '-' in part:
+            start, end = part.split('-')
+            cpus.extend(range(int(start), int(end) + 1))
+        elif part:
+            cpus.append(int(part))
+    return cpus
+
+
+class PlacementPolicy:
+    """
+    Decides and applies CPU affinity and priority for managed clients.
+
+    place() is called at spawn time, release() when a client exits (which
+    rebalances the remaining clients), set_focused() when the player
+    switches clients.
+    """
+
+    def __init__(self, settings_manager=None, core_groups=None):
+        self.strategy = STRATEGY_NONE
+        self.reserved_cores = 1
+        self.lower_unfocused = False
+        if settings_manager:
+            self.strategy = settings_manager.get("placement_strategy", STRATEGY_NONE)
+            self.reserved_cores = int(settings_manager.get("launcher_reserved_cores", 1))
+            self.lower_unfocused = bool(settings_manager.get("lower_unfocused_priority", False))
+
+        self.core_groups = core_groups if core_groups is not None else physical_core_groups()
+        self.clients = []  # PIDs in placement order
+        self.focused_pid = None
+        self.original_priority = {}  # pid -> priority at place()
+        self._lowerable = set()      # PIDs whose original priority can be restored
+        self._warned_nice = False
+        self._lock = threading.Lock()
+
+        if self.strategy == STRATEGY_ISOLATE_LAUNCHER:
+            self._isolate_launcher()
+
+    def launcher_cores(self):
+        """Logical CPUs reserved for the launcher (isolate_launcher only)"""
+        if self.strategy != STRATEGY_ISOLATE_LAUNCHER:
+            return []
+        reserved = self.core_groups[:self._reserved_count()]
+        return [cpu for group in reserved for cpu in group]
+
+    def game_core_groups(self):
+        """Physical core groups clients may be placed on"""
+        if self.strategy == STRATEGY_ISOLATE_LAUNCHER:
+            return self.core_groups[self._reserved_count():]
+        return self.core_groups
+
+    def plan(self):
+        """
+        Compute the placement of every current client.
+
+        Returns:
+            dict: pid -> {'cpus': list or None, 'priority': int}
+        """
+        groups = self.game_core_groups()
+        placement = {}
+        for index, pid in enumerate(self.clients):
+            cpus = None
+            if self.strategy in (STRATEGY_SPREAD, STRATEGY_ISOLATE_LAUNCHER) and groups:
+                cpus = list(groups[index % len(groups)])
+            priority = self.original_priority.get(pid, NORMAL_PRIORITY)
+            if (self.lower_unfocused and pid in self._lowerable
+                    and self.focused_pid is not None and pid != self.focused_pid):
+                priority = LOW_PRIORITY if os.name == 'nt' else max(priority, LOW_PRIORITY)
+            placement[pid] = {'cpus': cpus, 'priority': priority}
+        return placement
+
+    def place(self, pid):
+        """Register a newly spawned client and apply its placement"""
+        if self.lower_unfocused:
+            self._record_priority(pid)
+        with self._lock:
+            if pid not in self.clients:
+                self.clients.append(pid)
+            if self.focused_pid is None:
+                self.focused_pid = pid
+            plan = self.plan()
+        self._apply(pid, plan[pid])
+
+    def release(self, pid):
+        """Forget an exited client and rebalance the others onto the freed cores"""
+        with self._lock:
+            if pid not in self.clients:
+                return
+            self.clients.remove(pid)
+            self.original_priority.pop(pid, None)
+            self._lowerable.discard(pid)
+            if self.focused_pid == pid:
+                self.focused_pid = self.clients[0] if self.clients else None
+            plan = self.plan()
+        self._apply_all(plan)
+
+    def set_focused(self, pid):
+        """Mark the client the player is looking at; others may be deprioritised"""
+        with self._lock:
+            if pid not in self.clients or pid == self.focused_pid:
+                return
+            self.focused_pid = pid
+            plan = self.plan()
+        if self.lower_unfocused:
+            self._apply_all(plan)
+
+    def _reserved_count(self):
+        # Always leave at least one core for the game clients
+        return max(0, min(self.reserved_cores, len(self.core_groups) - 1))
+
+    def _record_priority(self, pid):
+        try:
+            proc = psutil.Process(pid)
+            original = proc.nice()
+            lowerable = self._can_restore(proc, original)
+        except (AttributeError, psutil.Error) as e:
+            print(f"[Placement] Could not read priority of PID {pid}: {e}")
+            return
+        with self._lock:
+            self.original_priority[pid] = original
+            if lowerable:
+                self._lowerable.add(pid)
+        if not lowerable and not self._warned_nice:
+            self._warned_nice = True
+            print(f"[Placement] Not lowering unfocused clients: priority {original} "
+                  f"could not be restored without privileges (RLIMIT_NICE)")
+
+    @staticmethod
+    def _can_restore(proc, original):
+        """Whether a nice value lowered from `original` may be set back to it"""
+        if os.name == 'nt' or os.geteuid() == 0:
+            return True
+        if not hasattr(psutil, "RLIMIT_NICE"):
+            return False  # No RLIMIT_NICE: only root may raise priority
+        soft, _ = proc.rlimit(psutil.RLIMIT_NICE)
+        # The limit allows nice values down to 20 - soft
+        return soft == psutil.RLIM_INFINITY or 20 - soft <= original
+
+    def _isolate_launcher(self):
+        cpus = self.launcher_cores()
+        if not cpus:
+            return
+        try:
+            psutil.Process(os.getpid()).cpu_affinity(cpus)
+            print(f"[Placement] Launcher pinned to CPUs {cpus}")
+        except (AttributeError, psutil.Error) as e:
+            print(f"[Placement] Could not pin launcher: {e}")
+
+    def _apply_all(self, plan):
+        for pid, placement in plan.items():
+            self._apply(pid, placement)
+
+    def _apply(self, pid, placement):
+        if self.strategy == STRATEGY_NONE and not self.lower_unfocused:
+            return
+        try:
+            proc = psutil.Process(pid)
+            if placement['cpus'] is not None:
+                proc.cpu_affinity(placement['cpus'])
+            if self.lower_unfocused and pid in self.original_priority:
+                proc.nice(placement['priority'])
+            print(f"[Placement] PID {pid}: cpus={placement['cpus']} priority={placement['priority']}")
+        except (AttributeError, psutil.Error) as e:
+            # AccessDenied, NoSuchProcess or no affinity support on this platform
+            print(f"[Placement] Could not place PID {pid}: {e}")
@@ -0,0 +1,120 @@
+# process_snapshot.py
+#
+# Shared, TTL-cached view of the OS process table.
+#
+# Every caller that used to walk psutil.process_iter() on its own
+# (process-limit checks, unmanaged-client scans, window lookups) reads
+# from one snapshot instead. Concurrent requests while a scan is running
+# wait for that scan rather than starting another one.
+
+import threading
+import time
+import psutil
+
+DEFAULT_TTL = 1.0  # Seconds a snapshot stays fresh
+
+
+class ProcessSnapshot:
+    """Immutable index of running processes keyed by executable name and PID."""
+
+    def __init__(self, by_pid, taken_at, generation):
+        self.by_pid = by_pid  # pid -> name
+        self.taken_at = taken_at
+        self.generation = generation
+
+        by_name = {}
+        for pid, name in by_pid.items():
+            by_name.setdefault(name.lower(), []).append(pid)
+        self.by_name = {name: tuple(pids) for name, pids in by_name.items()}
+
+    def pids_for(self, name):
+        """PIDs of all processes whose executable name matches (case-insensitive)"""
+        return self.by_name.get(name.lower(), ())
+
+    def count(self, name):
+        """Number of running processes with the given executable name"""
+        return len(self.pids_for(name))
+
+    def name_of(self, pid):
+        """Executable name for a PID, or None if it wasn't running at scan time"""
+        return self.by_pid.get(pid)
+
+    def age(self):
+        """Seconds since this snapshot was taken"""
+        return time.monotonic() - self.taken_at
+
+
+class ProcessSnapshotService:
+    """
+    Coalescing, TTL-cached process scanner.
+
+    Usage:
+        snapshot = process_snapshots.snapshot()
+        pids = snapshot.pids_for("main.exe")
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self._snapshot = None
+        self._generation = 0
+        self._scanning = False
+        self._cond = threading.Condition()
+
+    def snapshot(self, max_age=None):
+        """
+        Return a snapshot no older than `max_age` seconds (defaults to the TTL).
+
+        If another thread is already scanning, wait for its result instead
+        of walking the process table a second time.
+        """
+        if max_age is None:
+            max_age = self.ttl
+
+        with self._cond:
+            snap = self._snapshot
+            if snap is not None and snap.age() <= max_age:
+                return snap
+
+            if self._scanning:
+                seen = self._generation
+                while self._scanning and self._generation == seen:
+                    self._cond.wait()
+                if self._generation != seen and self._snapshot is not None:
+                    return self._snapshot
+                # The scan we waited on failed or was invalidated; scan ourselves
+
+            self._scanning = True
+
+        try:
+            by_pid = self._scan()
+        except Exception as e:
+            print(f"[ProcessSnapshot] Scan failed: {e}")
+            with self._cond:
+                self._scanning = False
+                self._cond.notify_all()
+            return self._snapshot or ProcessSnapshot({}, time.monotonic(), self._generation)
+
+        with self._cond:
+            self._generation += 1
+            self._snapshot = ProcessSnapshot(by_pid, time.monotonic(), self._generation)
+            self._scanning = False
+            self._cond.notify_all()
+            return self._snapshot
+
+    def invalidate(self):
+        """Force the next snapshot() call to rescan (e.g. after spawning or killing a process)"""
+        with self._cond:
+            self._snapshot = None
+
+    def _scan(self):
+        """Walk the process table once, reading only PID and name"""
+        by_pid = {}
+        for proc in psutil.process_iter(['name'], ad_value=None):
+            name = proc.info.get('name')
+            if name:
+                by_pid[proc.pid] = name
+        return by_pid
+
+
+# Shared instance used by GameLauncher, ScreenshotService and window_embed
+process_snapshots = ProcessSnapshotService()
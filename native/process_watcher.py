@@ -0,0 +1,131 @@
+# process_watcher.py
+#
+# Event-driven lifecycle tracking for game client processes.
+#
+# Managed clients (spawned by GameLauncher) are watched with a blocking
+# wait on their Popen handle, so exits are reported as soon as they
+# happen, with the real exit code. Processes that aren't our children
+# are picked up incrementally from the shared process snapshot and then
+# watched with a pidfd on Linux or psutil's native wait elsewhere.
+
+import os
+import select
+import threading
+import time
+import psutil
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from process_snapshot import process_snapshots
+
+UNKNOWN_EXIT_CODE = -1  # Reported when the OS doesn't give us an exit status
+
+
+class ProcessWatcher(QObject):
+    # Signals (emitted from watcher threads; Qt queues them to the GUI thread)
+    processStarted = pyqtSignal(int, str, bool)    # pid, name, managed
+    processExited = pyqtSignal(int, int, float)    # pid, exit_code, runtime_seconds
+
+    def __init__(self):
+        super().__init__()
+        self._watched = {}  # pid -> {'name', 'managed', 'started'}
+        self._lock = threading.Lock()
+
+    def watch_child(self, process, name):
+        """
+        Track a process spawned by the launcher (a subprocess.Popen).
+
+        A daemon thread blocks in process.wait(), so no polling is involved.
+        """
+        pid = process.pid
+        if not self._register(pid, name, managed=True, started=time.monotonic()):
+            return
+        self.processStarted.emit(pid, name, True)
+        threading.Thread(target=self._wait_child, args=(process,), daemon=True).start()
+
+    def watch_pid(self, pid, name):
+        """Track a process that is not our child (e.g. an unmanaged client)"""
+        try:
+            runtime_so_far = time.time() - psutil.Process(pid).create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            runtime_so_far = 0.0
+        started = time.monotonic() - max(runtime_so_far, 0.0)
+
+        if not self._register(pid, name, managed=False, started=started):
+            return
+        self.processStarted.emit(pid, name, False)
+        threading.Thread(target=self._wait_pid, args=(pid,), daemon=True).start()
+
+    def scan(self, process_name):
+        """
+        Incrementally detect game processes started outside the launcher.
+
+        Reads the shared snapshot and only reports PIDs not seen before;
+        exits are reported by the per-process wait threads.
+
+        Returns:
+            list: PIDs newly detected by this scan
+        """
+        new_pids = []
+        for pid in process_snapshots.snapshot().pids_for(process_name):
+            if not self.is_watched(pid):
+                new_pids.append(pid)
+                self.watch_pid(pid, process_name)
+        return new_pids
+
+    def is_watched(self, pid):
+        with self._lock:
+            return pid in self._watched
+
+    def watched_pids(self, managed=None):
+        """PIDs currently tracked, optionally filtered by managed/unmanaged"""
+        with self._lock:
+            return [
+                pid for pid, info in self._watched.items()
+                if managed is None or info['managed'] == managed
+            ]
+
+    def _register(self, pid, name, managed, started):
+        with self._lock:
+            if pid in self._watched:
+                return False
+            self._watched[pid] = {'name': name, 'managed': managed, 'started': started}
+            return True
+
+    def _finish(self, pid, exit_code):
+        with self._lock:
+            info = self._watched.pop(pid, None)
+        if info is None:
+            return
+        runtime = time.monotonic() - info['started']
+        process_snapshots.invalidate()
+        print(f"[ProcessWatcher] PID {pid} exited (code {exit_code}) after {runtime:.1f}s")
+        self.processExited.emit(pid, exit_code, runtime)
+
+    def _wait_child(self, process):
+        try:
+            exit_code = process.wait()
+        except Exception as e:
+            print(f"[ProcessWatcher] Wait failed for PID {process.pid}: {e}")
+            exit_code = UNKNOWN_EXIT_CODE
+        self._finish(process.pid, exit_code)
+
+    def _wait_pid(self, pid):
+        exit_code = UNKNOWN_EXIT_CODE
+        try:
+            if hasattr(os, "pidfd_open"):
+                # Linux: the pidfd becomes readable when the process exits
+                fd = os.pidfd_open(pid)
+                try:
+                    select.select([fd], [], [])
+                finally:
+                    os.close(fd)
+            else:
+                # Windows waits on the process handle and returns the exit code
+                code = psutil.Process(pid).wait()
+                if code is not None:
+                    exit_code = code
+        except (ProcessLookupError, psutil.NoSuchProcess):
+            pass  # Already gone
+        except Exception as e:
+            print(f"[ProcessWatcher] Wait failed for PID {pid}: {e}")
+        self._finish(pid, exit_code)
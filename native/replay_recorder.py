@@ -0,0 +1,339 @@
+# replay_recorder.py
+#
+# Low-rate continuous capture of the game window for instant replays.
+#
+# Frames are copied raw into one preallocated ring buffer that is reused
+# for the whole recording, so steady-state recording allocates no frame
+# storage. Saving a replay freezes the ring just long enough to scale the
+# buffered frames down, then encodes them (animated GIF/WebP or a PNG
+# sequence) on a worker thread while recording continues.
+#
+# The recorder thread measures its own CPU time so the overhead of
+# recording can be checked with stats().
+
+import itertools
+import os
+import threading
+import time
+from array import array
+from PIL import Image
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from screenshot_encoder import Frame
+
+DEFAULT_FPS = 4
+DEFAULT_SECONDS = 30
+DEFAULT_MEMORY_MB = 512
+DEFAULT_EXPORT_WIDTH = 960
+DEFAULT_EXPORT_FORMAT = "gif"
+EXPORT_FORMATS = ("gif", "webp", "png")  # png = numbered image sequence in a folder
+
+
+class FrameRing:
+    """
+    Fixed-size ring of raw frames in a single preallocated buffer.
+
+    Args:
+        capacity: Number of frame slots
+        frame_bytes: Size of one slot; larger frames are rejected
+    """
+
+    def __init__(self, capacity, frame_bytes):
+        self.capacity = capacity
+        self.frame_bytes = frame_bytes
+        self.buffer = bytearray(capacity * frame_bytes)
+        self.view = memoryview(self.buffer)
+        self.timestamps = array('d', [0.0]) * capacity
+        self.widths = array('i', [0]) * capacity
+        self.heights = array('i', [0]) * capacity
+        self.strides = array('i', [0]) * capacity
+        self.sizes = array('q', [0]) * capacity
+        self.raw_mode = "BGRX"
+        self.head = 0   # Next slot to write
+        self.count = 0
+
+    def push(self, frame, timestamp):
+        """
+        Copy `frame` into the oldest slot.
+
+        Returns:
+            bool: False if the frame doesn't fit a slot
+        """
+        size = len(frame.data)
+        if size > self.frame_bytes:
+            return False
+        slot = self.head
+        start = slot * self.frame_bytes
+        self.view[start:start + size] = frame.data
+        self.timestamps[slot] = timestamp
+        self.widths[slot] = frame.width
+        self.heights[slot] = frame.height
+        self.strides[slot] = frame.stride
+        self.sizes[slot] = size
+        self.raw_mode = frame.raw_mode
+        self.head = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        return True
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def frames(self, since=None):
+        """
+        Buffered frames, oldest first, as (timestamp, Frame) pairs whose data
+        are views into the ring (only valid until the slot is overwritten).
+        """
+        first = (self.head - self.count) % self.capacity
+        for i in range(self.count):
+            slot = (first + i) % self.capacity
+            if since is not None and self.timestamps[slot] < since:
+                continue
+            start = slot * self.frame_bytes
+            data = self.view[start:start + self.sizes[slot]]
+            frame = Frame(self.widths[slot], self.heights[slot], data, raw_mode=self.raw_mode, stride=self.strides[slot])
+            yield self.timestamps[slot], frame
+
+    def memory_bytes(self):
+        return len(self.buffer)
+
+
+class ReplayRecorder(QObject):
+    """
+    Records the game window at a low frame rate into a FrameRing.
+
+    Args:
+        settings_manager: Reads the `replay_*` settings
+        grab: Callable returning a Frame of the game window, or None; the
+            frame may be a view of a reused capture buffer (it is copied)
+        release: Optional callable run on the recorder thread when it exits,
+            to free that thread's capture buffer
+        output_dir: Where exported replays are written (created on first export)
+    """
+
+    # Signals (emitted from worker threads)
+    replaySaved = pyqtSignal(int, str)   # job_id, path
+    replayFailed = pyqtSignal(int, str)  # job_id, error
+
+    def __init__(self, settings_manager, grab, output_dir, release=None):
+        super().__init__()
+        self.settings = settings_manager
+        self.grab = grab
+        self.release = release
+        self.output_dir = output_dir
+        self.ring = None
+        self.thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()  # Guards the ring
+        self._paths_lock = threading.Lock()
+        self._reserved = set()  # Paths claimed by exports still being written
+        self._job_ids = itertools.count(1)
+        self._reset_stats()
+
+    def _setting(self, key, default):
+        if self.settings is None:
+            return default
+        return self.settings.get(key, default)
+
+    def fps(self):
+        return max(0.5, float(self._setting("replay_fps", DEFAULT_FPS)))
+
+    def _reset_stats(self):
+        self.frames = 0
+        self.dropped = 0
+        self.grab_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.started_at = None
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def is_recording(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        """
+        Returns:
+            bool: True if recording was started
+        """
+        if self.is_recording():
+            return False
+        self._stop.clear()
+        self._reset_stats()
+        self.started_at = time.monotonic()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print(f"[Replay] Recording at {self.fps()} fps")
+        return True
+
+    def stop(self, release=True):
+        """Stop recording; `release` also frees the ring buffer"""
+        self._stop.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+        self.thread = None
+        if release:
+            with self._lock:
+                self.ring = None
+
+    def _run(self):
+        try:
+            self._record()
+        finally:
+            if self.release:
+                self.release()
+
+    def _record(self):
+        interval = 1.0 / self.fps()
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            cpu_start = time.thread_time()
+            started = time.perf_counter()
+            frame = self.grab()
+            self.grab_seconds += time.perf_counter() - started
+            if frame is None:
+                self.dropped += 1
+            else:
+                self._store(frame, time.time())
+            self.cpu_seconds += time.thread_time() - cpu_start
+
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                # Fell behind (slow grab); don't try to catch up
+                next_tick = time.monotonic()
+                delay = 0
+            self._stop.wait(delay)
+
+    def _store(self, frame, timestamp):
+        with self._lock:
+            if self.ring is None or len(frame.data) > self.ring.frame_bytes:
+                self.ring = self._allocate(len(frame.data))
+            if self.ring.push(frame, timestamp):
+                self.frames += 1
+            else:
+                self.dropped += 1
+
+    def _allocate(self, frame_bytes):
+        """Size the ring for the wanted seconds, within the memory cap"""
+        seconds = float(self._setting("replay_seconds", DEFAULT_SECONDS))
+        memory_cap = int(self._setting("replay_memory_mb", DEFAULT_MEMORY_MB)) * 1024 * 1024
+        wanted = max(1, int(seconds * self.fps()))
+        capacity = max(1, min(wanted, memory_cap // frame_bytes))
+        if capacity < wanted:
+            print(f"[Replay] Memory cap allows {capacity / self.fps():.1f}s of {seconds:.0f}s")
+        print(f"[Replay] Ring: {capacity} frames x {frame_bytes / (1024 * 1024):.1f} MB")
+        return FrameRing(capacity, frame_bytes)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Recording state, buffer fill and the recorder's CPU overhead
+        """
+        with self._lock:
+            buffered = self.ring.count if self.ring else 0
+            memory = self.ring.memory_bytes() if self.ring else 0
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        grabs = self.frames + self.dropped
+        return {
+            "recording": self.is_recording(),
+            "fps": self.fps(),
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "buffered": buffered,
+            "seconds_buffered": round(buffered / self.fps(), 1),
+            "memory_mb": round(memory / (1024 * 1024), 1),
+            "grab_ms_avg": round(self.grab_seconds / grabs * 1000, 2) if grabs else None,
+            "cpu_percent": round(self.cpu_seconds / elapsed * 100, 2) if elapsed else None,
+        }
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def export(self, seconds=None, format=None):
+        """
+        Save the buffered window (or its last `seconds`) in the background.
+
+        Returns:
+            int: Job id used in replaySaved/replayFailed, or None if nothing is buffered
+        """
+        format = (format or self._setting("replay_export_format", DEFAULT_EXPORT_FORMAT)).lower()
+        if format not in EXPORT_FORMATS:
+            format = DEFAULT_EXPORT_FORMAT
+        with self._lock:
+            if self.ring is None or not self.ring.count:
+                return None
+        job_id = next(self._job_ids)
+        threading.Thread(
+            target=self._export, args=(job_id, seconds, format), daemon=True
+        ).start()
+        return job_id
+
+    def _freeze(self, seconds):
+        """Scaled copies of the buffered frames; holds the ring (and so delays the
+        recorder) only while scaling"""
+        export_width = int(self._setting("replay_export_width", DEFAULT_EXPORT_WIDTH))
+        with self._lock:
+            if self.ring is None:
+                return []
+            since = time.time() - seconds if seconds else None
+            images = []
+            for _, frame in self.ring.frames(since):
+                image = frame.to_image()
+                if export_width and image.width > export_width:
+                    height = round(image.height * export_width / image.width)
+                    image = image.resize((export_width, height), Image.Resampling.BILINEAR)
+                else:
+                    image = image.copy()
+                images.append(image)
+        return images
+
+    def _new_path(self, extension):
+        """
+        Timestamped path that isn't taken on disk or by a running export
+        (PNG sequences get a folder, created here to claim it).
+        """
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        suffix = f".{extension}" if extension != "png" else ""
+        with self._paths_lock:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, f"replay_{stamp}{suffix}")
+            counter = 1
+            while path in self._reserved or os.path.exists(path):
+                path = os.path.join(self.output_dir, f"replay_{stamp}_{counter}{suffix}")
+                counter += 1
+            if extension == "png":
+                os.makedirs(path)
+            self._reserved.add(path)
+        return path
+
+    def _export(self, job_id, seconds, format):
+        duration = int(1000 / self.fps())
+        path = None
+        try:
+            images = self._freeze(seconds)
+            if not images:
+                raise RuntimeError("Replay buffer is empty")
+            path = self._new_path(format)
+            if format == "png":
+                for index, image in enumerate(images):
+                    image.save(os.path.join(path, f"frame_{index:04d}.png"), "PNG", compress_level=1)
+            else:
+                partial = path + ".part"
+                params = {"save_all": True, "append_images": images[1:], "duration": duration, "loop": 0}
+                if format == "webp":
+                    params.update(quality=80, method=2)
+                images[0].save(partial, format.upper(), **params)
+                os.replace(partial, path)
+        except Exception as e:
+            print(f"[Replay] Export {job_id} failed: {e}")
+            self.replayFailed.emit(job_id, str(e))
+            return
+        finally:
+            if path is not None:
+                with self._paths_lock:
+                    self._reserved.discard(path)
+        print(f"[Replay] Saved {len(images)} frames to {path}")
+        self.replaySaved.emit(job_id, path)
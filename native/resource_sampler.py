@@ -0,0 +1,166 @@
+# resource_sampler.py
+#
+# Low-overhead per-client resource sampling (CPU, memory, I/O, threads)
+# for processes launched by GameLauncher. History is kept in fixed-size
+# array-backed ring buffers so sampling never allocates per point.
+
+import threading
+import time
+from array import array
+import psutil
+
+DEFAULT_INTERVAL_MS = 1000
+DEFAULT_HISTORY_SIZE = 300  # 5 minutes at the default rate
+MIN_INTERVAL_MS = 50
+
+METRICS = ('cpu', 'rss', 'io_read', 'io_write', 'threads')
+
+
+class RingBuffer:
+    """Fixed-capacity ring of doubles backed by a preallocated array."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._data = array('d', bytes(8 * capacity))
+        self._head = 0  # Next write position
+        self._count = 0
+
+    def append(self, value):
+        self._data[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def __len__(self):
+        return self._count
+
+    def to_list(self, limit=None):
+        """Values oldest-first, optionally only the most recent `limit`"""
+        count = self._count if limit is None else min(limit, self._count)
+        start = (self._head - count) % self.capacity
+        if start + count <= self.capacity:
+            return self._data[start:start + count].tolist()
+        return (self._data[start:] + self._data[:self._head]).tolist()
+
+
+class ClientHistory:
+    """Sample history of one client process."""
+
+    def __init__(self, pid, capacity):
+        self.pid = pid
+        self.process = psutil.Process(pid)  # Reused for every sample
+        self.timestamps = RingBuffer(capacity)
+        self.series = {metric: RingBuffer(capacity) for metric in METRICS}
+        # Prime cpu_percent so the first real sample is meaningful
+        self.process.cpu_percent(None)
+
+    def sample(self, now):
+        proc = self.process
+        with proc.oneshot():
+            cpu = proc.cpu_percent(None)
+            rss = proc.memory_info().rss
+            threads = proc.num_threads()
+            try:
+                io = proc.io_counters()
+                io_read, io_write = io.read_bytes, io.write_bytes
+            except (AttributeError, psutil.AccessDenied):
+                io_read = io_write = 0
+
+        self.timestamps.append(now)
+        self.series['cpu'].append(cpu)
+        self.series['rss'].append(rss)
+        self.series['io_read'].append(io_read)
+        self.series['io_write'].append(io_write)
+        self.series['threads'].append(threads)
+
+    def to_dict(self, limit=None):
+        data = {'t': self.timestamps.to_list(limit)}
+        for metric, ring in self.series.items():
+            data[metric] = ring.to_list(limit)
+        return data
+
+
+class ResourceSampler:
+    """
+    Background sampler for GameLauncher.managed_pids.
+
+    Args:
+        game_launcher: Source of the managed PIDs
+        settings_manager: Reads `resource_sample_interval_ms` and `resource_history_size`
+    """
+
+    def __init__(self, game_launcher, settings_manager=None):
+        self.game_launcher = game_launcher
+        self.interval = DEFAULT_INTERVAL_MS / 1000.0
+        self.capacity = DEFAULT_HISTORY_SIZE
+        if settings_manager:
+            # The settings model already validates both; clamp anyway so a bad
+            # value can't turn the sampler into a busy loop or an empty ring
+            interval_ms = settings_manager.get("resource_sample_interval_ms", DEFAULT_INTERVAL_MS)
+            history_size = settings_manager.get("resource_history_size", DEFAULT_HISTORY_SIZE)
+            try:
+                self.interval = max(MIN_INTERVAL_MS, float(interval_ms)) / 1000.0
+                self.capacity = max(1, int(history_size))
+            except (TypeError, ValueError) as e:
+                print(f"[ResourceSampler] Invalid sampling settings, using defaults: {e}")
+        self.clients = {}  # pid -> ClientHistory
+        self.running = False
+        self.thread = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def start(self):
+        """Start the background sampling thread"""
+        if not self.running:
+            self.running = True
+            self._stop_event.clear()
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+            print("[ResourceSampler] Started")
+
+    def stop(self):
+        """Stop the background sampling thread"""
+        self.running = False
+        self._stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+        print("[ResourceSampler] Stopped")
+
+    def _run(self):
+        while self.running:
+            try:
+                self.sample_once()
+            except Exception as e:
+                print(f"[ResourceSampler] Error sampling: {e}")
+            self._stop_event.wait(self.interval)
+
+    def sample_once(self):
+        """Take one sample of every managed client"""
+        pids = set(self.game_launcher.get_managed_pids())
+        now = time.time()
+
+        with self._lock:
+            # Forget clients that are no longer managed
+            for pid in list(self.clients):
+                if pid not in pids:
+                    del self.clients[pid]
+
+            for pid in pids:
+                history = self.clients.get(pid)
+                try:
+                    if history is None:
+                        history = self.clients[pid] = ClientHistory(pid, self.capacity)
+                    history.sample(now)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    self.clients.pop(pid, None)
+
+    def get_history(self, limit=None):
+        """
+        Recent history of every client as compact parallel arrays.
+
+        Returns:
+            dict: {interval, clients: {pid: {t, cpu, rss, io_read, io_write, threads}}}
+        """
+        with self._lock:
+            clients = {str(pid): history.to_dict(limit) for pid, history in self.clients.items()}
+        return {'interval': self.interval, 'clients': clients}
@@ -0,0 +1,232 @@
+# screenshot_encoder.py
+#
+# Background encoding of captured frames.
+#
+# Capturing a window only copies its pixels into a Frame; turning that
+# into a PNG (hundreds of ms for 1080p) happens on a small worker pool
+# so the Qt event loop and the WebChannel never wait on zlib. Files are
+# written under a temporary name in a hidden subfolder and renamed into
+# place, so nothing ever sees a half-written screenshot and each saved file
+# changes the output folder's mtime exactly once (the gallery index relies
+# on that to tell our writes from everyone else's).
+#
+# How a frame is written is chosen by a named preset (the
+# `screenshot_preset` setting); bench_screenshot_encoders.py compares them.
+
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, features
+from PyQt6.QtCore import QObject, pyqtSignal
+
+DEFAULT_WORKERS = 2
+PARTIAL_SUFFIX = ".part"
+PARTIAL_DIR = ".partial"  # Inside the output folder: same filesystem, but doesn't touch its mtime
+
+# name -> (PIL format, file extension, save params)
+PRESETS = {
+    "png_fast": ("PNG", "png", {"compress_level": 1}),
+    "png": ("PNG", "png", {}),  # Pillow defaults (zlib level 6)
+    "webp_lossless": ("WEBP", "webp", {"lossless": True, "quality": 20, "method": 1}),
+    "webp_85": ("WEBP", "webp", {"quality": 85, "method": 2}),
+    "jpeg_90": ("JPEG", "jpg", {"quality": 90}),
+}
+DEFAULT_PRESET = "png_fast"
+
+
+def available_presets():
+    """Presets this Pillow build can write"""
+    webp = features.check('webp')
+    return [name for name, (fmt, _, _) in PRESETS.items() if fmt != "WEBP" or webp]
+
+
+def resolve_preset(name):
+    """
+    Returns:
+        tuple: (name, format, extension, params), falling back to DEFAULT_PRESET
+        if `name` is unknown or unsupported by this Pillow build
+    """
+    if name not in available_presets():
+        if name:
+            print(f"[ScreenshotEncoder] Preset '{name}' unavailable, using {DEFAULT_PRESET}")
+        name = DEFAULT_PRESET
+    fmt, extension, params = PRESETS[name]
+    return name, fmt, extension, dict(params)
+
+
+class Frame:
+    """
+    Raw pixels of one capture.
+
+    Args:
+        width, height: Frame size in pixels
+        data: Bytes-like pixel buffer (not copied)
+        raw_mode: PIL raw mode of `data`, e.g. 'BGRX' for GDI bitmaps
+        stride: Bytes per row (0 = tightly packed)
+        orientation: 1 for top-down rows, -1 for bottom-up
+    """
+
+    def __init__(self, width, height, data, raw_mode="BGRX", stride=0, orientation=1):
+        self.width = width
+        self.height = height
+        self.data = data
+        self.raw_mode = raw_mode
+        self.stride = stride
+        self.orientation = orientation
+        self._image = None
+
+    @classmethod
+    def from_image(cls, image):
+        """Wrap an already decoded PIL image (e.g. from ImageGrab)"""
+        frame = cls(image.width, image.height, None, raw_mode=image.mode)
+        frame._image = image
+        return frame
+
+    def copy(self):
+        """Frame with its own copy of the pixels, e.g. to keep a capture that
+        is a view of a backend's reused buffer"""
+        if self.data is None:
+            return Frame.from_image(self._image.copy())
+        return Frame(self.width, self.height, bytes(self.data), self.raw_mode, self.stride, self.orientation)
+
+    def to_image(self):
+        """PIL view of the frame; shares `data` instead of copying it"""
+        if self._image is None:
+            self._image = Image.frombuffer(
+                'RGB', (self.width, self.height), self.data,
+                'raw', self.raw_mode, self.stride, self.orientation
+            )
+        return self._image
+
+
+def synthetic_frame(width, height, seed=0):
+    """
+    A BGRX frame with smooth gradients plus noise, roughly as hard to
+    compress as a game scene. For tests and benchmarks.
+    """
+    horizontal = Image.linear_gradient('L').rotate(90 + seed % 360).resize((width, height))
+    vertical = Image.linear_gradient('L').resize((width, height))
+    noise = Image.effect_noise((width, height), 24 + seed % 40)
+    image = Image.merge('RGB', (horizontal, vertical, noise))
+    return Frame(width, height, image.tobytes('raw', 'BGRX'), raw_mode='BGRX')
+
+
+def partial_path(path):
+    """Temporary name `path` is written under before it is renamed into place"""
+    folder, name = os.path.split(path)
+    return os.path.join(folder, PARTIAL_DIR, name + PARTIAL_SUFFIX)
+
+
+def write_partial(frame, path, format="PNG", **params):
+    """
+    Encode `frame` to the temporary name of `path`.
+
+    Returns:
+        str: The partial file, to be os.replace()d onto `path`
+    """
+    partial = partial_path(path)
+    try:
+        os.makedirs(os.path.dirname(partial), exist_ok=True)
+        image = frame.to_image()
+        if format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(partial, format, **params)
+    except Exception:
+        _discard(partial)
+        raise
+    return partial
+
+
+def encode_frame(frame, path, format="PNG", **params):
+    """
+    Encode `frame` to `path`, atomically.
+
+    Returns:
+        str: `path`
+    """
+    partial = write_partial(frame, path, format, **params)
+    try:
+        os.replace(partial, path)
+    except OSError:
+        _discard(partial)
+        raise
+    return path
+
+
+def _discard(partial):
+    if os.path.exists(partial):
+        os.remove(partial)
+
+
+def _dir_mtime(folder):
+    try:
+        return os.stat(folder).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ScreenshotEncoder(QObject):
+    """
+    Worker pool that encodes frames to files.
+
+    submit() returns a job id immediately; the result arrives through
+    frameSaved or frameFailed (emitted from a worker thread, so connected
+    QObjects receive them queued on their own thread).
+    """
+
+    # Signals
+    frameSaved = pyqtSignal(int, str, object)  # job_id, path, (folder mtime before, after the rename)
+    frameFailed = pyqtSignal(int, str)  # job_id, error
+
+    def __init__(self, workers=DEFAULT_WORKERS):
+        super().__init__()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="screenshot-encode")
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._rename_lock = threading.Lock()  # One rename (and its mtime pair) at a time, in signal order
+        self._pending = {}  # job_id -> path
+
+    def submit(self, frame, path, format="PNG", **params):
+        """
+        Queue `frame` for encoding to `path`.
+
+        Returns:
+            int: Job id used in frameSaved/frameFailed
+        """
+        job_id = next(self._job_ids)
+        with self._lock:
+            self._pending[job_id] = path
+        self._executor.submit(self._encode, job_id, frame, path, format, params)
+        return job_id
+
+    def pending_paths(self):
+        """Paths that are reserved by queued or running jobs"""
+        with self._lock:
+            return set(self._pending.values())
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def _encode(self, job_id, frame, path, format, params):
+        folder = os.path.dirname(path)
+        try:
+            partial = write_partial(frame, path, format, **params)
+            with self._rename_lock:
+                before = _dir_mtime(folder)
+                try:
+                    os.replace(partial, path)
+                except OSError:
+                    _discard(partial)
+                    raise
+                after = _dir_mtime(folder)
+                with self._lock:
+                    self._pending.pop(job_id, None)
+                self.frameSaved.emit(job_id, path, (before, after))
+        except Exception as e:
+            print(f"[ScreenshotEncoder] Job {job_id} failed: {e}")
+            with self._lock:
+                self._pending.pop(job_id, None)
+            self.frameFailed.emit(job_id, str(e))
+            return
+        print(f"Screenshot saved: {path}")
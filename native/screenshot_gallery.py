@@ -0,0 +1,338 @@
+# screenshot_gallery.py
+#
+# Screenshot gallery: a persistent index of the screenshots folder and a
+# disk-backed thumbnail cache.
+#
+# The index is kept sorted (newest first) and updated incrementally when
+# the launcher saves or deletes a screenshot. Files added or removed by
+# anyone else are picked up by comparing the folder's mtime with the one
+# recorded at the last scan, so a page request normally costs one stat().
+#
+# Thumbnails are small JPEGs generated lazily on a worker thread and
+# evicted least-recently-used once the cache exceeds its byte budget.
+# The web UI only ever receives thumbnails, never full-size images.
+
+import base64
+import bisect
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from PyQt6.QtCore import QObject, pyqtSignal
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+INDEX_VERSION = 1
+
+THUMBNAIL_SIZE = (320, 180)
+THUMBNAIL_QUALITY = 80
+DEFAULT_CACHE_MB = 64
+
+
+def is_screenshot(filename):
+    return filename.lower().endswith(IMAGE_EXTENSIONS)
+
+
+class GalleryEntry:
+    def __init__(self, filename, mtime, size):
+        self.filename = filename
+        self.mtime = mtime
+        self.size = size
+
+    def sort_key(self):
+        # Newest first, ties broken by name
+        return (-self.mtime, self.filename)
+
+
+class GalleryIndex:
+    """
+    Sorted, persisted index of the screenshots in one folder.
+
+    Args:
+        directory: The screenshots folder
+        index_path: JSON file the index is persisted to (outside `directory`,
+            so saving the index doesn't change the folder's mtime)
+    """
+
+    def __init__(self, directory, index_path):
+        self.directory = directory
+        self.index_path = index_path
+        self._entries = {}   # filename -> GalleryEntry
+        self._order = []     # sort keys, newest first
+        self._dir_mtime = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION or data.get("directory") != self.directory:
+                return
+            for filename, (mtime, size) in data.get("entries", {}).items():
+                self._insert(GalleryEntry(filename, mtime, size))
+            self._dir_mtime = data.get("dir_mtime")
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def save(self):
+        data = {
+            "version": INDEX_VERSION,
+            "directory": self.directory,
+            "dir_mtime": self._dir_mtime,
+            "entries": {name: [e.mtime, e.size] for name, e in self._entries.items()},
+        }
+        partial = self.index_path + ".part"
+        try:
+            with open(partial, 'w') as f:
+                json.dump(data, f)
+            os.replace(partial, self.index_path)
+        except OSError as e:
+            print(f"[Gallery] Could not save index: {e}")
+
+    def _insert(self, entry):
+        self._discard(entry.filename)
+        self._entries[entry.filename] = entry
+        bisect.insort(self._order, entry.sort_key())
+
+    def _discard(self, filename):
+        entry = self._entries.pop(filename, None)
+        if entry is None:
+            return None
+        key = entry.sort_key()
+        i = bisect.bisect_left(self._order, key)
+        if i < len(self._order) and self._order[i] == key:
+            del self._order[i]
+        return entry
+
+    def _stat_dir(self):
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def is_current(self, dir_mtime=None):
+        """
+        True if the folder hasn't changed since the index last saw it.
+        Check this before writing to the folder and pass it to add()/remove().
+
+        Args:
+            dir_mtime: Folder mtime (ns) to check instead of the current one,
+                e.g. the one recorded just before a rename into the folder
+        """
+        if dir_mtime is None:
+            dir_mtime = self._stat_dir()
+        return dir_mtime is not None and dir_mtime == self._dir_mtime
+
+    def add(self, path, was_current=False, dir_mtime=None):
+        """
+        Record a screenshot the launcher just wrote.
+
+        Args:
+            was_current: is_current() from before the write. Only then is the
+                folder's new mtime taken as seen; otherwise someone else may
+                have changed the folder too and the next reconcile() rescans.
+            dir_mtime: Folder mtime right after the write (default: stat now)
+        """
+        filename = os.path.basename(path)
+        if not is_screenshot(filename):
+            return
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        self._insert(GalleryEntry(filename, st.st_mtime, st.st_size))
+        if was_current:
+            self._dir_mtime = dir_mtime if dir_mtime is not None else self._stat_dir()
+        self.save()
+
+    def remove(self, path, was_current=False):
+        """
+        Args:
+            was_current: is_current() from before the file was deleted (see add())
+
+        Returns:
+            GalleryEntry: The removed entry, or None if it wasn't indexed
+        """
+        entry = self._discard(os.path.basename(path))
+        if was_current:
+            self._dir_mtime = self._stat_dir()
+        self.save()
+        return entry
+
+    def reconcile(self):
+        """
+        Rescan the folder if it changed behind our back.
+
+        Returns:
+            bool: True if a rescan happened
+        """
+        dir_mtime = self._stat_dir()
+        if dir_mtime is not None and dir_mtime == self._dir_mtime:
+            return False
+
+        seen = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for dirent in it:
+                    if dirent.is_file() and is_screenshot(dirent.name):
+                        st = dirent.stat()
+                        seen[dirent.name] = (st.st_mtime, st.st_size)
+        except OSError as e:
+            print(f"[Gallery] Could not scan {self.directory}: {e}")
+            return False
+
+        for filename in list(self._entries):
+            if filename not in seen:
+                self._discard(filename)
+        for filename, (mtime, size) in seen.items():
+            entry = self._entries.get(filename)
+            if entry is None or entry.mtime != mtime or entry.size != size:
+                self._insert(GalleryEntry(filename, mtime, size))
+
+        self._dir_mtime = dir_mtime
+        self.save()
+        print(f"[Gallery] Rescanned {len(seen)} screenshots")
+        return True
+
+    def count(self):
+        return len(self._order)
+
+    def get(self, filename):
+        return self._entries.get(filename)
+
+    def page(self, offset=0, limit=24):
+        """
+        Returns:
+            list[GalleryEntry]: Entries `offset`..`offset + limit`, newest first
+        """
+        keys = self._order[max(0, offset):max(0, offset) + max(0, limit)]
+        return [self._entries[filename] for _, filename in keys]
+
+
+class ThumbnailCache(QObject):
+    """
+    Disk-backed LRU cache of screenshot thumbnails.
+
+    Args:
+        cache_dir: Folder the thumbnails are kept in
+        max_bytes: Total size kept before least-recently-used thumbnails are evicted
+    """
+
+    # Signals (emitted from the worker thread)
+    thumbnailReady = pyqtSignal(str, str)  # screenshot filename, thumbnail path
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024):
+        super().__init__()
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnails")
+        self._lock = threading.Lock()
+        self._lru = OrderedDict()  # thumbnail name -> bytes, least recently used first
+        self._total = 0
+        self._queued = set()
+        self._load()
+
+    def _load(self):
+        # Last access is kept in the file mtime (touched on every hit)
+        found = []
+        with os.scandir(self.cache_dir) as it:
+            for dirent in it:
+                if dirent.is_file() and dirent.name.endswith('.jpg'):
+                    st = dirent.stat()
+                    found.append((st.st_mtime, dirent.name, st.st_size))
+        for _, name, size in sorted(found):
+            self._lru[name] = size
+            self._total += size
+
+    @staticmethod
+    def key(filename, mtime):
+        digest = hashlib.sha1(filename.encode('utf-8')).hexdigest()[:16]
+        return f"{digest}_{int(mtime * 1000)}.jpg"
+
+    def path_of(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def get(self, filename, mtime):
+        """
+        Path of the cached thumbnail, or None (call request() to generate it)
+        """
+        name = self.key(filename, mtime)
+        with self._lock:
+            if name not in self._lru:
+                return None
+            self._lru.move_to_end(name)
+        path = self.path_of(name)
+        try:
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._forget(name)
+            return None
+        return path
+
+    def request(self, source_path, mtime):
+        """Generate the thumbnail of `source_path` in the background (once)"""
+        name = self.key(os.path.basename(source_path), mtime)
+        with self._lock:
+            if name in self._lru or name in self._queued:
+                return
+            self._queued.add(name)
+        self._executor.submit(self._generate, source_path, name)
+
+    def _generate(self, source_path, name):
+        path = self.path_of(name)
+        try:
+            with Image.open(source_path) as image:
+                image.draft('RGB', THUMBNAIL_SIZE)  # Cheap downscaled decode where the format allows
+                image.thumbnail(THUMBNAIL_SIZE, Image.Resampling.BILINEAR, reducing_gap=2.0)
+                image.convert('RGB').save(path + ".part", 'JPEG', quality=THUMBNAIL_QUALITY)
+            os.replace(path + ".part", path)
+            size = os.path.getsize(path)
+        except Exception as e:
+            print(f"[Gallery] Thumbnail failed for {source_path}: {e}")
+            with self._lock:
+                self._queued.discard(name)
+            return
+
+        with self._lock:
+            self._queued.discard(name)
+            self._lru[name] = size
+            self._total += size
+            self._evict()
+        self.thumbnailReady.emit(os.path.basename(source_path), path)
+
+    def _evict(self):
+        while self._total > self.max_bytes and len(self._lru) > 1:
+            name, _ = next(iter(self._lru.items()))
+            self._forget(name)
+            try:
+                os.remove(self.path_of(name))
+            except OSError:
+                pass
+
+    def _forget(self, name):
+        size = self._lru.pop(name, None)
+        if size is not None:
+            self._total -= size
+
+    def discard(self, filename):
+        """Drop every cached thumbnail of `filename` (e.g. after it was deleted)"""
+        prefix = self.key(filename, 0).split('_')[0] + '_'
+        with self._lock:
+            names = [name for name in self._lru if name.startswith(prefix)]
+            for name in names:
+                self._forget(name)
+        for name in names:
+            try:
+                os.remove(self.path_of(name))
+            except OSError:
+                pass
+
+
+def thumbnail_data_url(path):
+    """Inline a thumbnail for the web UI"""
+    with open(path, 'rb') as f:
+        return "data:image/jpeg;base64," + base64.b64encode(f.read()).decode('ascii')
@@ -1,23 +1,55 @@
 import os
 import datetime
 from PIL import ImageGrab
-import psutil
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
 
-try:
-    import win32gui
-    import win32ui
-    import win32con
-    import win32process
-    WIN32_AVAILABLE = True
-except ImportError:
-    WIN32_AVAILABLE = False
-    print("Warning: pywin32 not available. Screenshot capture will not work.")
+from capture_backend import default_capture_backend
+from screenshot_encoder import Frame, ScreenshotEncoder, resolve_preset, DEFAULT_PRESET, PARTIAL_DIR
+from replay_recorder import ReplayRecorder
+from screenshot_gallery import GalleryIndex, ThumbnailCache, DEFAULT_CACHE_MB
 
-class ScreenshotService:
-    def __init__(self, settings_manager=None):
+class ScreenshotService(QObject):
+    # Signals (the image file is encoded in the background)
+    screenshotSaved = pyqtSignal(int, str)   # job_id, path
+    screenshotFailed = pyqtSignal(int, str)  # job_id, error
+    replaySaved = pyqtSignal(int, str)       # job_id, path
+    replayFailed = pyqtSignal(int, str)      # job_id, error
+    thumbnailReady = pyqtSignal(str, str)    # screenshot filename, thumbnail path
+    
+    def __init__(self, settings_manager=None, capture_backend=None):
+        super().__init__()
         self.settings = settings_manager
+        
+        # Window lookup and pixel grabs (GDI on Windows, MIT-SHM on X11)
+        self.capture_backend = capture_backend or default_capture_backend()
+        if self.capture_backend is None:
+            print("Warning: No capture backend available. Window screenshots will not work.")
+        
         self.screenshots_dir = self._get_screenshots_dir()
         
+        # Persistent gallery index and thumbnail cache (kept outside the
+        # screenshots folder so they don't change its mtime)
+        cache_dir = os.path.join(os.path.dirname(self.screenshots_dir), "cache")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.gallery = GalleryIndex(self.screenshots_dir, os.path.join(cache_dir, "gallery_index.json"))
+        cache_mb = self.settings.get("thumbnail_cache_mb", DEFAULT_CACHE_MB) if self.settings else DEFAULT_CACHE_MB
+        self.thumbnails = ThumbnailCache(os.path.join(cache_dir, "thumbnails"), int(cache_mb) * 1024 * 1024)
+        self.thumbnails.thumbnailReady.connect(self.thumbnailReady.emit)
+        
+        # Capture is fast and stays on the caller's thread; encoding runs on a pool
+        self.encoder = ScreenshotEncoder()
+        self.encoder.frameSaved.connect(self._on_frame_saved)
+        self.encoder.frameFailed.connect(self._on_frame_failed)
+        
+        # Low-rate continuous capture for instant replays
+        self._recording_hwnd = None
+        self.replay = ReplayRecorder(
+            settings_manager, self._grab_game_frame, os.path.join(self.screenshots_dir, "replays"),
+            release=self.capture_backend.release if self.capture_backend else None
+        )
+        self.replay.replaySaved.connect(self.replaySaved.emit)
+        self.replay.replayFailed.connect(self.replayFailed.emit)
+        
     def _get_screenshots_dir(self):
         """Get or create screenshots directory"""
         # Get project root
@@ -25,145 +57,151 @@ class ScreenshotService:
         project_root = os.path.dirname(current_dir)
         screenshots_dir = os.path.join(project_root, "screenshots")
         
-        # Create directory if it doesn't exist
-        if not os.path.exists(screenshots_dir):
-            os.makedirs(screenshots_dir)
+        # Create directory if it doesn't exist (and the encoder's temp folder,
+        # now rather than on the first save, which would look like an outside change)
+        os.makedirs(os.path.join(screenshots_dir, PARTIAL_DIR), exist_ok=True)
             
         return screenshots_dir
     
     def capture_active_window(self):
         """
-        Capture the active game window (main.exe) to a PNG file
+        Capture the active game window (main.exe) and save it in the background
+        with the player's encoder preset
         
         Returns:
-            str: Path to the saved screenshot file, or None on error
+            int: Encoder job id (screenshotSaved/screenshotFailed follow), or None on error
         """
-        if not WIN32_AVAILABLE:
-            print("Error: pywin32 not available for screenshot capture")
+        if self.capture_backend is None:
+            print("Error: No capture backend available for screenshot capture")
             return None
         
-        # Get game executable name from settings
-        game_exe = "main.exe"
-        if self.settings:
-            game_exe = os.path.basename(self.settings.get("game_executable", "main.exe"))
-        
         # Find the game window
-        hwnd = self._find_window_by_process_name(game_exe)
+        game_exe = self._game_executable()
+        hwnd = self.capture_backend.find_window(game_exe)
         
         if not hwnd:
             print(f"Error: Could not find window for {game_exe}")
             return None
         
+        frame = self._grab_window(hwnd)
+        if frame is None:
+            return None
+        # The grab is a view of the backend's buffer; the encoder needs its own copy
+        return self._submit(frame.copy(), "screenshot")
+    
+    def _game_executable(self):
+        if self.settings:
+            return os.path.basename(self.settings.get("game_executable", "main.exe"))
+        return "main.exe"
+    
+    def _grab_window(self, hwnd, bring_to_front=True):
+        """
+        Capture `hwnd` through the capture backend (no conversion, no encoding)
+        
+        Returns:
+            Frame: View of the backend's buffer, valid until this thread's next grab, or None on error
+        """
         try:
-            # Get window dimensions
-            left, top, right, bottom = win32gui.GetWindowRect(hwnd)
-            width = right - left
-            height = bottom - top
-            
-            # Bring window to front (optional)
-            win32gui.SetForegroundWindow(hwnd)
-            
-            # Capture the window
-            hwndDC = win32gui.GetWindowDC(hwnd)
-            mfcDC = win32ui.CreateDCFromHandle(hwndDC)
-            saveDC = mfcDC.CreateCompatibleDC()
-            
-            saveBitMap = win32ui.CreateBitmap()
-            saveBitMap.CreateCompatibleBitmap(mfcDC, width, height)
-            saveDC.SelectObject(saveBitMap)
-            
-            # Copy the window content
-            saveDC.BitBlt((0, 0), (width, height), mfcDC, (0, 0), win32con.SRCCOPY)
-            
-            # Convert to PIL Image
-            bmpinfo = saveBitMap.GetInfo()
-            bmpstr = saveBitMap.GetBitmapBits(True)
-            
-            from PIL import Image
-            img = Image.frombuffer(
-                'RGB',
-                (bmpinfo['bmWidth'], bmpinfo['bmHeight']),
-                bmpstr, 'raw', 'BGRX', 0, 1
-            )
-            
-            # Generate filename with timestamp
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"screenshot_{timestamp}.png"
-            filepath = os.path.join(self.screenshots_dir, filename)
-            
-            # Save the image
-            img.save(filepath, 'PNG')
-            
-            # Cleanup
-            win32gui.DeleteObject(saveBitMap.GetHandle())
-            saveDC.DeleteDC()
-            mfcDC.DeleteDC()
-            win32gui.ReleaseDC(hwnd, hwndDC)
-            
-            print(f"Screenshot saved: {filepath}")
-            return filepath
-            
+            if bring_to_front:
+                self.capture_backend.activate(hwnd)
+            return self.capture_backend.grab(hwnd)
         except Exception as e:
             print(f"Error capturing screenshot: {e}")
             return None
     
+    def _grab_game_frame(self):
+        """Recorder callback (worker thread): grab the game window without activating it"""
+        hwnd = self._recording_hwnd
+        if not hwnd or not self.capture_backend.is_window(hwnd):
+            hwnd = self.capture_backend.find_window(self._game_executable())
+            self._recording_hwnd = hwnd
+        if not hwnd:
+            return None
+        return self._grab_window(hwnd, bring_to_front=False)
+    
+    def start_recording(self):
+        """
+        Start continuous low-rate capture of the game window
+        
+        Returns:
+            bool: True if recording started
+        """
+        if self.capture_backend is None:
+            print("Error: No capture backend available for replay recording")
+            return False
+        return self.replay.start()
+    
+    def stop_recording(self):
+        """Stop continuous capture and free the replay buffer"""
+        self.replay.stop()
+        self._recording_hwnd = None
+    
+    def save_replay(self, seconds=None):
+        """
+        Export the buffered replay in the background
+        
+        Args:
+            seconds (float): Only the last `seconds` (default: whole buffer)
+            
+        Returns:
+            int: Job id (replaySaved/replayFailed follow), or None if nothing is buffered
+        """
+        return self.replay.export(seconds)
+    
+    def replay_stats(self):
+        return self.replay.stats()
+    
+    def _submit(self, frame, prefix):
+        """Queue `frame` for encoding with the player's preset"""
+        name = self.settings.get("screenshot_preset", DEFAULT_PRESET) if self.settings else DEFAULT_PRESET
+        _, fmt, extension, params = resolve_preset(name)
+        return self.encoder.submit(frame, self._new_path(prefix, extension), fmt, **params)
+    
+    def _new_path(self, prefix, extension="png"):
+        """Timestamped path that isn't taken on disk or by a queued encode"""
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        reserved = self.encoder.pending_paths()
+        filepath = os.path.join(self.screenshots_dir, f"{prefix}_{timestamp}.{extension}")
+        counter = 1
+        while filepath in reserved or os.path.exists(filepath):
+            filepath = os.path.join(self.screenshots_dir, f"{prefix}_{timestamp}_{counter}.{extension}")
+            counter += 1
+        return filepath
+    
     def capture(self):
         """Alias for capture_active_window for backward compatibility"""
         return self.capture_active_window()
     
     def capture_fullscreen(self):
         """
-        Capture the entire screen
+        Capture the entire screen and save it in the background
         
         Returns:
-            str: Path to the saved screenshot file
+            int: Encoder job id, or None on error
         """
         try:
             # Capture entire screen using PIL
             img = ImageGrab.grab()
-            
-            # Generate filename with timestamp
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"fullscreen_{timestamp}.png"
-            filepath = os.path.join(self.screenshots_dir, filename)
-            
-            # Save the image
-            img.save(filepath, 'PNG')
-            
-            print(f"Fullscreen screenshot saved: {filepath}")
-            return filepath
+            return self._submit(Frame.from_image(img), "fullscreen")
             
         except Exception as e:
             print(f"Error capturing fullscreen: {e}")
             return None
     
-    def _find_window_by_process_name(self, process_name):
-        """
-        Find a window handle by process name
-        
-        Args:
-            process_name (str): Name of the process (e.g., "main.exe")
-            
-        Returns:
-            int: Window handle (HWND) or None
-        """
-        if not WIN32_AVAILABLE:
-            return None
-        
-        def enum_windows_callback(hwnd, result):
-            if win32gui.IsWindowVisible(hwnd):
-                _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                try:
-                    proc = psutil.Process(pid)
-                    if proc.name() == process_name:
-                        result.append(hwnd)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-            return True
-        
-        windows = []
-        win32gui.EnumWindows(enum_windows_callback, windows)
-        return windows[0] if windows else None
+    @pyqtSlot(int, str, object)
+    def _on_frame_saved(self, job_id, path, dir_mtimes):
+        """Encoder finished (queued to this thread): index the file, then announce it"""
+        # Our rename is the only change to the folder if it was current right before it
+        before, after = dir_mtimes
+        self.gallery.add(path, self.gallery.is_current(before), after)
+        entry = self.gallery.get(os.path.basename(path))
+        if entry:
+            self.thumbnails.request(path, entry.mtime)
+        self.screenshotSaved.emit(job_id, path)
+    
+    @pyqtSlot(int, str)
+    def _on_frame_failed(self, job_id, error):
+        self.screenshotFailed.emit(job_id, error)
     
     def get_screenshots(self, limit=10):
         """
@@ -175,26 +213,33 @@ class ScreenshotService:
         Returns:
             list: List of screenshot file paths
         """
-        try:
-            files = []
-            for filename in os.listdir(self.screenshots_dir):
-                if filename.endswith('.png'):
-                    filepath = os.path.join(self.screenshots_dir, filename)
-                    files.append({
-                        'path': filepath,
-                        'filename': filename,
-                        'timestamp': os.path.getmtime(filepath)
-                    })
-            
-            # Sort by timestamp (newest first)
-            files.sort(key=lambda x: x['timestamp'], reverse=True)
-            
-            # Return only the paths, limited
-            return [f['path'] for f in files[:limit]]
-            
-        except Exception as e:
-            print(f"Error getting screenshots: {e}")
-            return []
+        self.gallery.reconcile()
+        return [os.path.join(self.screenshots_dir, e.filename) for e in self.gallery.page(0, limit)]
+    
+    def get_screenshot_page(self, offset=0, limit=24):
+        """
+        One page of the gallery, newest first. Thumbnails that aren't cached
+        yet are generated in the background and announced via thumbnailReady.
+        
+        Returns:
+            dict: {total, offset, items: [{filename, path, timestamp, size, thumbnail}]}
+                where thumbnail is the cached thumbnail path or None
+        """
+        self.gallery.reconcile()
+        items = []
+        for entry in self.gallery.page(offset, limit):
+            path = os.path.join(self.screenshots_dir, entry.filename)
+            thumbnail = self.thumbnails.get(entry.filename, entry.mtime)
+            if thumbnail is None:
+                self.thumbnails.request(path, entry.mtime)
+            items.append({
+                'filename': entry.filename,
+                'path': path,
+                'timestamp': entry.mtime,
+                'size': entry.size,
+                'thumbnail': thumbnail
+            })
+        return {'total': self.gallery.count(), 'offset': offset, 'items': items}
     
     def delete_screenshot(self, filepath):
         """
@@ -208,11 +253,13 @@ class ScreenshotService:
         """
         try:
             if os.path.exists(filepath):
+                index_current = self.gallery.is_current()
                 os.remove(filepath)
+                self.gallery.remove(filepath, index_current)
+                self.thumbnails.discard(os.path.basename(filepath))
                 print(f"Screenshot deleted: {filepath}")
                 return True
             return False
         except Exception as e:
             print(f"Error deleting screenshot: {e}")
             return False
-
@@ -0,0 +1,297 @@
+# session_service.py
+#
+# The player's session, kept in memory and mirrored to session.json.
+#
+# Readers (getSession, pages checking `logged` / `is_admin`) get the cached
+# session without touching the disk; a file watcher re-reads session.json
+# when someone else changes it. Logging in talks to the API's login.php over
+# one pooled keep-alive connection. The access token it returns is cached
+# with the session and refreshed ahead of its expiry, so the player never
+# sees an expired session while the launcher is running. session.json holds
+# the tokens, so it is not tracked by git and is written owner-readable only.
+# Until the first login writes it, the tracked session.example.json next to
+# it (a token-less dev fixture) is used instead.
+#
+# login(), refresh() and logout() block on the network; call them from a
+# worker (the bridge runs them as jobs). The service itself lives on the
+# GUI thread.
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal, pyqtSlot
+
+DEFAULT_API_URL = "http://localhost/CustomLauncher/api/"
+REQUEST_TIMEOUT = 10
+# Refresh this long before the token expires: a fifth of its lifetime, at least
+REFRESH_AHEAD_MIN_S = 30
+REFRESH_AHEAD_FRACTION = 0.2
+RETRY_DELAY_S = 30  # After a refresh failed because the API was unreachable
+RELOAD_DELAY_MS = 200
+EXAMPLE_FILE = "session.example.json"  # Dev fixture used while session.json doesn't exist
+
+
+def logged_out():
+    """Session of a player who isn't logged in"""
+    return {"logged": False, "username": "", "is_admin": False}
+
+
+class SessionService(QObject):
+    """
+    Cached session with file watching, login and token refresh.
+
+    Args:
+        settings_manager: Source of `api_url` (read on every request)
+        session_path: Defaults to session.json next to this module
+    """
+
+    # Signals
+    sessionChanged = pyqtSignal(str)  # JSON {logged, username, is_admin} (any thread)
+    _tokenChanged = pyqtSignal()      # Reschedules the refresh on the GUI thread
+
+    def __init__(self, settings_manager=None, session_path=None):
+        super().__init__()
+        self.settings = settings_manager
+        self.session_path = session_path or os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "session.json"
+        )
+        self._lock = threading.Lock()       # Guards _session
+        self._http_lock = threading.Lock()  # One login/refresh at a time
+        self._written_stat = None
+        self._refresh_failed = False
+        self._http = requests.Session()
+        self._http.headers["User-Agent"] = "MULauncher/1.0"
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session")
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self._refresh_in_background)
+        self._tokenChanged.connect(self._schedule_refresh)
+        self._session = self._read()
+        self._watch()
+        self._schedule_refresh()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def session(self):
+        """
+        Returns:
+            dict: {logged, username, is_admin}, without the tokens
+        """
+        with self._lock:
+            session = self._session
+        return {key: session.get(key, default) for key, default in logged_out().items()}
+
+    def token(self):
+        """Access token for API calls, or None when logged out or expired"""
+        with self._lock:
+            session = self._session
+        if session.get("token") and session.get("expires_at", 0) > time.time():
+            return session["token"]
+        return None
+
+    # ------------------------------------------------------------------
+    # Login
+    # ------------------------------------------------------------------
+
+    def login(self, username, password):
+        """
+        Log in against login.php (blocking).
+
+        Returns:
+            dict: {success, session} or {success: false, message}
+        """
+        try:
+            data = self._post({"username": username, "password": password})
+        except requests.RequestException as e:
+            print(f"[Session] Login failed: {e}")
+            return {"success": False, "message": f"Login server unreachable: {e}"}
+        if not data.get("success"):
+            return {"success": False, "message": data.get("message") or "Login failed"}
+        self._publish(self._from_response(data))
+        print(f"[Session] Logged in as {self.session()['username']}")
+        return {"success": True, "session": self.session()}
+
+    def refresh(self):
+        """
+        Exchange the refresh token for a new access token (blocking).
+
+        Returns:
+            bool: True if the session is (still) valid
+        """
+        with self._lock:
+            refresh_token = self._session.get("refresh_token")
+        if not refresh_token:
+            return False
+        try:
+            data = self._post({"action": "refresh", "refresh_token": refresh_token})
+        except requests.RequestException as e:
+            print(f"[Session] Token refresh failed, retrying in {RETRY_DELAY_S}s: {e}")
+            self._refresh_failed = True
+            self._tokenChanged.emit()
+            return False
+        # A login, logout or reload while the request was out wins over its answer
+        if not data.get("success"):
+            if self._publish(logged_out(), replaces=refresh_token):
+                print(f"[Session] Refresh rejected ({data.get('message')}), logging out")
+            return False
+        if not self._publish(self._from_response(data), replaces=refresh_token):
+            print("[Session] Session changed during the refresh, discarding the response")
+            return False
+        return True
+
+    def logout(self):
+        self._publish(logged_out())
+        print("[Session] Logged out")
+
+    def shutdown(self):
+        self._refresh_timer.stop()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._http.close()
+
+    def _post(self, form):
+        api_url = self.settings.get("api_url", DEFAULT_API_URL) if self.settings else DEFAULT_API_URL
+        with self._http_lock:
+            response = self._http.post(api_url + "login.php", data=form, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        try:
+            return response.json()
+        except ValueError:
+            raise requests.RequestException("login.php returned invalid JSON")
+
+    def _from_response(self, data):
+        account = data.get("session") or {}
+        session = {
+            "logged": True,
+            "username": account.get("username", ""),
+            "is_admin": bool(account.get("is_admin", False)),
+        }
+        if data.get("token"):
+            session["token"] = data["token"]
+            session["refresh_token"] = data.get("refresh_token")
+            session["expires_at"] = time.time() + float(data.get("expires_in", 3600))
+        return session
+
+    # ------------------------------------------------------------------
+    # Refresh-ahead
+    # ------------------------------------------------------------------
+
+    @pyqtSlot()
+    def _schedule_refresh(self):
+        with self._lock:
+            session = self._session
+        self._refresh_timer.stop()
+        if not session.get("refresh_token") or not session.get("expires_at"):
+            return
+        remaining = session["expires_at"] - time.time()
+        lifetime = session.get("lifetime", remaining)
+        ahead = max(REFRESH_AHEAD_MIN_S, lifetime * REFRESH_AHEAD_FRACTION)
+        delay = remaining - ahead
+        if self._refresh_failed:
+            delay = max(delay, RETRY_DELAY_S)
+        self._refresh_timer.start(int(max(0, delay) * 1000))
+
+    def _refresh_in_background(self):
+        self._pool.submit(self.refresh)
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _publish(self, session, write=True, replaces=None):
+        """
+        Replace the cached session; notify if the public part changed.
+
+        Args:
+            replaces: Only replace a session holding this refresh token
+
+        Returns:
+            bool: False if `replaces` no longer matched and nothing changed
+        """
+        if session.get("expires_at"):
+            session["lifetime"] = session["expires_at"] - time.time()
+        with self._lock:
+            if replaces is not None and self._session.get("refresh_token") != replaces:
+                return False
+            previous, self._session = self._session, session
+        self._refresh_failed = False
+        if write:
+            try:
+                self._write(session)
+            except OSError as e:
+                print(f"[Session] Error saving session: {e}")
+        if session.get("expires_at") != previous.get("expires_at"):
+            self._tokenChanged.emit()
+        public = self.session()
+        if public != {key: previous.get(key, default) for key, default in logged_out().items()}:
+            self.sessionChanged.emit(json.dumps(public))
+        return True
+
+    def _read(self):
+        path = self.session_path
+        if not os.path.exists(path):
+            path = os.path.join(os.path.dirname(self.session_path), EXAMPLE_FILE)
+        try:
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    session = json.load(f)
+                if isinstance(session, dict):
+                    if path != self.session_path:
+                        # Fixture: public fields only, never tokens
+                        session = {key: session.get(key, default) for key, default in logged_out().items()}
+                    return session
+        except (OSError, ValueError) as e:
+            print(f"[Session] Error loading session: {e}")
+        return logged_out()
+
+    def _write(self, session):
+        stored = {key: value for key, value in session.items() if key != "lifetime"}
+        partial = self.session_path + ".tmp"
+        # Holds the tokens: readable by the player only (POSIX; NTFS ignores the mode)
+        fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(stored, f, indent=4)
+        os.replace(partial, self.session_path)
+        self._written_stat = self._loaded_stat = self._stat()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.session_path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _watch(self):
+        # Watch the folder too: a replaced file drops the watch on the old one
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.addPath(os.path.dirname(self.session_path))
+        if os.path.exists(self.session_path):
+            self._watcher.addPath(self.session_path)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._on_file_changed)
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(RELOAD_DELAY_MS)
+        self._reload_timer.timeout.connect(self._reload_if_changed)
+        self._loaded_stat = self._stat()
+
+    def _on_file_changed(self, path):
+        self._reload_timer.start()
+
+    def _reload_if_changed(self):
+        if os.path.exists(self.session_path) and self.session_path not in self._watcher.files():
+            self._watcher.addPath(self.session_path)
+        stat = self._stat()
+        if stat == self._loaded_stat or stat == self._written_stat:
+            return  # Unrelated file in the folder, or our own write
+        self._loaded_stat = stat
+        print("[Session] session.json changed on disk, reloading")
+        self._publish(self._read(), write=False)
@@ -1,42 +1,77 @@
+import atexit
 import json
 import os
 import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
 
-class SettingsManager:
-    def __init__(self):
-        self.config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.json")
-        self.settings = self.load()
+from settings_model import SettingsSnapshot, default_values, normalize
+
+# Changes are written this long after the last one, so a burst of set()
+# calls (e.g. the settings modal saving field by field) costs one write
+FLUSH_DELAY = 0.5
+# Editors often save in several steps; reload once they are done
+RELOAD_DELAY_MS = 200
+
+class SettingsManager(QObject):
+    """
+    Settings of the launcher, kept in memory and persisted to config.json.
+    
+    Readers on any thread use `snapshot`, an immutable SettingsSnapshot that
+    is replaced (never modified) whenever a setting changes, e.g.
+    `settings_manager.snapshot.max_clients`. Changes made to config.json by
+    anyone else are picked up by a file watcher.
+    """
+    
+    # Signals
+    settingsChanged = pyqtSignal()   # A new snapshot was published (any thread)
+    settingsReloaded = pyqtSignal()  # config.json was changed on disk and re-read
+    
+    def __init__(self, flush_delay=FLUSH_DELAY, config_path=None):
+        super().__init__()
+        self.config_path = config_path or os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.json"
+        )
+        self.flush_delay = flush_delay
+        self._lock = threading.RLock()        # Guards _values and the dirty state
+        self._write_lock = threading.Lock()   # Serializes writers of config.json
+        self._dirty = False
+        self._dirty_keys = set()
+        self._batch_depth = 0
+        self._timer = None
+        self._due = 0.0
+        self._written_stat = None             # (mtime_ns, size) of our last write
+        self.writes = 0
+        self.reloads = 0
+        self._values = self.load()
+        self.snapshot = SettingsSnapshot(self._values)
+        self._watch()
+        # Whatever is still pending when the process exits is written then
+        atexit.register(self.flush)
+    
+    @property
+    def settings(self):
+        """Read-only mapping of the current settings"""
+        return self.snapshot.values
     
     def get_default_settings(self):
         """Return default settings structure"""
-        return {
-            "language": "en",
-            "resolution": "1366x768",
-            "muteInactiveTabs": False,
-            "embedGameWindow": False,
-            "processLimit": 3,
-            "max_clients": 3,
-            "game_executable": "main.exe",
-            "window_mode": True,
-            "sound": True,
-            "music": True,
-            "server_name": "MU Online Custom Server",
-            "version": "1.0.0",
-            "update_url": "http://localhost/update/",
-            "api_url": "http://localhost/CustomLauncher/api/",
-            "kill_unmanaged_clients": False
-        }
+        return default_values()
 
     def load(self):
-        """Load settings from config.json"""
+        """
+        Read and normalize config.json (pending changes are written first).
+        The in-memory settings are not affected; readers should use `snapshot`.
+        """
+        self.flush()
         if os.path.exists(self.config_path):
             try:
                 with open(self.config_path, 'r') as f:
                     loaded = json.load(f)
-                    # Merge with defaults to ensure all keys exist
-                    defaults = self.get_default_settings()
-                    defaults.update(loaded)
-                    return defaults
+                # Merge with defaults to ensure all keys exist
+                return normalize(loaded)
             except Exception as e:
                 print(f"Error loading settings: {e}")
                 return self.get_default_settings()
@@ -47,28 +82,209 @@ class SettingsManager:
         return self.load()
 
     def save(self, settings):
-        """Save settings to config.json"""
-        self.settings.update(settings)
-        try:
-            with open(self.config_path, 'w') as f:
-                json.dump(self.settings, f, indent=4)
-            return True
-        except Exception as e:
-            print(f"Error saving settings: {e}")
-            return False
+        """
+        Merge `settings` and schedule a write of config.json
+        
+        Returns:
+            bool: True (the write itself happens in the background; see flush())
+        """
+        with self._lock:
+            changed = self._apply(settings)
+        if changed:
+            self.settingsChanged.emit()
+        return True
 
     def save_settings(self, settings):
         """Alias for save() for backward compatibility"""
         return self.save(settings)
 
     def get(self, key, default=None):
-        """Get a specific setting value"""
-        return self.settings.get(key, default)
+        """Get a specific setting value (lock-free, from the current snapshot)"""
+        return self.snapshot.values.get(key, default)
 
     def set(self, key, value):
-        """Set a specific setting value"""
-        self.settings[key] = value
-        return self.save(self.settings)
+        """Set a specific setting value (written in the background)"""
+        with self._lock:
+            changed = self._apply({key: value})
+        if changed:
+            self.settingsChanged.emit()
+        return True
+
+    def _apply(self, changes):
+        """
+        Publish a new snapshot with `changes` merged in; caller holds _lock
+        
+        Returns:
+            bool: True if anything changed
+        """
+        values = normalize(changes, self._values)
+        changed = {key for key in values if key not in self._values or values[key] != self._values[key]}
+        if not changed:
+            return False
+        self._values = values
+        self.snapshot = SettingsSnapshot(values, self.snapshot.version + 1)
+        self._dirty_keys |= changed
+        self._mark_dirty()
+        return True
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several changes into one write, e.g.:
+        
+            with settings_manager.transaction():
+                settings_manager.set("resolution", "1920x1080")
+                settings_manager.set("window_mode", True)
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._dirty:
+                    self._schedule_flush()
+
+    def _mark_dirty(self):
+        self._dirty = True
+        if self._batch_depth == 0:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        # Debounce: every change pushes the deadline back; one timer thread
+        # is reused for the whole burst instead of restarting it per change
+        self._due = time.monotonic() + self.flush_delay
+        if self._timer is None:
+            self._start_timer(self.flush_delay)
+
+    def _start_timer(self, delay):
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            if self._batch_depth > 0:
+                return  # The transaction schedules the write when it ends
+            remaining = self._due - time.monotonic()
+            if remaining > 0:
+                self._start_timer(remaining)
+                return
+        self.flush()
+
+    def is_dirty(self):
+        with self._lock:
+            return self._dirty
+
+    def flush(self):
+        """
+        Write pending changes to config.json now (no-op if nothing changed)
+        
+        The file is replaced atomically: the settings are written to a temp
+        file, fsync'ed and renamed over config.json, so a crash leaves either
+        the old or the new file, never a truncated one.
+        
+        Returns:
+            bool: Success status
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return True
+                data = json.dumps(self._values, indent=4)
+                dirty_keys, self._dirty_keys = self._dirty_keys, set()
+                self._dirty = False
+            try:
+                self._write_atomic(data)
+            except Exception as e:
+                print(f"Error saving settings: {e}")
+                with self._lock:
+                    self._dirty = True
+                    self._dirty_keys |= dirty_keys
+                return False
+            self._written_stat = self._stat()
+            self.writes += 1
+            return True
+
+    # ------------------------------------------------------------------
+    # File watching
+    # ------------------------------------------------------------------
+
+    def _stat(self):
+        try:
+            st = os.stat(self.config_path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _watch(self):
+        # The folder is watched too: an atomic save replaces the file, after
+        # which a watch on the old file no longer fires
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.addPath(os.path.dirname(self.config_path))
+        if os.path.exists(self.config_path):
+            self._watcher.addPath(self.config_path)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._on_file_changed)
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(RELOAD_DELAY_MS)
+        self._reload_timer.timeout.connect(self._reload_if_changed)
+
+    def _on_file_changed(self, path):
+        self._reload_timer.start()
+
+    def _reload_if_changed(self):
+        if os.path.exists(self.config_path) and self.config_path not in self._watcher.files():
+            self._watcher.addPath(self.config_path)
+        stat = self._stat()
+        if stat is None or stat == self._written_stat:
+            return  # Deleted, or our own write
+        try:
+            with open(self.config_path, 'r') as f:
+                loaded = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[Settings] Ignoring unreadable config.json: {e}")
+            return
+        with self._lock:
+            values = normalize(loaded)
+            # Local changes that aren't written yet win over the file
+            for key in self._dirty_keys:
+                values[key] = self._values[key]
+            self._written_stat = stat
+            if values == self._values:
+                return
+            self._values = values
+            self.snapshot = SettingsSnapshot(values, self.snapshot.version + 1)
+            self.reloads += 1
+        print("[Settings] Reloaded config.json (changed on disk)")
+        self.settingsChanged.emit()
+        self.settingsReloaded.emit()
+
+    def _write_atomic(self, data):
+        partial = self.config_path + ".tmp"
+        try:
+            with open(partial, 'w') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(partial, self.config_path)
+        except Exception:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        if hasattr(os, "O_DIRECTORY"):
+            # Make the rename itself durable (POSIX only)
+            fd = os.open(os.path.dirname(self.config_path), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
 
     def generate_reg(self, width, height):
         """
@@ -0,0 +1,136 @@
+# settings_model.py
+#
+# Typed schema of the launcher settings.
+#
+# config.json is normalized once, when it is loaded or changed: values are
+# coerced to their declared type and aliased keys (processLimit/max_clients,
+# embedGameWindow/embed_game_window) are resolved to one value that is
+# mirrored under every name. The result is published as an immutable
+# SettingsSnapshot, so any thread can read it without locking and call
+# sites never resolve aliases by hand.
+
+from types import MappingProxyType
+
+
+class Field:
+    """
+    One typed setting.
+
+    Args:
+        name: Attribute name on SettingsSnapshot
+        type: bool, int, float or str
+        default: Value used when the key is missing or invalid
+        keys: config.json keys, in priority order (first = the one the UI writes)
+        minimum: Smallest accepted value of an int or float field (smaller ones are raised to it)
+    """
+
+    def __init__(self, name, type, default, keys=None, minimum=None):
+        self.name = name
+        self.type = type
+        self.default = default
+        self.keys = tuple(keys or (name,))
+        self.minimum = minimum
+
+    def coerce(self, value):
+        """
+        Returns:
+            The value as `type`, or the default if it can't be converted
+        """
+        try:
+            if self.type is bool:
+                if isinstance(value, str):
+                    lowered = value.strip().lower()
+                    if lowered in ("true", "1", "yes", "on"):
+                        return True
+                    if lowered in ("false", "0", "no", "off", ""):
+                        return False
+                    raise ValueError(value)
+                return bool(value)
+            if self.type is int and isinstance(value, str):
+                value = int(float(value))
+            value = self.type(value)
+            if self.minimum is not None and value < self.minimum:
+                print(f"[Settings] {self.keys[0]} below minimum: {value!r}, using {self.minimum!r}")
+                return self.minimum
+            return value
+        except (TypeError, ValueError, OverflowError):
+            print(f"[Settings] Invalid value for {self.keys[0]}: {value!r}, using {self.default!r}")
+            return self.default
+
+
+SCHEMA = (
+    Field("language", str, "en"),
+    Field("resolution", str, "1366x768"),
+    Field("mute_inactive_tabs", bool, False, keys=("muteInactiveTabs",)),
+    Field("embed_game_window", bool, False, keys=("embedGameWindow", "embed_game_window")),
+    Field("max_clients", int, 3, keys=("processLimit", "max_clients")),
+    Field("game_executable", str, "main.exe"),
+    Field("window_mode", bool, True),
+    Field("sound", bool, True),
+    Field("music", bool, True),
+    Field("server_name", str, "MU Online Custom Server"),
+    Field("version", str, "1.0.0"),
+    Field("update_url", str, "http://localhost/update/"),
+    Field("api_url", str, "http://localhost/CustomLauncher/api/"),
+    Field("kill_unmanaged_clients", bool, False),
+    Field("resource_sample_interval_ms", int, 1000, minimum=50),
+    Field("resource_history_size", int, 300, minimum=1),
+)
+
+FIELDS_BY_KEY = {key: field for field in SCHEMA for key in field.keys}
+
+
+def default_values():
+    """config.json contents of a fresh install"""
+    values = {}
+    for field in SCHEMA:
+        for key in field.keys:
+            values[key] = field.default
+    return values
+
+
+def normalize(raw, base=None):
+    """
+    Merge `raw` over `base` (default: the defaults) and resolve the schema.
+
+    When `raw` holds several keys of one field, the first in the field's
+    priority order wins; a key that `raw` doesn't mention keeps the value
+    from `base`. The winning value is written to every key of the field.
+
+    Returns:
+        dict: New normalized values (`raw` and `base` are not modified)
+    """
+    values = dict(default_values() if base is None else base)
+    values.update(raw)
+    for field in SCHEMA:
+        given = [key for key in field.keys if key in raw]
+        source = given[0] if given else field.keys[0]
+        value = field.coerce(values.get(source, field.default))
+        for key in field.keys:
+            values[key] = value
+    return values
+
+
+class SettingsSnapshot:
+    """
+    Immutable settings at one point in time.
+
+    Schema fields are plain attributes (`snapshot.max_clients`); any other
+    key is read with get(). Writers never modify a published snapshot, they
+    publish a new one.
+    """
+
+    def __init__(self, values, version=0):
+        attributes = {field.name: values[field.keys[0]] for field in SCHEMA}
+        attributes["values"] = MappingProxyType(values)
+        attributes["version"] = version
+        self.__dict__.update(attributes)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SettingsSnapshot is immutable")
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def to_dict(self):
+        return dict(self.values)
@@ -0,0 +1,155 @@
+# state_store.py
+#
+# Central, versioned launcher state pushed to the web UI.
+#
+# Sections (settings, session, clients, update, events) are replaced as a
+# whole by their owners; the store diffs the new value against the old one
+# and queues JSON-patch style operations. All changes made during one turn
+# of the event loop go out as a single stateChanged delta with a new,
+# monotonically increasing version, so the UI applies them together and
+# never sees a half-updated state. A UI that missed deltas (or just
+# started) resyncs with since(version): the missing deltas if they are
+# still in the history, otherwise a full snapshot.
+#
+# The store lives on the GUI thread; feed it from signals, not threads.
+
+import json
+from collections import deque
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+DEFAULT_HISTORY = 256  # Deltas kept for since()
+
+
+def _escape(key):
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def diff(old, new, path=""):
+    """
+    JSON-patch operations turning `old` into `new`.
+
+    Dicts are compared key by key and lists of equal length item by item;
+    anything else that differs is replaced as a whole.
+
+    Returns:
+        list[dict]: {"op": "add"|"remove"|"replace", "path", ["value"]}
+    """
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff(old[key], value, child))
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for index, (a, b) in enumerate(zip(old, new)):
+            ops.extend(diff(a, b, f"{path}/{index}"))
+        return ops
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+class StateStore(QObject):
+    """
+    Versioned state tree with delta notifications.
+
+    Args:
+        history: Number of deltas kept so since() can avoid a full resync
+    """
+
+    # Signals
+    stateChanged = pyqtSignal(str)  # JSON {from, version, ops}
+
+    def __init__(self, history=DEFAULT_HISTORY):
+        super().__init__()
+        self.version = 0
+        self._state = {}
+        self._pending = []
+        self._from = 0
+        self._history = deque(maxlen=history)  # (version, ops)
+        self._flush_scheduled = False
+
+    def get(self, section, default=None):
+        return self._state.get(section, default)
+
+    def set(self, section, value):
+        """Replace a section; only the differences are sent"""
+        # Round-trip through JSON: the store keeps its own copy and rejects
+        # values the UI couldn't receive anyway
+        value = json.loads(json.dumps(value))
+        if section in self._state:
+            ops = diff(self._state[section], value, f"/{_escape(section)}")
+        else:
+            ops = [{"op": "add", "path": f"/{_escape(section)}", "value": value}]
+        if not ops:
+            return
+        self._state[section] = value
+        self._queue(ops)
+
+    def update(self, section, key, value):
+        """Set one key of a dict section"""
+        current = dict(self._state.get(section) or {})
+        current[key] = value
+        self.set(section, current)
+
+    def remove(self, section, key):
+        """Remove one key of a dict section"""
+        current = self._state.get(section)
+        if not current or key not in current:
+            return
+        current = dict(current)
+        del current[key]
+        self.set(section, current)
+
+    def _queue(self, ops):
+        if not self._pending:
+            self._from = self.version
+        self._pending.extend(ops)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(0, self.flush)
+
+    def flush(self):
+        """Publish the queued operations as one delta (normally automatic)"""
+        self._flush_scheduled = False
+        if not self._pending:
+            return
+        ops, self._pending = self._pending, []
+        self.version += 1
+        self._history.append((self.version, ops))
+        self.stateChanged.emit(json.dumps({"from": self._from, "version": self.version, "ops": ops}))
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: {version, state}
+        """
+        self.flush()
+        return {"version": self.version, "state": self._state}
+
+    def since(self, version):
+        """
+        What a client at `version` needs to catch up.
+
+        Returns:
+            dict: {version, ops} when the deltas are still in the history,
+                otherwise {version, state} (full snapshot)
+        """
+        self.flush()
+        if version == self.version:
+            return {"version": self.version, "ops": []}
+        oldest = self._history[0][0] if self._history else None
+        if 0 < version < self.version and oldest is not None and version >= oldest - 1:
+            ops = []
+            for delta_version, delta_ops in self._history:
+                if delta_version > version:
+                    ops.extend(delta_ops)
+            return {"version": self.version, "ops": ops}
+        return self.snapshot()
@@ -0,0 +1,130 @@
+# termination_manager.py
+#
+# Non-blocking, parallel shutdown of game clients.
+#
+# terminate() returns a job id immediately. A worker thread sends
+# terminate to every target at once, waits on all of them against one
+# shared deadline, kills whatever is still alive and reports each
+# result through processTerminated.
+#
+# Targets are PIDs or subprocess.Popen objects. Our own children are
+# waited on through their Popen handle so they are reaped by the same
+# object the ProcessWatcher is blocked on, keeping its exit code real.
+
+import itertools
+import json
+import subprocess
+import threading
+import time
+import psutil
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from process_snapshot import process_snapshots
+
+DEFAULT_TIMEOUT = 3.0  # Seconds before escalating to kill
+
+OUTCOME_TERMINATED = "terminated"
+OUTCOME_KILLED = "killed"
+OUTCOME_NOT_FOUND = "not_found"
+OUTCOME_FAILED = "failed"
+
+
+class TerminationManager(QObject):
+    # Signals (emitted from worker threads; queued to the GUI thread)
+    processTerminated = pyqtSignal(int, int, str)  # job_id, pid, outcome
+    jobFinished = pyqtSignal(int, str)             # job_id, JSON list of {pid, outcome}
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+        self._job_ids = itertools.count(1)
+
+    def terminate(self, targets, timeout=None):
+        """
+        Start terminating `targets` (PIDs or Popen objects) in the background.
+
+        Returns:
+            int: Job id used in processTerminated/jobFinished
+        """
+        job_id = next(self._job_ids)
+        if timeout is None:
+            timeout = self.timeout
+        threading.Thread(
+            target=self._run,
+            args=(job_id, list(targets), timeout),
+            daemon=True
+        ).start()
+        return job_id
+
+    def _run(self, job_id, targets, timeout):
+        results = {}
+        pids = []
+        children = []   # Popen objects
+        others = []     # psutil.Process objects
+
+        # Phase 1: ask everyone to exit at once
+        for target in targets:
+            pid = target.pid if isinstance(target, subprocess.Popen) else int(target)
+            pids.append(pid)
+            try:
+                if isinstance(target, subprocess.Popen):
+                    if target.poll() is not None:
+                        results[pid] = OUTCOME_NOT_FOUND
+                        continue
+                    target.terminate()
+                    children.append(target)
+                else:
+                    proc = psutil.Process(pid)
+                    proc.terminate()
+                    others.append(proc)
+            except (psutil.NoSuchProcess, ProcessLookupError):
+                results[pid] = OUTCOME_NOT_FOUND
+            except Exception as e:
+                print(f"[Termination] Failed to terminate PID {pid}: {e}")
+                results[pid] = OUTCOME_FAILED
+
+        # Phase 2: one shared deadline for all of them
+        deadline = time.monotonic() + timeout
+        _, alive = psutil.wait_procs(others, timeout=timeout)
+        for proc in others:
+            if proc not in alive:
+                results[proc.pid] = OUTCOME_TERMINATED
+
+        alive_children = []
+        for child in children:
+            try:
+                child.wait(timeout=max(0.0, deadline - time.monotonic()))
+                results[child.pid] = OUTCOME_TERMINATED
+            except subprocess.TimeoutExpired:
+                alive_children.append(child)
+
+        # Phase 3: escalate to kill
+        for target in alive + alive_children:
+            try:
+                target.kill()
+            except (psutil.NoSuchProcess, ProcessLookupError):
+                pass
+            except Exception as e:
+                print(f"[Termination] Failed to kill PID {target.pid}: {e}")
+
+        gone, still_alive = psutil.wait_procs(alive, timeout=1.0)
+        for proc in gone:
+            results[proc.pid] = OUTCOME_KILLED
+        for proc in still_alive:
+            results[proc.pid] = OUTCOME_FAILED
+        for child in alive_children:
+            try:
+                child.wait(timeout=1.0)
+                results[child.pid] = OUTCOME_KILLED
+            except subprocess.TimeoutExpired:
+                results[child.pid] = OUTCOME_FAILED
+
+        process_snapshots.invalidate()
+
+        for pid in pids:
+            outcome = results.get(pid, OUTCOME_FAILED)
+            print(f"[Termination] Job {job_id}: PID {pid} {outcome}")
+            self.processTerminated.emit(job_id, pid, outcome)
+
+        summary = [{"pid": pid, "outcome": results.get(pid, OUTCOME_FAILED)} for pid in pids]
+        self.jobFinished.emit(job_id, json.dumps(summary))
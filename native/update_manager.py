@@ -274,6 +274,10 @@ class UpdateManager(QObject):
         print(f"[UpdateManager] Update error: {error_msg}")
         self.updateError.emit(error_msg)
     
+    def is_downloading(self) -> bool:
+        """True while an update download/apply is in progress"""
+        return bool(self.update_worker and self.update_worker.isRunning())
+    
     def cancel_update(self):
         """Cancel an in-progress update"""
         if self.update_worker and self.update_worker.isRunning():
@@ -0,0 +1,286 @@
+# window_backend.py
+#
+# Pluggable windowing backends.
+#
+# Services that discover, embed or supervise game windows talk to a
+# WindowBackend instead of calling Win32 directly, so their logic can
+# run (and be benchmarked) on Linux against FakeWindowBackend.
+
+import sys
+
+# Win32 window style bits that decide whether a window is embedded
+# (mirrors window_embed, which can only be imported on Windows)
+WS_CHILD      = 0x40000000
+WS_POPUP      = 0x80000000
+WS_CAPTION    = 0x00C00000
+WS_THICKFRAME = 0x00040000
+WS_BORDER     = 0x00800000
+
+TOPLEVEL_STYLES = WS_POPUP | WS_CAPTION | WS_THICKFRAME | WS_BORDER
+EMBED_STYLE_MASK = WS_CHILD | TOPLEVEL_STYLES
+
+
+class WindowBackend:
+    """Interface implemented by every windowing backend."""
+
+    # True if watch_windows() delivers notifications (no polling needed)
+    supports_notifications = False
+
+    def find_window(self, pid):
+        """First visible, non-debugger top-level window of `pid`, or 0"""
+        raise NotImplementedError
+
+    def watch_windows(self, pid, callback):
+        """
+        Call callback(hwnd) when a window of `pid` appears.
+
+        Returns:
+            A token for unwatch_windows(), or None if unsupported
+        """
+        return None
+
+    def unwatch_windows(self, token):
+        pass
+
+    def embed(self, hwnd, host, width, height):
+        """Re-parent `hwnd` into `host` and resize it. Returns bool."""
+        raise NotImplementedError
+
+    def move_window(self, hwnd, x, y, width, height):
+        """Move/resize `hwnd` within its parent without activating it. Returns bool."""
+        raise NotImplementedError
+
+    def is_window(self, hwnd):
+        raise NotImplementedError
+
+    def get_style(self, hwnd):
+        raise NotImplementedError
+
+    def get_parent(self, hwnd):
+        raise NotImplementedError
+
+    def restore_embed(self, hwnd, host, width, height, style):
+        """
+        Cheap re-embed after the game escaped: apply `style`, re-parent
+        and resize, without the diagnostics of embed(). Returns bool.
+        """
+        raise NotImplementedError
+
+    def watch_embed(self, hwnd, callback):
+        """
+        Call callback(hwnd) when the style, parent or position of `hwnd` may
+        have changed.
+
+        Returns:
+            A token for unwatch_embed(), or None if unsupported
+        """
+        return None
+
+    def unwatch_embed(self, token):
+        pass
+
+
+class Win32WindowBackend(WindowBackend):
+    """Backend over the ctypes Win32 helpers in window_embed."""
+
+    supports_notifications = True
+
+    def __init__(self):
+        # Imported lazily: window_embed binds user32 at import time
+        import window_embed
+        self._embed = window_embed
+
+    def find_window(self, pid):
+        return self._embed.find_window_for_pid(pid)
+
+    def watch_windows(self, pid, callback):
+        return self._embed.watch_windows_shown(pid, callback)
+
+    def unwatch_windows(self, token):
+        self._embed.unwatch_windows_shown(token)
+
+    def embed(self, hwnd, host, width, height):
+        return self._embed.embed_window(hwnd, host, width, height)
+
+    def move_window(self, hwnd, x, y, width, height):
+        return self._embed.move_window(hwnd, x, y, width, height)
+
+    def is_window(self, hwnd):
+        return bool(self._embed.IsWindow(hwnd))
+
+    def get_style(self, hwnd):
+        return self._embed.get_window_style(hwnd)
+
+    def get_parent(self, hwnd):
+        return self._embed.get_window_parent(hwnd)
+
+    def restore_embed(self, hwnd, host, width, height, style):
+        return self._embed.restore_embed(hwnd, host, width, height, style)
+
+    def watch_embed(self, hwnd, callback):
+        return self._embed.watch_window_changes(hwnd, callback)
+
+    def unwatch_embed(self, token):
+        self._embed.unwatch_window_changes(token)
+
+
+class FakeWindow:
+    def __init__(self, hwnd, pid, title="", visible=True):
+        self.hwnd = hwnd
+        self.pid = pid
+        self.title = title
+        self.visible = visible
+        self.parent = 0
+        self.position = (0, 0)
+        self.size = (0, 0)
+        self.style = WS_POPUP | WS_CAPTION
+
+
+class FakeWindowBackend(WindowBackend):
+    """
+    In-memory window system for tests and benchmarks.
+
+    Usage:
+        backend = FakeWindowBackend()
+        hwnd = backend.create_window(pid=1234, title="MU")
+    """
+
+    def __init__(self, supports_notifications=True):
+        self.supports_notifications = supports_notifications
+        self.windows = {}  # hwnd -> FakeWindow
+        self.find_calls = 0
+        self._next_hwnd = 0x1000
+        self._watchers = {}  # token -> (pid, callback)
+        self._embed_watchers = {}  # token -> (hwnd, callback)
+        self._next_token = 0
+        self.restore_calls = 0
+        self.move_calls = 0
+
+    def create_window(self, pid, title="", visible=True):
+        self._next_hwnd += 4
+        window = FakeWindow(self._next_hwnd, pid, title, visible)
+        self.windows[window.hwnd] = window
+        if visible:
+            self._notify(window)
+        return window.hwnd
+
+    def show_window(self, hwnd):
+        window = self.windows[hwnd]
+        window.visible = True
+        self._notify(window)
+
+    def destroy_window(self, hwnd):
+        self.windows.pop(hwnd, None)
+
+    def set_style(self, hwnd, style, notify=True):
+        """Simulate the game changing its own style (notify=False: no event)"""
+        self.windows[hwnd].style = style
+        if notify:
+            self._notify_changed(hwnd)
+
+    def set_parent(self, hwnd, parent, notify=True):
+        self.windows[hwnd].parent = parent
+        if notify:
+            self._notify_changed(hwnd)
+
+    def escape(self, hwnd, notify=True):
+        """Simulate the game reasserting a top-level window"""
+        window = self.windows[hwnd]
+        window.style = (window.style & ~WS_CHILD) | WS_POPUP | WS_CAPTION
+        window.parent = 0
+        if notify:
+            self._notify_changed(hwnd)
+
+    def _notify_changed(self, hwnd):
+        if not self.supports_notifications:
+            return
+        for watched, callback in list(self._embed_watchers.values()):
+            if watched == hwnd:
+                callback(hwnd)
+
+    def _notify(self, window):
+        if not self.supports_notifications:
+            return
+        for pid, callback in list(self._watchers.values()):
+            if pid == window.pid:
+                callback(window.hwnd)
+
+    def find_window(self, pid):
+        self.find_calls += 1
+        for window in self.windows.values():
+            if window.pid != pid or not window.visible:
+                continue
+            if window.title and "debugger" in window.title.lower():
+                continue
+            return window.hwnd
+        return 0
+
+    def watch_windows(self, pid, callback):
+        if not self.supports_notifications:
+            return None
+        self._next_token += 1
+        self._watchers[self._next_token] = (pid, callback)
+        return self._next_token
+
+    def unwatch_windows(self, token):
+        self._watchers.pop(token, None)
+
+    def embed(self, hwnd, host, width, height):
+        window = self.windows.get(hwnd)
+        if window is None or not host:
+            return False
+        window.style = (window.style & ~TOPLEVEL_STYLES) | WS_CHILD
+        window.parent = host
+        window.size = (width, height)
+        return True
+
+    def move_window(self, hwnd, x, y, width, height):
+        self.move_calls += 1
+        window = self.windows.get(hwnd)
+        if window is None:
+            return False
+        window.position = (x, y)
+        window.size = (width, height)
+        return True
+
+    def is_window(self, hwnd):
+        return hwnd in self.windows
+
+    def get_style(self, hwnd):
+        window = self.windows.get(hwnd)
+        return window.style if window else 0
+
+    def get_parent(self, hwnd):
+        window = self.windows.get(hwnd)
+        return window.parent if window else 0
+
+    def restore_embed(self, hwnd, host, width, height, style):
+        self.restore_calls += 1
+        window = self.windows.get(hwnd)
+        if window is None or not host:
+            return False
+        window.style = style
+        window.parent = host
+        window.position = (0, 0)
+        window.size = (width, height)
+        return True
+
+    def watch_embed(self, hwnd, callback):
+        if not self.supports_notifications:
+            return None
+        self._next_token += 1
+        self._embed_watchers[self._next_token] = (hwnd, callback)
+        return self._next_token
+
+    def unwatch_embed(self, token):
+        self._embed_watchers.pop(token, None)
+
+
+def default_backend():
+    """The real backend for this platform, or None where embedding isn't supported"""
+    if sys.platform == "win32":
+        try:
+            return Win32WindowBackend()
+        except Exception as e:
+            print(f"Warning: Win32 window backend unavailable: {e}")
+    return None
@@ -0,0 +1,97 @@
+# window_discovery.py
+#
+# Finds the top-level window of a specific, just-spawned client PID.
+#
+# Where the backend offers window notifications they are used directly;
+# polling with exponential backoff runs alongside as a fallback (e.g. a
+# window created before the hook was installed), starting fast and
+# slowing down the longer the client takes to load.
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+INITIAL_DELAY_MS = 50
+MAX_DELAY_MS = 1000
+DEFAULT_TIMEOUT_MS = 15000
+
+
+class _Watch:
+    def __init__(self, pid, timeout_ms):
+        self.pid = pid
+        self.delay = INITIAL_DELAY_MS
+        self.remaining = timeout_ms
+        self.token = None
+        self.polls = 0
+
+
+class WindowDiscovery(QObject):
+    # Signals
+    windowFound = pyqtSignal(int, int)  # pid, hwnd
+    windowTimeout = pyqtSignal(int)     # pid
+
+    def __init__(self, backend, timeout_ms=DEFAULT_TIMEOUT_MS,
+                 initial_delay_ms=INITIAL_DELAY_MS, max_delay_ms=MAX_DELAY_MS):
+        super().__init__()
+        self.backend = backend
+        self.timeout_ms = timeout_ms
+        self.initial_delay_ms = initial_delay_ms
+        self.max_delay_ms = max_delay_ms
+        self._watches = {}  # pid -> _Watch
+
+    def watch(self, pid):
+        """Start looking for the window of `pid`; emits windowFound or windowTimeout"""
+        if pid in self._watches:
+            return
+        watch = _Watch(pid, self.timeout_ms)
+        watch.delay = self.initial_delay_ms
+        self._watches[pid] = watch
+
+        if self.backend.supports_notifications:
+            watch.token = self.backend.watch_windows(pid, lambda hwnd: self._on_window_event(pid))
+
+        # The window may already exist
+        if not self._check(watch):
+            self._schedule(watch)
+
+    def cancel(self, pid):
+        watch = self._watches.pop(pid, None)
+        if watch and watch.token is not None:
+            self.backend.unwatch_windows(watch.token)
+
+    def pending(self):
+        return list(self._watches)
+
+    def _on_window_event(self, pid):
+        watch = self._watches.get(pid)
+        if watch:
+            self._check(watch)
+
+    def _check(self, watch):
+        watch.polls += 1
+        hwnd = self.backend.find_window(watch.pid)
+        if not hwnd:
+            return False
+        print(f"[WindowDiscovery] PID {watch.pid} window {hwnd} after {watch.polls} checks")
+        self.cancel(watch.pid)
+        self.windowFound.emit(watch.pid, hwnd)
+        return True
+
+    def _schedule(self, watch):
+        delay = min(watch.delay, watch.remaining)
+        QTimer.singleShot(delay, lambda: self._poll(watch))
+
+    def _poll(self, watch):
+        if self._watches.get(watch.pid) is not watch:
+            return  # Found via notification or cancelled
+        if self._check(watch):
+            return
+
+        watch.remaining -= watch.delay
+        if watch.remaining <= 0:
+            print(f"[WindowDiscovery] No window for PID {watch.pid} after {self.timeout_ms}ms")
+            self.cancel(watch.pid)
+            self.windowTimeout.emit(watch.pid)
+            return
+
+        # Back off while the client is still loading
+        watch.delay = min(watch.delay * 2, self.max_delay_ms)
+        self._schedule(watch)
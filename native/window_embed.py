@@ -5,7 +5,8 @@
 
 import ctypes
 from ctypes import wintypes
-import psutil
+
+from process_snapshot import process_snapshots
 
 user32 = ctypes.windll.user32
 
@@ -33,6 +34,7 @@ SWP_NOSIZE       = 0x0001
 SWP_NOMOVE       = 0x0002
 SWP_NOZORDER     = 0x0004
 SWP_FRAMECHANGED = 0x0020
+SWP_NOACTIVATE   = 0x0010
 SWP_SHOWWINDOW   = 0x0040
 
 # Win32 APIs
@@ -46,6 +48,7 @@ IsWindowVisible = user32.IsWindowVisible
 IsWindow = user32.IsWindow
 GetWindowRect = user32.GetWindowRect
 SetParent = user32.SetParent
+GetParent = user32.GetParent
 SetWindowPos = user32.SetWindowPos
 
 GetWindowTextW.argtypes = [HWND, wintypes.LPWSTR, ctypes.c_int]
@@ -54,6 +57,8 @@ IsWindowVisible.argtypes = [HWND]
 IsWindow.argtypes = [HWND]
 GetWindowRect.argtypes = [HWND, ctypes.POINTER(wintypes.RECT)]
 SetParent.argtypes = [HWND, HWND]
+GetParent.argtypes = [HWND]
+GetParent.restype = HWND
 SetWindowPos.argtypes = [
     HWND, HWND,
     ctypes.c_int, ctypes.c_int,
@@ -61,6 +66,28 @@ SetWindowPos.argtypes = [
     ctypes.c_uint,
 ]
 
+# WinEvent hooks (window-creation and embed-change notifications)
+EVENT_OBJECT_SHOW           = 0x8002
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+EVENT_OBJECT_PARENTCHANGE   = 0x800F
+OBJID_WINDOW           = 0
+WINEVENT_OUTOFCONTEXT  = 0x0000
+
+WinEventProc = ctypes.WINFUNCTYPE(
+    None,
+    wintypes.HANDLE, wintypes.DWORD, HWND,
+    wintypes.LONG, wintypes.LONG,
+    wintypes.DWORD, wintypes.DWORD,
+)
+SetWinEventHook = user32.SetWinEventHook
+SetWinEventHook.restype = wintypes.HANDLE
+SetWinEventHook.argtypes = [
+    wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE,
+    WinEventProc, wintypes.DWORD, wintypes.DWORD, wintypes.DWORD,
+]
+UnhookWinEvent = user32.UnhookWinEvent
+UnhookWinEvent.argtypes = [wintypes.HANDLE]
+
 # 64/32-bit safe Get/SetWindowLongPtr
 try:
     GetWindowLongPtrW = user32.GetWindowLongPtrW
@@ -138,33 +165,24 @@ def get_mu_pid() -> int | None:
     Find PID for main.exe (MU client).
     Returns PID or None if not running.
     """
-    for proc in psutil.process_iter(['pid', 'name']):
-        name = proc.info.get('name') or ""
-        if name.lower() == "main.exe":
-            return proc.info['pid']
-    return None
+    pids = process_snapshots.snapshot().pids_for("main.exe")
+    return pids[0] if pids else None
 
 
-def find_mu_hwnd() -> int:
+def find_window_for_pid(pid: int) -> int:
     """
-    Find top-level MU window by PID of main.exe, ignoring "debugger" windows.
-    No reliance on static titles or class names.
+    Find the first visible top-level window owned by `pid`,
+    ignoring "debugger" windows. Returns 0 if there is none yet.
     """
-    mu_pid = get_mu_pid()
-    if not mu_pid:
-        log("main.exe not found (is the client running?)")
-        return 0
-
-    log(f"Found MU PID: {mu_pid}")
     result = {"hwnd": 0}
 
     def callback(hwnd, lParam):
         if not IsWindowVisible(hwnd):
             return True
 
-        pid = wintypes.DWORD()
-        GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
-        if pid.value != mu_pid:
+        owner = wintypes.DWORD()
+        GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+        if owner.value != pid:
             return True
 
         title = _get_title(hwnd)
@@ -177,13 +195,91 @@ def find_mu_hwnd() -> int:
         return False
 
     EnumWindows(EnumWindowsProc(callback), 0)
+    return result["hwnd"]
+
+
+def find_mu_hwnd() -> int:
+    """
+    Find top-level MU window by PID of main.exe, ignoring "debugger" windows.
+    No reliance on static titles or class names.
+    """
+    mu_pid = get_mu_pid()
+    if not mu_pid:
+        log("main.exe not found (is the client running?)")
+        return 0
+
+    log(f"Found MU PID: {mu_pid}")
+    hwnd = find_window_for_pid(mu_pid)
 
-    if result["hwnd"]:
-        dump_window_info(result["hwnd"], "FOUND_GAME")
+    if hwnd:
+        dump_window_info(hwnd, "FOUND_GAME")
     else:
         log("No visible MU window found for main.exe PID")
 
-    return result["hwnd"]
+    return hwnd
+
+
+# ---------------------------------------------------------------------
+# Window-creation notifications
+# ---------------------------------------------------------------------
+
+def watch_windows_shown(pid: int, callback):
+    """
+    Call callback(hwnd) whenever a top-level window of `pid` is shown.
+    Must be called from a thread with a message loop (the Qt GUI thread).
+
+    Returns an opaque token for unwatch_windows_shown(), or None on failure.
+    """
+    def on_event(hook, event, hwnd, id_object, id_child, thread_id, timestamp):
+        if id_object == OBJID_WINDOW and id_child == 0 and hwnd:
+            callback(hwnd)
+
+    proc = WinEventProc(on_event)  # Keep a reference so ctypes doesn't free it
+    hook = SetWinEventHook(
+        EVENT_OBJECT_SHOW, EVENT_OBJECT_SHOW, None,
+        proc, pid, 0, WINEVENT_OUTOFCONTEXT
+    )
+    if not hook:
+        log(f"SetWinEventHook failed for PID {pid}")
+        return None
+    return (hook, proc)
+
+
+def unwatch_windows_shown(token):
+    if token:
+        UnhookWinEvent(token[0])
+
+
+def watch_window_changes(hwnd: int, callback):
+    """
+    Call callback(hwnd) when `hwnd` is shown, moved/resized (which includes
+    SWP_FRAMECHANGED style changes) or re-parented.
+    Must be called from a thread with a message loop (the Qt GUI thread).
+
+    Returns an opaque token for unwatch_window_changes(), or None on failure.
+    """
+    pid = wintypes.DWORD()
+    thread_id = GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    events = (EVENT_OBJECT_SHOW, EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_PARENTCHANGE)
+
+    def on_event(hook, event, event_hwnd, id_object, id_child, event_thread, timestamp):
+        if event_hwnd == hwnd and id_object == OBJID_WINDOW and event in events:
+            callback(hwnd)
+
+    proc = WinEventProc(on_event)  # Keep a reference so ctypes doesn't free it
+    hook = SetWinEventHook(
+        EVENT_OBJECT_SHOW, EVENT_OBJECT_PARENTCHANGE, None,
+        proc, pid.value, thread_id, WINEVENT_OUTOFCONTEXT
+    )
+    if not hook:
+        log(f"SetWinEventHook failed for HWND {hwnd}")
+        return None
+    return (hook, proc)
+
+
+def unwatch_window_changes(token):
+    if token:
+        UnhookWinEvent(token[0])
 
 
 # ---------------------------------------------------------------------
@@ -243,30 +339,42 @@ def embed_window(hwnd_game: int, hwnd_host: int, width: int, height: int) -> boo
     return True
 
 
-def verify_and_fix_embed(hwnd_game: int, hwnd_host: int, width: int, height: int) -> bool:
-    """
-    Call periodically (e.g. from a Qt timer) to detect if the game
-    reasserted top-level styles and re-embed if needed.
-    """
-    if not hwnd_game or not IsWindow(hwnd_game):
-        log("verify: hwnd_game invalid")
-        return False
-    if not hwnd_host or not IsWindow(hwnd_host):
-        log("verify: hwnd_host invalid")
-        return False
+def get_window_style(hwnd: int) -> int:
+    return GetWindowLongPtrW(hwnd, GWL_STYLE) & 0xFFFFFFFF
+
+
+def get_window_parent(hwnd: int) -> int:
+    return GetParent(hwnd) or 0
 
-    style = GetWindowLongPtrW(hwnd_game, GWL_STYLE)
-    must_fix = False
 
-    # If WS_CHILD is gone or top-level styles are back, fix
-    if not (style & WS_CHILD):
-        log("verify: WS_CHILD missing, re-embedding")
-        must_fix = True
-    if style & (WS_POPUP | WS_CAPTION | WS_THICKFRAME | WS_BORDER):
-        log("verify: top-level styles present again, re-embedding")
-        must_fix = True
+def move_window(hwnd: int, x: int, y: int, width: int, height: int) -> bool:
+    """Move/resize a (child) window without activating it or changing z-order."""
+    return bool(SetWindowPos(
+        hwnd,
+        None,
+        x, y,
+        width, height,
+        SWP_NOZORDER | SWP_NOACTIVATE
+    ))
 
-    if must_fix:
-        return embed_window(hwnd_game, hwnd_host, width, height)
 
+def restore_embed(hwnd_game: int, hwnd_host: int, width: int, height: int, style: int) -> bool:
+    """
+    Re-apply a known-good embedded style and parent after the game escaped.
+    Lightweight counterpart of embed_window() for the embed watchdog.
+    """
+    if not IsWindow(hwnd_game) or not IsWindow(hwnd_host):
+        return False
+
+    SetWindowLongPtrW(hwnd_game, GWL_STYLE, style)
+    if GetParent(hwnd_game) != hwnd_host:
+        SetParent(hwnd_game, hwnd_host)
+    SetWindowPos(
+        hwnd_game,
+        None,
+        0, 0,
+        width, height,
+        SWP_NOZORDER | SWP_SHOWWINDOW | SWP_FRAMECHANGED
+    )
+    log(f"restored embed of {hwnd_game} (style=0x{style:08X})")
     return True
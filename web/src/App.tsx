@@ -37,14 +37,18 @@ function App() {
     useEffect(() => {
         const init = async () => {
             try {
-                // Get session info
-                const session = await bridge.getSession();
+                // Session info and online count (issued together so the
+                // bridge sends them in one batch round-trip)
+                const [session, count] = await Promise.all([
+                    bridge.getSession(),
+                    bridge.getOnlineCount(),
+                ]);
                 setIsAdmin(session.is_admin);
-
-                // Get online count
-                const count = await bridge.getOnlineCount();
                 setOnlinePlayers(count);
 
+                // The count is cached natively; changes are pushed as they arrive
+                await bridge.onOnlineCountChanged(setOnlinePlayers);
+
                 // Subscribe to update signals
                 await bridge.onUpdateAvailable((version) => {
                     console.log('Update available:', version);
@@ -82,6 +82,7 @@ const HomePage: React.FC<HomePageProps> = ({
                         <button
                             className="hero-button hero-button-primary"
                             onClick={handleStartGame}
+                            onMouseEnter={() => bridge.prewarmGame()}
                             disabled={isLaunching}
                         >
                             <HiPlay size={18} />
@@ -42,20 +42,336 @@ export interface Session {
     is_admin: boolean;
 }
 
+export interface LoginResult {
+    success: boolean;
+    session?: Session;
+    message?: string;
+}
+
 export interface GameLaunchResult {
     success: boolean;
     message: string;
 }
 
+export interface ClientProfile {
+    working_dir?: string;
+    args?: string[];
+    env?: Record<string, string>;
+}
+
+export interface LaunchClientsResult {
+    batch_id: number | null;
+    accepted: number;
+    message: string;
+}
+
+export interface ClientLaunchResult {
+    index: number;
+    success: boolean;
+    pid: number | null;
+    spawn_ms: number;
+    message?: string;
+}
+
+export interface ClientsLaunchedInfo {
+    batch_id: number;
+    results: ClientLaunchResult[];
+}
+
+export interface ClientResourceHistory {
+    t: number[];
+    cpu: number[];
+    rss: number[];
+    io_read: number[];
+    io_write: number[];
+    threads: number[];
+}
+
+export interface ResourceHistory {
+    interval: number;
+    clients: Record<string, ClientResourceHistory>;
+}
+
+export type EmbedLayout = 'tabs' | 'grid';
+
+// Screenshot, replay and termination ids each come from their own counter
+// and finish on their own signals. They are not job ids: cancelJob() and
+// jobFinished only concern the `job_id` of background jobs (runJob).
+export interface ScreenshotJob {
+    screenshot_id: number | null;
+}
+
+export interface ScreenshotSavedInfo {
+    screenshot_id: number;
+    path: string;
+}
+
+export interface ScreenshotFailedInfo {
+    screenshot_id: number;
+    error: string;
+}
+
+export interface ReplayJob {
+    replay_id: number | null;
+}
+
+export interface ReplaySavedInfo {
+    replay_id: number;
+    path: string;
+}
+
+export interface ReplayFailedInfo {
+    replay_id: number;
+    error: string;
+}
+
+export interface ScreenshotPresets {
+    presets: string[];  // e.g. png_fast, png, webp_lossless, webp_85, jpeg_90
+    default: string;
+}
+
+export interface GalleryItem {
+    filename: string;
+    timestamp: number;
+    size: number;
+    thumbnail: string | null;  // data URL; null until onThumbnailReady delivers it
+}
+
+export interface GalleryPage {
+    total: number;
+    offset: number;
+    items: GalleryItem[];
+}
+
+export interface ThumbnailReadyInfo {
+    filename: string;
+    thumbnail: string;
+}
+
+export interface ReplayStats {
+    recording: boolean;
+    fps: number;
+    frames: number;
+    dropped: number;
+    buffered: number;
+    seconds_buffered: number;
+    memory_mb: number;
+    grab_ms_avg: number | null;
+    cpu_percent: number | null;
+}
+
+export interface TerminationJob {
+    termination_id: number | null;
+}
+
+export type TerminationOutcome = 'terminated' | 'killed' | 'not_found' | 'failed';
+
+export interface ProcessTerminatedInfo {
+    termination_id: number;
+    pid: number;
+    outcome: TerminationOutcome;
+}
+
+export interface TerminationFinishedInfo {
+    termination_id: number;
+    results: { pid: number; outcome: TerminationOutcome }[];
+}
+
+export interface LatencySummary {
+    count: number;
+    p50: number | null;
+    p95: number | null;
+    max: number | null;
+}
+
+export type LaunchStats = Record<string, LatencySummary>;
+
 export interface UnmanagedProcess {
     pid: number;
     name: string;
 }
 
+export interface ProcessStartedInfo {
+    pid: number;
+    name: string;
+    managed: boolean;
+}
+
+export interface ProcessExitedInfo {
+    pid: number;
+    exit_code: number;
+    runtime: number;
+}
+
+export interface ClientState {
+    name: string;
+    managed: boolean;
+}
+
+export interface UpdateState {
+    status: 'idle' | 'available' | 'downloading' | 'error' | 'finished';
+    version: string | null;
+    progress: number;
+    error: string | null;
+}
+
+// Today's upcoming events as kept in the state store: the schedule only,
+// countdowns are computed from `start` (or taken from onEventUpdated)
+export interface ScheduledEvent {
+    name: string;
+    server: string;
+    category: string;
+    time: string;   // HH:MM
+    start: string;  // ISO local date-time
+}
+
+export interface LauncherState {
+    settings: Settings;
+    session: Session;
+    clients: Record<string, ClientState>;  // keyed by PID
+    update: UpdateState;
+    events: ScheduledEvent[];
+    online: number;
+}
+
+export interface StateOp {
+    op: 'add' | 'remove' | 'replace';
+    path: string;  // JSON pointer, e.g. /clients/1234
+    value?: unknown;
+}
+
+export interface StateDelta {
+    from: number;
+    version: number;
+    ops: StateOp[];
+}
+
+export interface StateSync {
+    version: number;
+    ops?: StateOp[];         // missed deltas, when still available
+    state?: LauncherState;   // otherwise a full snapshot
+}
+
+function setIn(node: any, keys: string[], value: unknown, remove: boolean): any {
+    const [key, ...rest] = keys;
+    const copy: any = Array.isArray(node) ? [...node] : { ...(node ?? {}) };
+    if (rest.length > 0) {
+        copy[key] = setIn(copy[key], rest, value, remove);
+    } else if (!remove) {
+        copy[key] = value;
+    } else if (Array.isArray(copy)) {
+        copy.splice(Number(key), 1);
+    } else {
+        delete copy[key];
+    }
+    return copy;
+}
+
+/**
+ * Apply state ops without mutating `state`: only the objects on changed
+ * paths are copied, so untouched branches keep their identity.
+ */
+export function applyStateOps<T>(state: T, ops: StateOp[]): T {
+    let root: any = state;
+    for (const { op, path, value } of ops) {
+        const keys = path.split('/').slice(1).map((key) => key.replace(/~1/g, '/').replace(/~0/g, '~'));
+        root = keys.length === 0 ? value : setIn(root, keys, value, op === 'remove');
+    }
+    return root;
+}
+
+export interface JobOutcome<T = unknown> {
+    ok: boolean;
+    result?: T;
+    error?: string;
+    cancelled?: boolean;
+}
+
+export interface JobProgressInfo {
+    job_id: number;
+    progress: number;  // 0-100
+    message: string;
+}
+
+export interface JobInfo extends JobProgressInfo {
+    name: string;
+    state: 'queued' | 'running' | 'finished';
+    cancelled: boolean;
+}
+
+export class JobError extends Error {
+    readonly cancelled: boolean;
+
+    constructor(message: string, cancelled: boolean = false) {
+        super(message);
+        this.name = 'JobError';
+        this.cancelled = cancelled;
+    }
+}
+
+export interface SlotDiagnostics {
+    count: number;
+    errors: number;
+    total_ms: number;
+    p50_ms: number | null;  // upper bound of the histogram bucket
+    p95_ms: number | null;
+    max_ms: number;
+    bytes_in: number;
+    bytes_out: number;
+    histogram: Record<string, number>;
+}
+
+export interface BridgeDiagnostics {
+    enabled: boolean;
+    seconds: number;
+    slots: Record<string, SlotDiagnostics>;
+    signals: Record<string, { count: number; bytes: number }>;
+}
+
+interface BatchRequest {
+    id: number;
+    method: string;
+    args: unknown[];
+}
+
+interface BatchResult {
+    id: number;
+    ok: boolean;
+    result?: unknown;
+    error?: string;
+}
+
+interface PendingQuery {
+    request: BatchRequest;
+    resolve: (value: any) => void;
+    reject: (reason: unknown) => void;
+}
+
+// Read-only slots that can share one batch() round-trip
+// (mirrors BATCHABLE in native/launcher_bridge.py)
+const BATCHABLE = new Set([
+    'getSettings',
+    'getSession',
+    'getOnlineCount',
+    'getLaunchStats',
+    'getResourceHistory',
+    'getScreenshotPresets',
+    'getScreenshotPage',
+    'getReplayStats',
+    'getEvents',
+    'getStateSince',
+]);
+
 class BridgeService {
     private bridge: any = null;
     private initPromise: Promise<void>;
     private _isInitialized = false;
+    private pendingQueries: PendingQuery[] = [];
+    private jobWaiters = new Map<number, (outcome: JobOutcome) => void>();
+    private unclaimedJobs = new Map<number, JobOutcome>();
+    private jobsConnected = false;
+    private flushScheduled = false;
+    private nextQueryId = 1;
 
     constructor() {
         this.initPromise = this.initBridge();
@@ -83,14 +399,197 @@ class BridgeService {
         return this._isInitialized;
     }
 
+    // ==================== Request Coalescing ====================
+
+    /**
+     * Call a read-only slot. Queries issued in the same tick (e.g. by several
+     * components mounting at once, or Promise.all) are sent as a single
+     * batch() call; each promise still settles with its own result or error.
+     */
+    private query<T>(method: string, ...args: unknown[]): Promise<T> {
+        if (!BATCHABLE.has(method) || typeof this.bridge.batch !== 'function') {
+            return this.callDirect<T>(method, args);
+        }
+        return new Promise<T>((resolve, reject) => {
+            this.pendingQueries.push({ request: { id: this.nextQueryId++, method, args }, resolve, reject });
+            if (!this.flushScheduled) {
+                this.flushScheduled = true;
+                queueMicrotask(() => this.flushQueries());
+            }
+        });
+    }
+
+    private async callDirect<T>(method: string, args: unknown[]): Promise<T> {
+        const result = await this.bridge[method](...args);
+        return typeof result === 'string' ? JSON.parse(result) : result;
+    }
+
+    private async flushQueries(): Promise<void> {
+        const queued = this.pendingQueries;
+        this.pendingQueries = [];
+        this.flushScheduled = false;
+
+        if (queued.length === 1) {
+            // Nothing to coalesce; skip the batch envelope
+            const [{ request, resolve, reject }] = queued;
+            this.callDirect(request.method, request.args).then(resolve, reject);
+            return;
+        }
+
+        try {
+            const payload = await this.bridge.batch(JSON.stringify(queued.map((q) => q.request)));
+            const results: BatchResult[] = JSON.parse(payload);
+            const byId = new Map(results.map((r) => [r.id, r] as const));
+            for (const { request, resolve, reject } of queued) {
+                const result = byId.get(request.id);
+                if (result && result.ok) {
+                    resolve(result.result);
+                } else {
+                    reject(new Error(result?.error ?? `No result for ${request.method}`));
+                }
+            }
+        } catch (error) {
+            for (const { reject } of queued) {
+                reject(error);
+            }
+        }
+    }
+
+    // ==================== Diagnostics ====================
+
+    async getDiagnostics(): Promise<BridgeDiagnostics | null> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                const result = await this.bridge.getDiagnostics();
+                return typeof result === 'string' ? JSON.parse(result) : result;
+            } catch (error) {
+                console.error('Failed to get diagnostics:', error);
+            }
+        }
+        return null;
+    }
+
+    async setDiagnosticsEnabled(enabled: boolean): Promise<void> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                await this.bridge.setDiagnosticsEnabled(enabled);
+            } catch (error) {
+                console.error('Failed to toggle diagnostics:', error);
+            }
+        } else {
+            console.log(`Mock: diagnostics ${enabled ? 'enabled' : 'disabled'}`);
+        }
+    }
+
+    // ==================== Background Jobs ====================
+
+    /**
+     * Call a slot that starts a background job (it returns {job_id}) and
+     * resolve with the job's result once jobFinished reports it. Rejects with
+     * a JobError if the job failed, was cancelled or could not be started.
+     * `onStarted` receives the job id, e.g. to offer cancelJob().
+     */
+    private async runJob<T>(method: string, args: unknown[] = [], onStarted?: (jobId: number) => void): Promise<T> {
+        this.connectJobs();
+        const started = await this.callDirect<{ job_id: number | null; message?: string }>(method, args);
+        if (started.job_id === null || started.job_id === undefined) {
+            throw new JobError(started.message ?? `${method} could not be started`);
+        }
+        const jobId = started.job_id;
+        onStarted?.(jobId);
+        const outcome = await new Promise<JobOutcome>((resolve) => {
+            const early = this.unclaimedJobs.get(jobId);
+            if (early) {
+                this.unclaimedJobs.delete(jobId);
+                resolve(early);
+            } else {
+                this.jobWaiters.set(jobId, resolve);
+            }
+        });
+        if (outcome.cancelled) {
+            throw new JobError(`${method} was cancelled`, true);
+        }
+        if (!outcome.ok) {
+            throw new JobError(outcome.error ?? `${method} failed`);
+        }
+        return outcome.result as T;
+    }
+
+    private connectJobs(): void {
+        if (this.jobsConnected || !this.bridge?.jobFinished) {
+            return;
+        }
+        this.jobsConnected = true;
+        this.bridge.jobFinished.connect((jobId: number, resultJson: string) => {
+            let outcome: JobOutcome;
+            try {
+                outcome = JSON.parse(resultJson);
+            } catch (e) {
+                outcome = { ok: false, error: `Invalid job result: ${e}` };
+            }
+            const waiter = this.jobWaiters.get(jobId);
+            if (waiter) {
+                this.jobWaiters.delete(jobId);
+                waiter(outcome);
+            } else {
+                // Finished before the caller registered; keep it briefly
+                this.unclaimedJobs.set(jobId, outcome);
+                if (this.unclaimedJobs.size > 100) {
+                    this.unclaimedJobs.delete(this.unclaimedJobs.keys().next().value as number);
+                }
+            }
+        });
+    }
+
+    async cancelJob(jobId: number): Promise<boolean> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                return await this.bridge.cancelJob(jobId);
+            } catch (error) {
+                console.error('Failed to cancel job:', error);
+            }
+        }
+        return false;
+    }
+
+    async getJobs(): Promise<JobInfo[]> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                const result = await this.bridge.getJobs();
+                return typeof result === 'string' ? JSON.parse(result) : result;
+            } catch (error) {
+                console.error('Failed to get jobs:', error);
+            }
+        }
+        return [];
+    }
+
+    async onJobProgress(callback: (info: JobProgressInfo) => void): Promise<void> {
+        await this.initPromise;
+        if (this.bridge && this.bridge.jobProgress) {
+            this.bridge.jobProgress.connect((infoJson: string) => {
+                try {
+                    callback(JSON.parse(infoJson));
+                } catch (e) {
+                    console.error('Failed to parse job progress:', e);
+                }
+            });
+        } else {
+            console.log('Mock: onJobProgress subscribed');
+        }
+    }
+
     // ==================== Settings ====================
 
     async getSettings(): Promise<Settings> {
         await this.initPromise;
         if (this.bridge) {
             try {
-                const settings = await this.bridge.getSettings();
-                return typeof settings === 'string' ? JSON.parse(settings) : settings;
+                return await this.query<Settings>('getSettings');
             } catch (error) {
                 console.error('Failed to get settings:', error);
             }
@@ -135,29 +634,67 @@ class BridgeService {
 
     // ==================== Game Launch ====================
 
-    async launchGame(): Promise<GameLaunchResult> {
+    async launchGame(onStarted?: (jobId: number) => void): Promise<GameLaunchResult> {
         await this.initPromise;
         if (this.bridge) {
             try {
-                const result = await this.bridge.launchGame();
-                return typeof result === 'string' ? JSON.parse(result) : result;
+                // Runs as a background job on the Python side
+                return await this.runJob<GameLaunchResult>('launchGame', [], onStarted);
             } catch (error) {
                 console.error('Failed to launch game:', error);
-                return { success: false, message: String(error) };
+                return { success: false, message: error instanceof Error ? error.message : String(error) };
             }
         }
         console.log('Mock launch game');
         return { success: true, message: 'Mock launch successful' };
     }
 
+    async prewarmGame(): Promise<boolean> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                return await this.bridge.prewarmGame();
+            } catch (error) {
+                console.error('Failed to prewarm game files:', error);
+            }
+        }
+        return false;
+    }
+
+    async launchClients(count: number, profiles: ClientProfile[] = []): Promise<LaunchClientsResult> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                const result = await this.bridge.launchClients(count, JSON.stringify(profiles));
+                return typeof result === 'string' ? JSON.parse(result) : result;
+            } catch (error) {
+                console.error('Failed to launch clients:', error);
+                return { batch_id: null, accepted: 0, message: String(error) };
+            }
+        }
+        console.log(`Mock launch ${count} clients`);
+        return { batch_id: 0, accepted: count, message: 'Mock batch launch' };
+    }
+
+    async getLaunchStats(): Promise<LaunchStats> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                return await this.query<LaunchStats>('getLaunchStats');
+            } catch (error) {
+                console.error('Failed to get launch stats:', error);
+            }
+        }
+        return {};
+    }
+
     // ==================== Session ====================
 
     async getSession(): Promise<Session> {
         await this.initPromise;
         if (this.bridge) {
             try {
-                const session = await this.bridge.getSession();
-                return typeof session === 'string' ? JSON.parse(session) : session;
+                return await this.query<Session>('getSession');
             } catch (error) {
                 console.error('Failed to get session:', error);
             }
@@ -166,13 +703,56 @@ class BridgeService {
         return { logged: true, username: 'Admin', is_admin: true };
     }
 
+    async login(username: string, password: string): Promise<LoginResult> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                // Runs as a background job on the Python side
+                return await this.runJob<LoginResult>('login', [username, password]);
+            } catch (error) {
+                console.error('Failed to log in:', error);
+                return { success: false, message: error instanceof Error ? error.message : String(error) };
+            }
+        }
+        console.log('Mock login');
+        return { success: true, session: { logged: true, username, is_admin: false } };
+    }
+
+    async logout(): Promise<void> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                await this.bridge.logout();
+            } catch (error) {
+                console.error('Failed to log out:', error);
+            }
+        } else {
+            console.log('Mock logout');
+        }
+    }
+
+    async onSessionChanged(callback: (session: Session) => void): Promise<void> {
+        await this.initPromise;
+        if (this.bridge && this.bridge.sessionChanged) {
+            this.bridge.sessionChanged.connect((sessionJson: string) => {
+                try {
+                    callback(JSON.parse(sessionJson));
+                } catch (e) {
+                    console.error('Failed to parse session:', e);
+                }
+            });
+        } else {
+            console.log('Mock: onSessionChanged subscribed');
+        }
+    }
+
     // ==================== Online Count ====================
 
     async getOnlineCount(): Promise<number> {
         await this.initPromise;
         if (this.bridge) {
             try {
-                return await this.bridge.getOnlineCount();
+                return await this.query<number>('getOnlineCount');
             } catch (error) {
                 console.error('Failed to get online count:', error);
             }
@@ -180,6 +760,15 @@ class BridgeService {
         return 1; // Mock fallback
     }
 
+    async onOnlineCountChanged(callback: (count: number) => void): Promise<void> {
+        await this.initPromise;
+        if (this.bridge && this.bridge.onlineCountChanged) {
+            this.bridge.onlineCountChanged.connect(callback);
+        } else {
+            console.log('Mock: onOnlineCountChanged subscribed');
+        }
+    }
+
     // ==================== Update System ====================
 
     async checkForUpdates(): Promise<void> {
@@ -299,14 +888,332 @@ class BridgeService {
         }
     }
 
+    async onClientsLaunched(callback: (info: ClientsLaunchedInfo) => void): Promise<void> {
+        await this.initPromise;
+        if (this.bridge && this.bridge.clientsLaunched) {
+            this.bridge.clientsLaunched.connect((infoJson: string) => {
+                try {
+                    callback(JSON.parse(infoJson));
+                } catch (e) {
+                    console.error('Failed to parse batch launch result:', e);
+                }
+            });
+        } else {
+            console.log('Mock: onClientsLaunched subscribed');
+        }
+    }
+
+    async requestScreenshot(): Promise<ScreenshotJob> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                const result = await this.bridge.requestScreenshot();
+                return typeof result === 'string' ? JSON.parse(result) : result;
+            } catch (error) {
+                console.error('Failed to request screenshot:', error);
+            }
+        }
+        return { screenshot_id: null };
+    }
+
+    async onScreenshotSaved(callback: (info: ScreenshotSavedInfo) => void): Promise<void> {
+        await this.initPromise;
+        if (this.bridge && this.bridge.screenshotSaved) {
+            this.bridge.screenshotSaved.connect((infoJson: string) => {
+                try {
+                    callback(JSON.parse(infoJson));
+                } catch (e) {
+                    console.error('Failed to parse saved screenshot:', e);
+                }
+            });
+        } else {
+            console.log('Mock: onScreenshotSaved subscribed');
+        }
+    }
+
+    async onScreenshotFailed(callback: (info: ScreenshotFailedInfo) => void): Promise<void> {
+        await this.initPromise;
+        if (this.bridge && this.bridge.screenshotFailed) {
+            this.bridge.screenshotFailed.connect((infoJson: string) => {
+                try {
+                    callback(JSON.parse(infoJson));
+                } catch (e) {
+                    console.error('Failed to parse screenshot error:', e);
+                }
+            });
+        } else {
+            console.log('Mock: onScreenshotFailed subscribed');
+        }
+    }
+
+    async getScreenshotPresets(): Promise<ScreenshotPresets> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                return await this.query<ScreenshotPresets>('getScreenshotPresets');
+            } catch (error) {
+                console.error('Failed to get screenshot presets:', error);
+            }
+        }
+        return { presets: ['png_fast'], default: 'png_fast' };
+    }
+
+    async getScreenshotPage(offset: number = 0, limit: number = 24): Promise<GalleryPage> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                return await this.query<GalleryPage>('getScreenshotPage', offset, limit);
+            } catch (error) {
+                console.error('Failed to get screenshot page:', error);
+            }
+        }
+        return { total: 0, offset, items: [] };
+    }
+
+    async deleteScreenshot(filename: string): Promise<boolean> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                return await this.bridge.deleteScreenshot(filename);
+            } catch (error) {
+                console.error('Failed to delete screenshot:', error);
+            }
+        }
+        return false;
+    }
+
+    async onThumbnailReady(callback: (info: ThumbnailReadyInfo) => void): Promise<void> {
+        await this.initPromise;
+        if (this.bridge && this.bridge.thumbnailReady) {
+            this.bridge.thumbnailReady.connect((infoJson: string) => {
+                try {
+                    callback(JSON.parse(infoJson));
+                } catch (e) {
+                    console.error('Failed to parse thumbnail:', e);
+                }
+            });
+        } else {
+            console.log('Mock: onThumbnailReady subscribed');
+        }
+    }
+
+    async startReplayRecording(): Promise<boolean> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                return await this.bridge.startReplayRecording();
+            } catch (error) {
+                console.error('Failed to start replay recording:', error);
+            }
+        }
+        return false;
+    }
+
+    async stopReplayRecording(): Promise<void> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                await this.bridge.stopReplayRecording();
+            } catch (error) {
+                console.error('Failed to stop replay recording:', error);
+            }
+        }
+    }
+
+    async saveReplay(seconds: number = 0): Promise<ReplayJob> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                const result = await this.bridge.saveReplay(seconds);
+                return typeof result === 'string' ? JSON.parse(result) : result;
+            } catch (error) {
+                console.error('Failed to save replay:', error);
+            }
+        }
+        return { replay_id: null };
+    }
+
+    async getReplayStats(): Promise<ReplayStats | null> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                return await this.query<ReplayStats | null>('getReplayStats');
+            } catch (error) {
+                console.error('Failed to get replay stats:', error);
+            }
+        }
+        return null;
+    }
+
+    async onReplaySaved(callback: (info: ReplaySavedInfo) => void): Promise<void> {
+        await this.initPromise;
+        if (this.bridge && this.bridge.replaySaved) {
+            this.bridge.replaySaved.connect((infoJson: string) => {
+                try {
+                    callback(JSON.parse(infoJson));
+                } catch (e) {
+                    console.error('Failed to parse saved replay:', e);
+                }
+            });
+        } else {
+            console.log('Mock: onReplaySaved subscribed');
+        }
+    }
+
+    async onReplayFailed(callback: (info: ReplayFailedInfo) => void): Promise<void> {
+        await this.initPromise;
+        if (this.bridge && this.bridge.replayFailed) {
+            this.bridge.replayFailed.connect((infoJson: string) => {
+                try {
+                    callback(JSON.parse(infoJson));
+                } catch (e) {
+                    console.error('Failed to parse replay error:', e);
+                }
+            });
+        } else {
+            console.log('Mock: onReplayFailed subscribed');
+        }
+    }
+
+    async onProcessTerminated(callback: (info: ProcessTerminatedInfo) => void): Promise<void> {
+        await this.initPromise;
+        if (this.bridge && this.bridge.processTerminated) {
+            this.bridge.processTerminated.connect((infoJson: string) => {
+                try {
+                    callback(JSON.parse(infoJson));
+                } catch (e) {
+                    console.error('Failed to parse termination result:', e);
+                }
+            });
+        } else {
+            console.log('Mock: onProcessTerminated subscribed');
+        }
+    }
+
+    async onTerminationFinished(callback: (info: TerminationFinishedInfo) => void): Promise<void> {
+        await this.initPromise;
+        if (this.bridge && this.bridge.terminationFinished) {
+            this.bridge.terminationFinished.connect((infoJson: string) => {
+                try {
+                    callback(JSON.parse(infoJson));
+                } catch (e) {
+                    console.error('Failed to parse termination job:', e);
+                }
+            });
+        } else {
+            console.log('Mock: onTerminationFinished subscribed');
+        }
+    }
+
+    async onProcessStarted(callback: (info: ProcessStartedInfo) => void): Promise<void> {
+        await this.initPromise;
+        if (this.bridge && this.bridge.processStarted) {
+            this.bridge.processStarted.connect((infoJson: string) => {
+                try {
+                    callback(JSON.parse(infoJson));
+                } catch (e) {
+                    console.error('Failed to parse process start:', e);
+                }
+            });
+        } else {
+            console.log('Mock: onProcessStarted subscribed');
+        }
+    }
+
+    async onProcessExited(callback: (info: ProcessExitedInfo) => void): Promise<void> {
+        await this.initPromise;
+        if (this.bridge && this.bridge.processExited) {
+            this.bridge.processExited.connect((infoJson: string) => {
+                try {
+                    callback(JSON.parse(infoJson));
+                } catch (e) {
+                    console.error('Failed to parse process exit:', e);
+                }
+            });
+        } else {
+            console.log('Mock: onProcessExited subscribed');
+        }
+    }
+
+    // ==================== State Store ====================
+
+    async getStateSince(version: number = 0): Promise<StateSync | null> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                return await this.query<StateSync>('getStateSince', version);
+            } catch (error) {
+                console.error('Failed to get state:', error);
+            }
+        }
+        return null;
+    }
+
+    async onStateChanged(callback: (delta: StateDelta) => void): Promise<void> {
+        await this.initPromise;
+        if (this.bridge && this.bridge.stateChanged) {
+            this.bridge.stateChanged.connect((deltaJson: string) => {
+                try {
+                    callback(JSON.parse(deltaJson));
+                } catch (e) {
+                    console.error('Failed to parse state delta:', e);
+                }
+            });
+        } else {
+            console.log('Mock: onStateChanged subscribed');
+        }
+    }
+
+    /**
+     * Keep a local mirror of the launcher state. `callback` receives every
+     * new consistent state; a missed delta triggers a resync.
+     */
+    async subscribeState(callback: (state: LauncherState, version: number) => void): Promise<void> {
+        let state: LauncherState | null = null;
+        let version = 0;
+        let resyncing: Promise<void> | null = null;
+
+        const resync = (): Promise<void> => {
+            resyncing ??= (async () => {
+                const sync = await this.getStateSince(version);
+                if (sync) {
+                    if (sync.state) {
+                        state = sync.state;
+                    } else if (state && sync.ops) {
+                        state = applyStateOps(state, sync.ops);
+                    }
+                    version = sync.version;
+                    if (state) {
+                        callback(state, version);
+                    }
+                }
+                resyncing = null;
+            })();
+            return resyncing;
+        };
+
+        await this.onStateChanged((delta) => {
+            if (resyncing) {
+                return;  // Older than the resync response, which includes it
+            }
+            if (state && delta.from === version) {
+                state = applyStateOps(state, delta.ops);
+                version = delta.version;
+                callback(state, version);
+            } else if (delta.version > version) {
+                resync();
+            }
+        });
+        await resync();
+    }
+
     // ==================== Process Management ====================
 
     async getUnmanagedProcesses(): Promise<UnmanagedProcess[]> {
         await this.initPromise;
         if (this.bridge) {
             try {
-                const result = await this.bridge.getUnmanagedProcesses();
-                return typeof result === 'string' ? JSON.parse(result) : result;
+                return await this.runJob<UnmanagedProcess[]>('getUnmanagedProcesses');
             } catch (error) {
                 console.error('Failed to get unmanaged processes:', error);
             }
@@ -314,16 +1221,29 @@ class BridgeService {
         return [];
     }
 
-    async killUnmanagedProcess(pid: number): Promise<boolean> {
+    async getResourceHistory(maxPoints: number = 0): Promise<ResourceHistory> {
         await this.initPromise;
         if (this.bridge) {
             try {
-                return await this.bridge.killUnmanagedProcess(pid);
+                return await this.query<ResourceHistory>('getResourceHistory', maxPoints);
+            } catch (error) {
+                console.error('Failed to get resource history:', error);
+            }
+        }
+        return { interval: 0, clients: {} };
+    }
+
+    async killUnmanagedProcess(pid: number): Promise<TerminationJob> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                const result = await this.bridge.killUnmanagedProcess(pid);
+                return typeof result === 'string' ? JSON.parse(result) : result;
             } catch (error) {
                 console.error('Failed to kill process:', error);
             }
         }
-        return false;
+        return { termination_id: null };
     }
 
     // ==================== Window Control ====================
@@ -365,25 +1285,48 @@ class BridgeService {
         return false;
     }
 
-    async closeGame(): Promise<boolean> {
+    async focusClient(pid: number): Promise<void> {
         await this.initPromise;
         if (this.bridge) {
             try {
-                return await this.bridge.closeGame();
+                await this.bridge.focusClient(pid);
             } catch (error) {
-                console.error('Failed to close game:', error);
+                console.error('Failed to focus client:', error);
+            }
+        }
+    }
+
+    async setEmbedLayout(mode: EmbedLayout): Promise<boolean> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                return await this.bridge.setEmbedLayout(mode);
+            } catch (error) {
+                console.error('Failed to set embed layout:', error);
             }
         }
         return false;
     }
 
+    async closeGame(): Promise<TerminationJob> {
+        await this.initPromise;
+        if (this.bridge) {
+            try {
+                const result = await this.bridge.closeGame();
+                return typeof result === 'string' ? JSON.parse(result) : result;
+            } catch (error) {
+                console.error('Failed to close game:', error);
+            }
+        }
+        return { termination_id: null };
+    }
+
     // Fix #6: getEvents method (already exists in Python bridge)
     async getEvents(): Promise<any[]> {
         await this.initPromise;
         if (this.bridge) {
             try {
-                const result = await this.bridge.getEvents();
-                return typeof result === 'string' ? JSON.parse(result) : result;
+                return await this.query<any[]>('getEvents');
             } catch (error) {
                 console.error('Failed to get events:', error);
             }
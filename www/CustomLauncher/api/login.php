@@ -2,17 +2,99 @@
 header('Content-Type: application/json');
 
 // Stub login logic
-$username = $_POST['username'] ?? '';
-$password = $_POST['password'] ?? '';
+// Issued refresh tokens are remembered server-side (only their SHA-256) in
+// a small JSON store; a refresh token is accepted once, if it was issued
+// here and hasn't expired, and is replaced by a new one.
+const TOKEN_TTL = 3600;
+const REFRESH_TTL = 30 * 24 * 3600;
 
-if ($username === 'admin' && $password === 'admin') {
-    echo json_encode([
+$accounts = [
+    'admin' => ['password' => 'admin', 'username' => 'Admin', 'is_admin' => true],
+];
+
+function refresh_store_path() {
+    return sys_get_temp_dir() . DIRECTORY_SEPARATOR . 'mu_launcher_refresh_tokens.json';
+}
+
+// Run $update(array &$tokens) on the token store under an exclusive lock
+function with_refresh_store($update) {
+    $handle = fopen(refresh_store_path(), 'c+');
+    if ($handle === false) {
+        return null;
+    }
+    @chmod(refresh_store_path(), 0600);
+    flock($handle, LOCK_EX);
+    $tokens = json_decode(stream_get_contents($handle), true) ?: [];
+    $now = time();
+    $tokens = array_filter($tokens, function ($entry) use ($now) {
+        return $entry['expires'] > $now;
+    });
+    $result = $update($tokens);
+    ftruncate($handle, 0);
+    rewind($handle);
+    fwrite($handle, json_encode($tokens));
+    fflush($handle);
+    flock($handle, LOCK_UN);
+    fclose($handle);
+    return $result;
+}
+
+function issue_tokens($login, $account) {
+    $refresh_token = bin2hex(random_bytes(32));
+    $stored = with_refresh_store(function (&$tokens) use ($refresh_token, $login) {
+        $tokens[hash('sha256', $refresh_token)] = ['login' => $login, 'expires' => time() + REFRESH_TTL];
+        return true;
+    });
+    $response = [
         'success' => true,
         'session' => [
-            'username' => 'Admin',
-            'is_admin' => true
-        ]
-    ]);
+            'username' => $account['username'],
+            'is_admin' => $account['is_admin']
+        ],
+        'token' => bin2hex(random_bytes(16)),
+        'expires_in' => TOKEN_TTL
+    ];
+    if ($stored) {
+        $response['refresh_token'] = $refresh_token;
+    }
+    return $response;
+}
+
+function post_string($key, $default = '') {
+    $value = $_POST[$key] ?? $default;
+    return is_string($value) ? $value : $default;
+}
+
+$action = post_string('action', 'login');
+
+if ($action === 'refresh') {
+    $refresh_token = post_string('refresh_token');
+    // One-time use: the token is removed whether or not the account still exists
+    $login = with_refresh_store(function (&$tokens) use ($refresh_token) {
+        $key = hash('sha256', $refresh_token);
+        if ($refresh_token === '' || !isset($tokens[$key])) {
+            return null;
+        }
+        $login = $tokens[$key]['login'];
+        unset($tokens[$key]);
+        return $login;
+    });
+    if ($login !== null && isset($accounts[$login])) {
+        echo json_encode(issue_tokens($login, $accounts[$login]));
+    } else {
+        echo json_encode([
+            'success' => false,
+            'message' => 'Invalid refresh token'
+        ]);
+    }
+    exit;
+}
+
+$username = post_string('username');
+$password = post_string('password');
+
+if (isset($accounts[$username]) && hash_equals($accounts[$username]['password'], $password)) {
+    echo json_encode(issue_tokens($username, $accounts[$username]));
 } else {
     echo json_encode([
         'success' => false,
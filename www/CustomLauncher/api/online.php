@@ -0,0 +1,17 @@
+<?php
+header('Content-Type: application/json');
+
+// Stub online count
+// On a real server this is the number of connected accounts, e.g.
+//   SELECT COUNT(*) FROM MEMB_STAT WHERE ConnectStat = 1
+// For local testing the count can be set with ?online=N or the
+// MU_ONLINE_COUNT environment variable.
+$online = $_GET['online'] ?? getenv('MU_ONLINE_COUNT');
+if ($online === false || $online === null || !is_numeric($online)) {
+    $online = 1;
+}
+
+echo json_encode([
+    'online' => max(0, (int)$online)
+]);
+?>